@@ -6,6 +6,7 @@ from flask_cors import CORS
 from flask_mail import Mail
 from flask_login import LoginManager
 from celery import Celery, Task
+from sqlalchemy.engine import make_url
 import logging
 import os
 import sys
@@ -18,6 +19,8 @@ except ImportError as e:
     sys.stderr.write(f"Error details: {e}\n")
     raise
 
+from .celery_queues import build_celery_routing_config
+
 db = SQLAlchemy()
 migrate = Migrate()
 cors = CORS()
@@ -29,7 +32,9 @@ login_manager.session_protection = "strong"
 celery = Celery(__name__,
                 include=['tasks.parsing',
                          'tasks.communication',
-                         'tasks.reminders'])
+                         'tasks.reminders',
+                         'tasks.diagnostics',
+                         'tasks.publishing'])
 
 
 @login_manager.user_loader
@@ -45,6 +50,16 @@ def load_user(user_id):
         return None
 
 
+def _database_engine_options(config) -> dict:
+    """SQLALCHEMY_ENGINE_OPTIONS plus the connection pool sizing, which only QueuePool backends (not SQLite) accept."""
+    engine_options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    if make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() != 'sqlite':
+        engine_options.setdefault('pool_size', config.get('DB_POOL_SIZE', 5))
+        engine_options.setdefault('max_overflow', config.get('DB_MAX_OVERFLOW', 10))
+        engine_options.setdefault('pool_timeout', config.get('DB_POOL_TIMEOUT', 30))
+    return engine_options
+
+
 def create_app(config_name_or_class=None):
     app = Flask(__name__)
 
@@ -107,6 +122,7 @@ def create_app(config_name_or_class=None):
 
     app.logger.info('NEXONA Application Starting Up (Flask app logger)...')
 
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _database_engine_options(app.config)
     db.init_app(app)
     migrate.init_app(app, db)
 
@@ -131,24 +147,118 @@ def create_app(config_name_or_class=None):
         'result_backend': app.config['CELERY_RESULT_BACKEND'],
         'task_always_eager': app.config.get('CELERY_TASK_ALWAYS_EAGER', False),
         'task_eager_propagates': app.config.get('CELERY_TASK_EAGER_PROPAGATES', False),
+        # Our tasks are fire-and-forget (ignore_result=True on each); outcomes that matter live in our own
+        # tables (e.g. cv_parse_jobs). Anything that still stores a result expires instead of piling up in Redis.
+        'task_ignore_result': True,
+        'result_expires': app.config.get('CELERY_RESULT_EXPIRES', 3600),
         'beat_schedule': {
+            # Reminders are sent by ETA tasks; this catches up on the ones whose task did not run in time.
             'check-interview-reminders-every-minute': {
                 'task': 'tasks.reminders.check_upcoming_interviews',
                 'schedule': 60.0,
+                # A tick that waited longer than the interval is dropped; the next one covers it.
+                'options': {'expires': 55},
+            },
+            # Queues the ETA send tasks of reminders entering the horizon (REMINDER_ETA_HORIZON_SECONDS).
+            'arm-interview-reminders': {
+                'task': 'tasks.reminders.arm_interview_reminders',
+                'schedule': app.config.get('REMINDER_ARM_INTERVAL_SECONDS', 300),
+                'options': {'expires': 120},
+            },
+            # Reconciles the precomputed interview_reminders table (normally synced by the write paths that
+            # change interviews or reminder settings).
+            'rebuild-interview-reminders': {
+                'task': 'tasks.reminders.rebuild_interview_reminders',
+                'schedule': app.config.get('REMINDER_REBUILD_INTERVAL_SECONDS', 3600),
+                'options': {'expires': 600},
+            },
+            # Safety net for the email outbox dispatcher (kicked after every commit that enqueues an email).
+            'dispatch-email-outbox': {
+                'task': 'tasks.communication.dispatch_email_outbox',
+                'schedule': app.config.get('OUTBOX_DISPATCH_INTERVAL_SECONDS', 10),
+                'options': {'expires': 30},
+            },
+            'prune-email-outbox': {
+                'task': 'tasks.communication.prune_email_outbox',
+                'schedule': 3600.0,
+                'options': {'expires': 600},
             },
+            # Republishes task messages whose publish after a commit failed (app/services/task_publish_service.py).
+            'relay-task-publish-outbox': {
+                'task': 'tasks.publishing.relay_pending_publishes',
+                'schedule': app.config.get('TASK_PUBLISH_RELAY_INTERVAL_SECONDS', 30),
+                'options': {'expires': 60},
+            },
+            # Safety net for the fair-share parse dispatcher (it is also kicked on every upload and fetch).
+            'dispatch-fair-share-parse-queue': {
+                'task': 'tasks.parsing.dispatch_parse_queue',
+                'schedule': app.config.get('PARSE_DISPATCH_INTERVAL_SECONDS', 5),
+                'options': {'expires': 30},
+            },
+        },
+        'timezone': app.config.get('CELERY_TIMEZONE', 'UTC'),
+        # Several beat instances can run; a Redis lock elects the one that sends (app/celery_beat.py).
+        'beat_scheduler': 'app.celery_beat:LeaderElectedScheduler',
+        'nexona_beat': {
+            'leader_ttl': app.config.get('BEAT_LEADER_TTL_SECONDS', 30),
+            'standby_interval': app.config.get('BEAT_STANDBY_INTERVAL_SECONDS', 5),
+        },
+        # Producer connections shared by every publish of the process (app/services/task_publish_service.py).
+        'broker_pool_limit': app.config.get('CELERY_BROKER_POOL_LIMIT', 10),
+        # Workers started with --autoscale=MAX,MIN size their pool from queue depth and wait time.
+        'worker_autoscaler': 'app.celery_autoscaler:QueueDepthAutoscaler',
+        'nexona_autoscale': {
+            'sample_interval': app.config.get('AUTOSCALE_SAMPLE_INTERVAL', 5),
+            'backlog_per_process': app.config.get('AUTOSCALE_BACKLOG_PER_PROCESS', 2),
+            'target_latency_seconds': app.config.get('AUTOSCALE_TARGET_LATENCY_SECONDS', 10),
+            'scale_up_step': app.config.get('AUTOSCALE_SCALE_UP_STEP', 4),
+            'scale_down_step': app.config.get('AUTOSCALE_SCALE_DOWN_STEP', 2),
+            'scale_up_cooldown': app.config.get('AUTOSCALE_SCALE_UP_COOLDOWN', 10),
+            'scale_down_cooldown': app.config.get('AUTOSCALE_SCALE_DOWN_COOLDOWN', 120),
         },
-        'timezone': app.config.get('CELERY_TIMEZONE', 'UTC')
+        # Recycles prefork children only (see CELERY_WORKER_MAX_MEMORY_PER_CHILD_KB)
+        'worker_max_memory_per_child': app.config.get('CELERY_WORKER_MAX_MEMORY_PER_CHILD_KB') or None,
+        'nexona_task_metrics': {
+            'enabled': app.config.get('TASK_METRICS_ENABLED', True),
+            'tracemalloc_sample_rate': app.config.get('TASK_TRACEMALLOC_SAMPLE_RATE', 0.02),
+            'retention_hours': app.config.get('TASK_METRICS_RETENTION_HOURS', 168),
+        },
+        # Signal handlers and the autoscaler run outside a Flask app context and read Redis from here.
+        'nexona_redis_url': app.config.get('REDIS_URL'),
     }
+    # Declared queues, task_routes and per-queue time limits (app/celery_queues.py).
+    celery_config_updates.update(build_celery_routing_config())
     celery.conf.update(**celery_config_updates)
 
     class ContextTask(Task):
         abstract = True
 
+        # Tasks declared with non_overlapping=True skip a run while the previous one still holds its lock.
+        non_overlapping = False
+
         def __call__(self, *args, **kwargs):
+            # A fresh app context per task call: Flask-SQLAlchemy scopes db.session to it and removes
+            # the session on teardown, so concurrent tasks (threads/gevent pools) never share a session.
             with app.app_context():
-                return self.run(*args, **kwargs)
+                if not self.non_overlapping or self.request.called_directly:
+                    return self.run(*args, **kwargs)
+                from app.services import locking_service, queue_metrics_service
+                lock_timeout = (self.time_limit or 300) + 30
+                with locking_service.task_run_lock(self.name, lock_timeout) as acquired:
+                    if not acquired:
+                        app.logger.warning(f"{self.name}: previous run still in progress, skipping this one.")
+                        queue_metrics_service.record_overlap_skip(app.config.get('REDIS_URL'), self.name)
+                        return None
+                    return self.run(*args, **kwargs)
 
     celery.Task = ContextTask
+    # The app every task (and the worker lifecycle hooks in app/celery_signals.py) runs against.
+    # A worker process builds it exactly once (celery_worker.py); tasks never call create_app themselves.
+    previous_app = getattr(celery, 'flask_app', None)
+    if previous_app is not None and previous_app is not app:
+        app.logger.warning("create_app() called again in this process; Celery tasks now use the new app instance.")
+    celery.flask_app = app
+    from app import celery_signals  # noqa: F401  (connects the Celery signal handlers)
 
     # --- Register Blueprints ---
     # Τροποποίηση στον τρόπο που γίνονται import τα blueprints από το app.api sub-package
@@ -178,6 +288,10 @@ def create_app(config_name_or_class=None):
         raise  # Σταματάμε την εκκίνηση αν τα blueprints δεν μπορούν να φορτωθούν.
     # --- End Register Blueprints ---
 
+    # --- CLI commands (flask dead-letters ...) ---
+    from app.cli import register_cli
+    register_cli(app)
+
     if app.debug or os.environ.get("FLASK_ENV") == "development":
         route_logger = startup_logger
         route_logger.debug("\n" + "=" * 60)
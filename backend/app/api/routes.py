@@ -3,14 +3,16 @@
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
 import uuid
-from datetime import datetime, timezone as dt_timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
 from dateutil import parser as dateutil_parser
 from flask_login import login_user, logout_user, current_user, login_required
-from app import db, celery
-from app.models import User, Candidate, Position, Company, CompanySettings
+from app import db
+from app.models import User, Candidate, Position, Company, CompanySettings, CvParseJob
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy import func, case, or_, extract, DECIMAL  # Προσθήκη DECIMAL για το avg_days_to_interview
-from app.services import s3_service
+from app.services import s3_service, locking_service, parse_dispatch_service, upload_admission_service, \
+    task_publish_service, reminder_schedule_service, email_outbox_service, notification_service, \
+    interview_schedule_service
 
 bp = Blueprint('api', __name__)
 
@@ -106,36 +108,27 @@ def check_session():
     return jsonify({"authenticated": False}), 200
 
 
-@bp.route('/upload', methods=['POST'])
-@login_required
-def upload_cv():
-    current_app.logger.info(f"--- Upload Request Received by User ID: {current_user.id} ({current_user.username}) ---")
-    user_company_id_for_context = get_current_user_company_id()
-    target_company_id_for_candidate = None
-
+def _resolve_upload_company_id():
+    """Target company for an upload: the user's own, or company_id_for_upload for superadmins. Returns (id, error)."""
     if current_user.role == 'superadmin':
         target_company_id_from_form = request.form.get('company_id_for_upload', type=int)
         if not target_company_id_from_form:
-            return jsonify({"error": "Superadmin must specify a target company_id for the candidate."}), 400
+            return None, (jsonify({"error": "Superadmin must specify a target company_id for the candidate."}), 400)
         company_exists = Company.query.get(target_company_id_from_form)
         if not company_exists:
-            return jsonify({"error": f"Target company with ID {target_company_id_from_form} not found."}), 404
-        target_company_id_for_candidate = target_company_id_from_form
-    elif user_company_id_for_context:
-        target_company_id_for_candidate = user_company_id_for_context
-    else:
-        return jsonify({"error": "User not associated with a company or unauthorized."}), 403
-
-    if 'cv_file' not in request.files:
-        return jsonify({"error": "No file part named 'cv_file'"}), 400
-    file = request.files['cv_file']
-    position_name_from_form = request.form.get('position', None)
+            return None, (jsonify({"error": f"Target company with ID {target_company_id_from_form} not found."}), 404)
+        return target_company_id_from_form, None
+    user_company_id_for_context = get_current_user_company_id()
+    if user_company_id_for_context:
+        return user_company_id_for_context, None
+    return None, (jsonify({"error": "User not associated with a company or unauthorized."}), 403)
 
-    if file.filename == '':
-        return jsonify({"error": "No selected file"}), 400
-    if not allowed_file(file.filename):
-        return jsonify({"error": f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"}), 400
 
+def _store_uploaded_cv(file, target_company_id_for_candidate, position_name_from_form, parse_priority):
+    """
+    Uploads one CV to S3, creates its 'Processing' placeholder candidate and queues it for parsing
+    in the given priority lane. Rolls back and removes the S3 object on failure (and re-raises).
+    """
     uploaded_s3_key = None
     try:
         file_ext = file.filename.rsplit('.', 1)[1].lower()
@@ -172,17 +165,14 @@ def upload_cv():
         db.session.commit()
         candidate_id_for_task = str(new_candidate.candidate_id)
 
-        celery.send_task('tasks.parsing.parse_cv_task',
-                         args=[candidate_id_for_task, uploaded_s3_key, target_company_id_for_candidate])
+        parse_dispatch_service.submit_cv_parse(candidate_id_for_task, uploaded_s3_key, target_company_id_for_candidate,
+                                               priority=parse_priority)
         current_app.logger.info(
-            f"CV uploaded (S3 Key: {uploaded_s3_key}), Placeholder Candidate ID: {candidate_id_for_task} created for Company {target_company_id_for_candidate}. Parsing task queued.")
-        return jsonify(new_candidate.to_dict()), 201
+            f"CV uploaded (S3 Key: {uploaded_s3_key}), Placeholder Candidate ID: {candidate_id_for_task} created for Company {target_company_id_for_candidate}. Parsing task queued ({parse_priority} priority).")
+        return new_candidate
 
-    except Exception as e:
+    except Exception:
         db.session.rollback()
-        current_app.logger.error(
-            f"Upload Error (User: {current_user.id}, TargetCompany: {target_company_id_for_candidate}): {e}",
-            exc_info=True)
         if uploaded_s3_key:
             try:
                 s3_service.delete_file(uploaded_s3_key)
@@ -190,9 +180,113 @@ def upload_cv():
             except Exception as s3_del_err:
                 current_app.logger.error(
                     f"S3 cleanup FAILED for key {uploaded_s3_key} after upload error: {s3_del_err}")
+        raise
+
+
+def _admission_rejected_response(decision):
+    """429/503 with Retry-After for an upload refused by admission control."""
+    if decision['status_code'] == 429:
+        message = "Too many CVs of this company are waiting to be parsed. Please retry later."
+    else:
+        message = "CV parsing is overloaded right now. Please retry later."
+    body = {"error": message, "reason": decision['reason'], "retry_after_seconds": decision['retry_after_seconds']}
+    return jsonify(body), decision['status_code'], {'Retry-After': str(decision['retry_after_seconds'])}
+
+
+@bp.route('/upload', methods=['POST'])
+@login_required
+def upload_cv():
+    current_app.logger.info(f"--- Upload Request Received by User ID: {current_user.id} ({current_user.username}) ---")
+    target_company_id_for_candidate, error_response = _resolve_upload_company_id()
+    if error_response:
+        return error_response
+
+    if 'cv_file' not in request.files:
+        return jsonify({"error": "No file part named 'cv_file'"}), 400
+    file = request.files['cv_file']
+    position_name_from_form = request.form.get('position', None)
+
+    if file.filename == '':
+        return jsonify({"error": "No selected file"}), 400
+    if not allowed_file(file.filename):
+        return jsonify({"error": f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"}), 400
+
+    # A recruiter is waiting on this one: high-priority lane, unless the backlog says otherwise.
+    admission = upload_admission_service.check_upload_admission(target_company_id_for_candidate, 1,
+                                                                parse_dispatch_service.PRIORITY_HIGH)
+    if admission['action'] == upload_admission_service.REJECT:
+        current_app.logger.warning(
+            f"Upload refused for company {target_company_id_for_candidate} ({admission['reason']}, "
+            f"HTTP {admission['status_code']}, retry after {admission['retry_after_seconds']}s).")
+        return _admission_rejected_response(admission)
+
+    try:
+        new_candidate = _store_uploaded_cv(file, target_company_id_for_candidate, position_name_from_form,
+                                           admission['priority'])
+        if admission['action'] == upload_admission_service.DEFER:
+            response_data = new_candidate.to_dict()
+            response_data.update({"deferred": True, "estimated_parse_start_seconds": admission['eta_seconds']})
+            return jsonify(response_data), 202
+        return jsonify(new_candidate.to_dict()), 201
+    except Exception as e:
+        current_app.logger.error(
+            f"Upload Error (User: {current_user.id}, TargetCompany: {target_company_id_for_candidate}): {e}",
+            exc_info=True)
         return jsonify({"error": "Internal server error during CV upload."}), 500
 
 
+@bp.route('/upload/bulk', methods=['POST'])
+@login_required
+def upload_cv_bulk():
+    """
+    Bulk import: many files under 'cv_files'. The CVs go to the low-priority parse lane, so they never
+    delay interactive uploads but keep a guaranteed share of parsing capacity.
+    """
+    current_app.logger.info(f"--- Bulk Upload Request Received by User ID: {current_user.id} ({current_user.username}) ---")
+    target_company_id_for_candidate, error_response = _resolve_upload_company_id()
+    if error_response:
+        return error_response
+
+    files = [f for f in request.files.getlist('cv_files') if f and f.filename]
+    if not files:
+        return jsonify({"error": "No files in part 'cv_files'"}), 400
+    max_files = current_app.config.get('BULK_UPLOAD_MAX_FILES', 200)
+    if len(files) > max_files:
+        return jsonify({"error": f"Too many files. At most {max_files} per bulk upload."}), 400
+    position_name_from_form = request.form.get('position', None)
+
+    admission = upload_admission_service.check_upload_admission(target_company_id_for_candidate, len(files),
+                                                                parse_dispatch_service.PRIORITY_LOW)
+    if admission['action'] == upload_admission_service.REJECT:
+        current_app.logger.warning(
+            f"Bulk upload of {len(files)} file(s) refused for company {target_company_id_for_candidate} "
+            f"({admission['reason']}, HTTP {admission['status_code']}).")
+        return _admission_rejected_response(admission)
+
+    accepted, rejected = [], []
+    for file in files:
+        if not allowed_file(file.filename):
+            rejected.append({"filename": file.filename,
+                             "error": f"Invalid file type. Allowed: {', '.join(ALLOWED_EXTENSIONS)}"})
+            continue
+        try:
+            new_candidate = _store_uploaded_cv(file, target_company_id_for_candidate, position_name_from_form,
+                                               parse_dispatch_service.PRIORITY_LOW)
+            accepted.append({"filename": file.filename, "candidate_id": str(new_candidate.candidate_id)})
+        except Exception as e:
+            current_app.logger.error(
+                f"Bulk Upload Error for '{file.filename}' (User: {current_user.id}, TargetCompany: {target_company_id_for_candidate}): {e}",
+                exc_info=True)
+            rejected.append({"filename": file.filename, "error": "Internal server error during CV upload."})
+
+    current_app.logger.info(
+        f"Bulk upload by user {current_user.id} for company {target_company_id_for_candidate}: {len(accepted)} accepted, {len(rejected)} rejected.")
+    status_code = 202 if accepted else 400
+    return jsonify({"accepted": accepted, "rejected": rejected,
+                    "deferred": admission['action'] == upload_admission_service.DEFER,
+                    "estimated_parse_start_seconds": admission['eta_seconds']}), status_code
+
+
 # --- Dashboard Routes ---
 @bp.route('/dashboard/summary', methods=['GET'])
 @login_required
@@ -490,6 +584,7 @@ def handle_candidate(candidate_id_url):
                 if key == 'email' and value_from_payload:
                     new_value = value_from_payload.lower().strip()
                     if new_value != candidate.email:
+                        locking_service.lock_candidate_email(candidate.company_id, new_value)
                         existing_with_new_email = Candidate.query.filter(
                             Candidate.email == new_value,
                             Candidate.company_id == candidate.company_id,
@@ -595,6 +690,26 @@ def handle_candidate(candidate_id_url):
                     updated_fields_tracker = True
                     current_app.logger.debug(f"Candidate {candidate.candidate_id}: Offers updated.")
 
+            elif key == 'interviewers':
+                # List of user ids of the candidate's company (superadmins may interview anywhere).
+                if not isinstance(value_from_payload, list) or \
+                        not all(isinstance(i, int) and not isinstance(i, bool) for i in value_from_payload):
+                    return jsonify({"error": "'interviewers' must be a list of user ids."}), 400
+                new_interviewers = sorted(set(value_from_payload))
+                if new_interviewers:
+                    valid_interviewer_ids = {u.id for u in User.query.filter(
+                        User.id.in_(new_interviewers),
+                        or_(User.company_id == candidate.company_id, User.role == 'superadmin')).all()}
+                    unknown_ids = [i for i in new_interviewers if i not in valid_interviewer_ids]
+                    if unknown_ids:
+                        return jsonify({"error": f"Unknown interviewer user id(s) for this company: {unknown_ids}."}), 400
+                if sorted(candidate.interviewers or []) != new_interviewers:
+                    candidate.interviewers = new_interviewers
+                    flag_modified(candidate, "interviewers")
+                    updated_fields_tracker = True
+                    current_app.logger.debug(
+                        f"Candidate {candidate.candidate_id}: Interviewers set to {new_interviewers}.")
+
         new_status_from_payload = data.get('current_status', original_status)
         status_changed_flag = False
         if new_status_from_payload != original_status:
@@ -648,31 +763,22 @@ def handle_candidate(candidate_id_url):
 
         try:
             candidate.updated_at = datetime.now(dt_timezone.utc)
-            db.session.commit()
-            current_app.logger.info(
-                f"Candidate {candidate.candidate_id} updated successfully by {user_id_for_logs} ({user_username_for_logs}).")
 
             should_send_invitation = (
                                              interview_time_changed_flag and candidate.interview_datetime and candidate.current_status == 'Interview') or \
                                      (
                                              status_changed_flag and candidate.current_status == 'Interview' and candidate.interview_datetime and candidate.candidate_confirmation_status == 'Pending')
 
+            # Emails go into the outbox in this same transaction: sent if and only if the update commits.
             if should_send_invitation:
-                try:
-                    celery.send_task('tasks.communication.send_interview_invitation_email_task',
-                                     args=[str(candidate.candidate_id)])
-                    current_app.logger.info(f"Sent interview invitation task for candidate {candidate.candidate_id}")
-                except Exception as celery_e:
-                    current_app.logger.error(
-                        f"Celery task queue error (send_interview_invitation_email_task): {celery_e}")
-
+                email_outbox_service.enqueue_interview_invitation(candidate)
             if status_changed_flag and new_status_from_payload in ['Rejected', 'Declined']:
-                try:
-                    celery.send_task('tasks.communication.send_rejection_email_task',
-                                     args=[str(candidate.candidate_id)])
-                    current_app.logger.info(f"Sent rejection email task for candidate {candidate.candidate_id}")
-                except Exception as celery_e:
-                    current_app.logger.error(f"Celery task queue error (send_rejection_email_task): {celery_e}")
+                email_outbox_service.enqueue_rejection(candidate)
+            reminder_schedule_service.sync_changes(candidates=[candidate])
+
+            db.session.commit()
+            current_app.logger.info(
+                f"Candidate {candidate.candidate_id} updated successfully by {user_id_for_logs} ({user_username_for_logs}).")
 
             cv_url_val_updated = s3_service.generate_presigned_url(candidate.cv_storage_path,
                                                                    expiration=900) if candidate.cv_storage_path else None
@@ -743,6 +849,68 @@ def get_candidate_cv_url(candidate_id_url):
         return jsonify({"error": "Failed to generate CV URL due to an internal error."}), 500
 
 
+@bp.route('/candidate/<string:candidate_id_url>/parse_status', methods=['GET'])
+@login_required
+def get_candidate_parse_status(candidate_id_url):
+    """
+    Outcome of the CV pipeline for an uploaded CV, from cv_parse_jobs (not the Celery result backend).
+    Works with the placeholder ID returned by /upload even after the placeholder was merged into an
+    existing candidate: result_candidate_id then points to the surviving record.
+    """
+    try:
+        candidate_uuid = uuid.UUID(candidate_id_url)
+    except ValueError:
+        return jsonify({"error": "Invalid candidate ID format."}), 400
+
+    user_company_id_context = get_current_user_company_id()
+    job = CvParseJob.query.filter(
+        or_(CvParseJob.placeholder_candidate_id == candidate_uuid,
+            CvParseJob.result_candidate_id == candidate_uuid)
+    ).order_by(CvParseJob.created_at.desc()).first()
+
+    if job:
+        if current_user.role != 'superadmin' and job.company_id != user_company_id_context:
+            return jsonify({"error": "Access denied to this candidate."}), 403
+        return jsonify(job.to_dict()), 200
+
+    # No job row yet: the pipeline has not reached the fetch stage.
+    candidate = Candidate.query.get_or_404(candidate_uuid, description=f"Candidate {candidate_id_url} not found.")
+    if current_user.role != 'superadmin' and candidate.company_id != user_company_id_context:
+        return jsonify({"error": "Access denied to this candidate."}), 403
+    if candidate.current_status == 'Processing':
+        return jsonify({"placeholder_candidate_id": str(candidate.candidate_id), "state": "queued",
+                        "company_id": candidate.company_id}), 200
+    return jsonify({"error": "No CV parsing record for this candidate."}), 404
+
+
+@bp.route('/parse_jobs', methods=['GET'])
+@login_required
+def list_parse_jobs():
+    """Recent CV pipeline outcomes of the user's company. Optional filters: ?state=failed&limit=50"""
+    user_company_id_context = get_current_user_company_id()
+    query = CvParseJob.query
+    if current_user.role == 'superadmin':
+        company_id_filter = request.args.get('company_id', type=int)
+        if company_id_filter:
+            query = query.filter(CvParseJob.company_id == company_id_filter)
+    elif user_company_id_context:
+        query = query.filter(CvParseJob.company_id == user_company_id_context)
+    else:
+        return jsonify({"error": "User not associated with a company or unauthorized."}), 403
+
+    state_filter = request.args.get('state')
+    if state_filter:
+        valid_states = [CvParseJob.STATE_STARTED, CvParseJob.STATE_PARSED, CvParseJob.STATE_PERSISTED,
+                        CvParseJob.STATE_FAILED]
+        if state_filter not in valid_states:
+            return jsonify({"error": f"Invalid state. Allowed: {', '.join(valid_states)}"}), 400
+        query = query.filter(CvParseJob.state == state_filter)
+
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    jobs = query.order_by(CvParseJob.created_at.desc()).limit(limit).all()
+    return jsonify({"parse_jobs": [job.to_dict() for job in jobs], "count": len(jobs)}), 200
+
+
 @bp.route('/search', methods=['GET'])
 @login_required
 def search_candidates():
@@ -807,13 +975,119 @@ def search_candidates():
         return jsonify({"error": "Search operation failed due to an internal error."}), 500
 
 
+@bp.route('/interviews/upcoming', methods=['GET'])
+@login_required
+def get_my_upcoming_interviews():
+    """Interviews the current user is an assigned interviewer of, from now to `days` ahead (default 14)."""
+    days = min(max(request.args.get('days', 14, type=int), 1), 90)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 200)
+    now_utc = datetime.now(dt_timezone.utc)
+    try:
+        query_obj = Candidate.query.filter(
+            Candidate.has_interviewer(current_user.id),  # GIN (jsonb_path_ops) on candidates.interviewers
+            Candidate.interview_datetime >= now_utc,
+            Candidate.interview_datetime < now_utc + timedelta(days=days),
+        )
+        user_company_id_context = get_current_user_company_id()
+        if current_user.role != 'superadmin':
+            if not user_company_id_context:
+                return jsonify({"error": "User not associated with a company or unauthorized."}), 403
+            query_obj = query_obj.filter(Candidate.company_id == user_company_id_context)
+
+        candidates = query_obj.order_by(Candidate.interview_datetime.asc()).limit(limit).all()
+        interviews = [{
+            'candidate_id': str(cand.candidate_id),
+            'company_id': cand.company_id,
+            'full_name': cand.get_full_name(),
+            'current_status': cand.current_status,
+            'interview_datetime': cand.interview_datetime.isoformat(),
+            'interview_location': cand.interview_location,
+            'interview_type': cand.interview_type,
+            'interviewers': cand.interviewers or [],
+            'candidate_confirmation_status': cand.candidate_confirmation_status,
+            'positions': [pos.position_name for pos in cand.positions],
+        } for cand in candidates]
+        return jsonify({"interviews": interviews, "days": days, "count": len(interviews)}), 200
+    except Exception as e:
+        current_app.logger.error(f"Error listing upcoming interviews for user {current_user.id}: {e}", exc_info=True)
+        return jsonify({"error": "Failed to retrieve upcoming interviews."}), 500
+
+
+def _parse_interview_datetime(value):
+    """ISO 8601 -> aware UTC datetime (naive values are taken as UTC). Raises ValueError/TypeError."""
+    parsed_dt = dateutil_parser.isoparse(value)
+    return parsed_dt.astimezone(dt_timezone.utc) if parsed_dt.tzinfo else parsed_dt.replace(tzinfo=dt_timezone.utc)
+
+
+@bp.route('/interviews/bulk_schedule', methods=['POST'])
+@login_required
+def bulk_schedule_interviews():
+    """
+    Schedules many interviews at once (e.g. an assessment day). Body:
+    {"interviews": [{"candidate_id", "interview_datetime", "interview_location"?, "interview_type"?}, ...],
+     "interview_location"?, "interview_type"?}  (top-level values are the default for every slot).
+    All or nothing: if any slot is invalid nothing is scheduled and every error is returned.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('interviews')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "'interviews' must be a non-empty list."}), 400
+    max_candidates = interview_schedule_service.max_candidates()
+    if len(items) > max_candidates:
+        return jsonify({"error": f"Too many interviews. At most {max_candidates} per request."}), 400
+    user_company_id_context = get_current_user_company_id()
+    if current_user.role != 'superadmin' and not user_company_id_context:
+        return jsonify({"error": "User not associated with a company or unauthorized."}), 403
+
+    slots, errors = [], []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "error": "Each interview must be an object."})
+            continue
+        try:
+            candidate_uuid = uuid.UUID(str(item.get('candidate_id')))
+        except ValueError:
+            errors.append({"index": index, "error": "Invalid candidate ID format."})
+            continue
+        try:
+            interview_dt = _parse_interview_datetime(item.get('interview_datetime'))
+        except (ValueError, TypeError, OverflowError):
+            errors.append({"index": index, "candidate_id": str(candidate_uuid),
+                           "error": "Invalid or missing interview_datetime (ISO 8601 expected)."})
+            continue
+        slots.append({'candidate_id': candidate_uuid, 'interview_datetime': interview_dt,
+                      'interview_location': item.get('interview_location') or data.get('interview_location') or None,
+                      'interview_type': item.get('interview_type') or data.get('interview_type') or None})
+    if errors:
+        return jsonify({"error": "Invalid interviews.", "errors": errors}), 400
+
+    try:
+        current_state, errors = interview_schedule_service.validate_slots(slots, user_company_id_context)
+        if errors:
+            db.session.rollback()  # Releases the row locks taken by the validation
+            return jsonify({"error": "Some interviews cannot be scheduled.", "errors": errors}), 400
+        scheduled = interview_schedule_service.schedule_interviews(
+            slots, current_state, actor_id=current_user.id, actor_username=current_user.username)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Bulk interview scheduling by user {current_user.id} failed: {e}", exc_info=True)
+        return jsonify({"error": "Failed to schedule the interviews due to an internal error."}), 500
+
+    current_app.logger.info(
+        f"User {current_user.id} ({current_user.username}) bulk scheduled {len(scheduled)} interview(s).")
+    return jsonify({"scheduled": scheduled, "count": len(scheduled)}), 200
+
+
 @bp.route('/settings', methods=['GET', 'PUT'])
 @login_required
 def handle_settings():
     if request.method == 'GET':
         user_settings = {
             "enable_email_interview_reminders": current_user.enable_email_interview_reminders,
-            "interview_reminder_lead_time_minutes": current_user.interview_reminder_lead_time_minutes
+            "interview_reminder_lead_time_minutes": current_user.interview_reminder_lead_time_minutes,
+            "interview_reminder_digest": current_user.interview_reminder_digest,
+            "interview_reminder_digest_window_minutes": current_user.interview_reminder_digest_window_minutes
         }
         return jsonify(user_settings), 200
     elif request.method == 'PUT':
@@ -835,16 +1109,41 @@ def handle_settings():
             except (ValueError, TypeError):
                 return jsonify({"error": "Invalid lead time format. Must be an integer."}), 400
 
+        if 'interview_reminder_digest' in data:
+            current_user.interview_reminder_digest = bool(data['interview_reminder_digest'])
+            updated = True
+
+        if 'interview_reminder_digest_window_minutes' in data:
+            try:
+                digest_window = int(data['interview_reminder_digest_window_minutes'])
+                if not (reminder_schedule_service.MIN_DIGEST_WINDOW_MINUTES <= digest_window
+                        <= reminder_schedule_service.MAX_DIGEST_WINDOW_MINUTES):
+                    return jsonify({"error": f"Digest window out of range "
+                                             f"({reminder_schedule_service.MIN_DIGEST_WINDOW_MINUTES}-"
+                                             f"{reminder_schedule_service.MAX_DIGEST_WINDOW_MINUTES} minutes)."}), 400
+                current_user.interview_reminder_digest_window_minutes = digest_window
+                updated = True
+            except (ValueError, TypeError):
+                return jsonify({"error": "Invalid digest window format. Must be an integer."}), 400
+
         if not updated:
             return jsonify({"message": "No settings changed."}), 304
 
         try:
+            reminder_settings_changed = ('enable_email_interview_reminders' in data
+                                         or 'interview_reminder_lead_time_minutes' in data)
+            digest_settings_changed = ('interview_reminder_digest' in data
+                                       or 'interview_reminder_digest_window_minutes' in data)
+            reminder_schedule_service.sync_changes(users=[current_user] if reminder_settings_changed else (),
+                                                   rearm_users=[current_user] if digest_settings_changed else ())
             db.session.commit()
             return jsonify({
                 "message": "Settings updated successfully.",
                 "settings": {
                     "enable_email_interview_reminders": current_user.enable_email_interview_reminders,
-                    "interview_reminder_lead_time_minutes": current_user.interview_reminder_lead_time_minutes
+                    "interview_reminder_lead_time_minutes": current_user.interview_reminder_lead_time_minutes,
+                    "interview_reminder_digest": current_user.interview_reminder_digest,
+                    "interview_reminder_digest_window_minutes": current_user.interview_reminder_digest_window_minutes
                 }
             }), 200
         except Exception as e:
@@ -855,6 +1154,47 @@ def handle_settings():
     return jsonify({"error": "Method not allowed."}), 405
 
 
+@bp.route('/notifications', methods=['GET'])
+@login_required
+def list_notifications():
+    """The current user's notifications, newest first. Paginate with before_id=<last id of the previous page>."""
+    notifications = notification_service.list_notifications(
+        current_user.id,
+        unread_only=request.args.get('unread_only', 'false').lower() in ('1', 'true', 'yes'),
+        limit=request.args.get('limit', 20, type=int),
+        before_id=request.args.get('before_id', type=int))
+    return jsonify({
+        "notifications": [notification.to_dict() for notification in notifications],
+        "unread_count": notification_service.get_unread_count(current_user.id),
+    }), 200
+
+
+@bp.route('/notifications/unread_count', methods=['GET'])
+@login_required
+def get_unread_notification_count():
+    """Cached unread count of the current user (what the frontend polls)."""
+    return jsonify({"unread_count": notification_service.get_unread_count(current_user.id)}), 200
+
+
+@bp.route('/notifications/mark_read', methods=['POST'])
+@login_required
+def mark_notifications_read():
+    """Marks the given notification ids (or, without `ids`, all of the current user's notifications) as read."""
+    data = request.get_json(silent=True) or {}
+    notification_ids = data.get('ids')
+    if notification_ids is not None and (not isinstance(notification_ids, list) or not all(
+            isinstance(i, int) and not isinstance(i, bool) for i in notification_ids)):
+        return jsonify({"error": "'ids' must be a list of notification ids."}), 400
+    try:
+        marked = notification_service.mark_read(current_user.id, notification_ids)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Failed to mark notifications read for user {current_user.id}: {e}", exc_info=True)
+        return jsonify({"error": "Failed to mark notifications as read."}), 500
+    return jsonify({"marked": marked, "unread_count": notification_service.get_unread_count(current_user.id)}), 200
+
+
 @bp.route('/interviews/confirm/<string:confirmation_uuid_str>', methods=['GET'])
 def confirm_interview(confirmation_uuid_str):
     try:
@@ -883,16 +1223,12 @@ def confirm_interview(confirmation_uuid_str):
             actor_username="Candidate",
             details={"confirmation_uuid": confirmation_uuid_str}
         )
+        task_publish_service.publish_after_commit('tasks.communication.notify_recruiter_interview_confirmed_task',
+                                                  args=[str(candidate.candidate_id), candidate.company_id])
         try:
             db.session.commit()
             current_app.logger.info(
                 f"Candidate {candidate.candidate_id} confirmed interview (UUID: {confirmation_uuid_str}).")
-            try:
-                celery.send_task('tasks.communication.notify_recruiter_interview_confirmed_task',
-                                 args=[str(candidate.candidate_id), candidate.company_id])
-            except Exception as celery_err:
-                current_app.logger.error(f"Celery task error (notify_recruiter_interview_confirmed_task): {celery_err}",
-                                         exc_info=True)
 
             html_response = f"<h1>Επιβεβαίωση Επιτυχής</h1><p>Ευχαριστούμε, {candidate.get_full_name()}! Η συνέντευξή σας στις {candidate.interview_datetime.astimezone(dt_timezone.utc).strftime('%d/%m/%Y %H:%M')} UTC έχει επιβεβαιωθεί.</p>"
         except Exception as e_commit:
@@ -937,16 +1273,12 @@ def decline_interview(confirmation_uuid_str):
             actor_username="Candidate",
             details={"confirmation_uuid": confirmation_uuid_str}
         )
+        task_publish_service.publish_after_commit('tasks.communication.notify_recruiter_interview_declined_task',
+                                                  args=[str(candidate.candidate_id), candidate.company_id])
         try:
             db.session.commit()
             current_app.logger.info(
                 f"Candidate {candidate.candidate_id} declined/requested change for interview (UUID: {confirmation_uuid_str}).")
-            try:
-                celery.send_task('tasks.communication.notify_recruiter_interview_declined_task',
-                                 args=[str(candidate.candidate_id), candidate.company_id])
-            except Exception as celery_err:
-                current_app.logger.error(f"Celery task error (notify_recruiter_interview_declined_task): {celery_err}",
-                                         exc_info=True)
 
             html_response = f"<h1>Επιβεβαίωση Άρνησης/Αλλαγής</h1><p>Λάβαμε την ενημέρωσή σας για τη συνέντευξη στις {candidate.interview_datetime.astimezone(dt_timezone.utc).strftime('%d/%m/%Y %H:%M')} UTC. Ένας υπεύθυνος θα επικοινωνήσει μαζί σας αν χρειαστεί.</p>"
         except Exception as e_commit:
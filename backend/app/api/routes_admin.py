@@ -1,7 +1,11 @@
 # backend/app/api/routes_admin.py
 from flask import Blueprint, request, jsonify, current_app
-from app import db
+from app import db, celery
 from app.models import User, Company, CompanySettings
+from app.services import parse_dispatch_service, dead_letter_service, queue_metrics_service, task_metrics_service, \
+    upload_admission_service, email_template_service, reminder_schedule_service, email_outbox_service
+from app.celery_queues import ALL_QUEUES, get_queue_depth
+from dateutil import parser as dateutil_parser
 from flask_login import login_required, current_user
 from functools import wraps
 from datetime import datetime, timezone  # <--- ΠΡΟΣΘΗΚΗ ΑΥΤΟΥ ΤΟΥ IMPORT
@@ -99,6 +103,7 @@ def get_company(company_id):
             "enable_reminders_feature_for_company": company.settings.enable_reminders_feature_for_company,
             "rejection_email_template": company.settings.rejection_email_template,
             "interview_invitation_email_template": company.settings.interview_invitation_email_template,
+            "email_templates_version": company.settings.email_templates_version,
         }
 
     return jsonify({
@@ -156,6 +161,49 @@ def update_company(company_id):
             company.owner_user_id = new_owner_id
             updated = True
 
+    if 'parse_queue_weight' in data:
+        new_weight = data.get('parse_queue_weight')
+        if not isinstance(new_weight, int) or isinstance(new_weight, bool) or not 1 <= new_weight <= 100:
+            return jsonify({"error": "parse_queue_weight must be an integer between 1 and 100."}), 400
+        company_settings = CompanySettings.query.filter_by(company_id=company_id).first()
+        if not company_settings:
+            company_settings = CompanySettings(company_id=company_id)
+            db.session.add(company_settings)
+        if company_settings.parse_queue_weight != new_weight:
+            company_settings.parse_queue_weight = new_weight
+            updated = True
+
+    if 'parse_admission_max_backlog' in data:
+        new_max_backlog = data.get('parse_admission_max_backlog')  # None = global default
+        if new_max_backlog is not None and (not isinstance(new_max_backlog, int) or isinstance(new_max_backlog, bool)
+                                            or not 1 <= new_max_backlog <= 100000):
+            return jsonify({"error": "parse_admission_max_backlog must be null or an integer between 1 and 100000."}), 400
+        company_settings = CompanySettings.query.filter_by(company_id=company_id).first()
+        if not company_settings:
+            company_settings = CompanySettings(company_id=company_id)
+            db.session.add(company_settings)
+        if company_settings.parse_admission_max_backlog != new_max_backlog:
+            company_settings.parse_admission_max_backlog = new_max_backlog
+            updated = True
+
+    for template_field in email_template_service.COMPANY_TEMPLATE_FIELDS.values():
+        if template_field not in data:
+            continue
+        new_template = data.get(template_field) or None  # Empty/None = back to the default template
+        if new_template is not None:
+            if not isinstance(new_template, str):
+                return jsonify({"error": f"{template_field} must be a string or null."}), 400
+            template_error = email_template_service.validate_template_source(new_template)
+            if template_error:
+                return jsonify({"error": f"{template_field} is not a valid template: {template_error}"}), 400
+        company_settings = CompanySettings.query.filter_by(company_id=company_id).first()
+        if not company_settings:
+            company_settings = CompanySettings(company_id=company_id)
+            db.session.add(company_settings)
+        if getattr(company_settings, template_field) != new_template:
+            setattr(company_settings, template_field, new_template)
+            updated = True
+
     if not updated:
         return jsonify({"message": "No changes detected"}), 304  # HTTP 304 Not Modified
 
@@ -174,6 +222,156 @@ def update_company(company_id):
         return jsonify({"error": "Failed to update company."}), 500
 
 
+# === CV Parsing Queue ===
+
+@admin_bp.route('/parse_queue', methods=['GET'])
+@login_required
+@superadmin_required
+def get_parse_queue_metrics():
+    """Fair-share parse queue: per-company depth, oldest waiting CV, dispatch wait times and weights,
+    plus the upload admission-control view (drain estimate per lane, thresholds)."""
+    try:
+        metrics = parse_dispatch_service.get_fair_share_metrics()
+        metrics['admission'] = upload_admission_service.get_admission_status(request.args.get('company_id', type=int))
+        return jsonify(metrics), 200
+    except Exception as e:
+        current_app.logger.error(f"Error reading parse queue metrics: {e}", exc_info=True)
+        return jsonify({"error": "Failed to read parse queue metrics."}), 500
+
+
+@admin_bp.route('/autoscaler', methods=['GET'])
+@login_required
+@superadmin_required
+def get_autoscaler_metrics():
+    """Autoscaling workers (queue depth, p95 wait, pool size, desired size) and their recent scaling decisions."""
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+    try:
+        redis_url = current_app.config.get('REDIS_URL')
+        metrics = queue_metrics_service.get_autoscaler_metrics(redis_url, decisions_limit=limit)
+        metrics['queues'] = {
+            queue_name: {
+                'depth': get_queue_depth(celery, queue_name),
+                'latency': queue_metrics_service.get_queue_latency_stats(redis_url, queue_name),
+            }
+            for queue_name in ALL_QUEUES
+        }
+        return jsonify(metrics), 200
+    except Exception as e:
+        current_app.logger.error(f"Error reading autoscaler metrics: {e}", exc_info=True)
+        return jsonify({"error": "Failed to read autoscaler metrics."}), 500
+
+
+@admin_bp.route('/beat', methods=['GET'])
+@login_required
+@superadmin_required
+def get_beat_metrics():
+    """Current beat leader, per periodic entry: sends, schedule lag (avg/last/max) and skipped overlapping runs."""
+    try:
+        return jsonify(queue_metrics_service.get_beat_metrics(current_app.config.get('REDIS_URL'),
+                                                              celery.conf.beat_schedule)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error reading beat metrics: {e}", exc_info=True)
+        return jsonify({"error": "Failed to read beat metrics."}), 500
+
+
+@admin_bp.route('/email_outbox', methods=['GET'])
+@login_required
+@superadmin_required
+def get_email_outbox_metrics():
+    """Email outbox lag (pending/due rows, age of the oldest due email) and throughput over the last window_minutes."""
+    window_minutes = min(max(request.args.get('window_minutes', 60, type=int), 1), 24 * 60)
+    try:
+        return jsonify(email_outbox_service.get_outbox_metrics(window_minutes=window_minutes)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error reading email outbox metrics: {e}", exc_info=True)
+        return jsonify({"error": "Failed to read email outbox metrics."}), 500
+
+
+@admin_bp.route('/task_metrics', methods=['GET'])
+@login_required
+@superadmin_required
+def get_task_metrics():
+    """Top task types by memory (RSS delta, tracemalloc peak), wall and DB time over the last `hours`."""
+    hours = min(max(request.args.get('hours', 24, type=int), 1), 24 * 7)
+    limit = min(max(request.args.get('limit', 10, type=int), 1), 100)
+    sort_by = request.args.get('sort_by', 'max_rss_delta_kb')
+    if sort_by not in task_metrics_service.SORT_FIELDS:
+        return jsonify({"error": f"Unsupported sort_by '{sort_by}'."}), 400
+    try:
+        return jsonify(task_metrics_service.get_task_metrics_report(
+            current_app.config.get('REDIS_URL'), hours=hours, limit=limit, sort_by=sort_by)), 200
+    except Exception as e:
+        current_app.logger.error(f"Error reading task metrics: {e}", exc_info=True)
+        return jsonify({"error": "Failed to read task metrics."}), 500
+
+
+def _dead_letter_filters(source):
+    """Reads the dead-letter filters from request args or a JSON body. Raises ValueError on bad input."""
+    filters = {
+        'company_id': source.get('company_id'),
+        'error_class': source.get('error_class') or None,
+        'failed_stage': source.get('failed_stage') or None,
+        'status': source.get('status') or 'pending',
+        'failed_after': None,
+        'failed_before': None,
+    }
+    if filters['company_id'] not in (None, ''):
+        filters['company_id'] = int(filters['company_id'])
+    else:
+        filters['company_id'] = None
+    for key in ('failed_after', 'failed_before'):
+        if source.get(key):
+            filters[key] = dateutil_parser.isoparse(source.get(key))
+    return filters
+
+
+@admin_bp.route('/parse_dead_letters', methods=['GET'])
+@login_required
+@superadmin_required
+def list_parse_dead_letters():
+    """Failed parses. Filters: company_id, error_class, failed_stage, status (default pending), failed_after/before."""
+    try:
+        filters = _dead_letter_filters(request.args)
+    except (ValueError, OverflowError) as e:
+        return jsonify({"error": f"Invalid filter: {e}"}), 400
+    limit = min(max(request.args.get('limit', 100, type=int), 1), 1000)
+    query = dead_letter_service.build_dead_letter_query(**filters)
+    total = query.count()
+    dead_letters = query.limit(limit).all()
+    return jsonify({"total": total, "dead_letters": [dl.to_dict() for dl in dead_letters]}), 200
+
+
+@admin_bp.route('/parse_dead_letters/replay', methods=['POST'])
+@login_required
+@superadmin_required
+def replay_parse_dead_letters():
+    """
+    Re-enqueues all pending dead letters matching the filters, rate limited.
+    Body: same filters as the GET, plus rate_per_minute, limit and dry_run.
+    """
+    data = request.get_json() or {}
+    try:
+        filters = _dead_letter_filters(data)
+        rate_per_minute = int(data['rate_per_minute']) if data.get('rate_per_minute') else None
+        limit = int(data['limit']) if data.get('limit') else None
+    except (ValueError, TypeError, OverflowError) as e:
+        return jsonify({"error": f"Invalid replay request: {e}"}), 400
+    if filters['status'] != 'pending':
+        return jsonify({"error": "Only pending dead letters can be replayed."}), 400
+
+    try:
+        summary = dead_letter_service.schedule_replay(rate_per_minute=rate_per_minute, limit=limit,
+                                                      dry_run=bool(data.get('dry_run')), **filters)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error scheduling dead-letter replay: {e}", exc_info=True)
+        return jsonify({"error": "Failed to schedule replay."}), 500
+
+    current_app.logger.info(f"Dead-letter replay requested by superadmin {current_user.username}: {summary}")
+    return jsonify(summary), 202 if not summary['dry_run'] else 200
+
+
 # === User Management Endpoints by Superadmin ===
 
 @admin_bp.route('/users', methods=['POST'])
@@ -233,6 +431,7 @@ def create_user_by_superadmin():
         )
         new_user.set_password(password)
         db.session.add(new_user)
+        reminder_schedule_service.sync_changes(users=[new_user])
         db.session.commit()
 
         current_app.logger.info(
@@ -361,10 +560,36 @@ def update_user_by_superadmin(user_id):
         except ValueError:
             return jsonify({"error": "Invalid format for interview_reminder_lead_time_minutes."}), 400
 
+    if 'interview_reminder_digest' in data and bool(data['interview_reminder_digest']) != \
+            user_to_update.interview_reminder_digest:
+        user_to_update.interview_reminder_digest = bool(data['interview_reminder_digest'])
+        updated_fields_count += 1
+
+    if 'interview_reminder_digest_window_minutes' in data:
+        try:
+            digest_window = int(data['interview_reminder_digest_window_minutes'])
+            if not (reminder_schedule_service.MIN_DIGEST_WINDOW_MINUTES <= digest_window
+                    <= reminder_schedule_service.MAX_DIGEST_WINDOW_MINUTES):
+                return jsonify({"error": f"Interview reminder digest window must be between "
+                                         f"{reminder_schedule_service.MIN_DIGEST_WINDOW_MINUTES} and "
+                                         f"{reminder_schedule_service.MAX_DIGEST_WINDOW_MINUTES} minutes."}), 400
+            if digest_window != user_to_update.interview_reminder_digest_window_minutes:
+                user_to_update.interview_reminder_digest_window_minutes = digest_window
+                updated_fields_count += 1
+        except (ValueError, TypeError):
+            return jsonify({"error": "Invalid format for interview_reminder_digest_window_minutes."}), 400
+
     if updated_fields_count == 0:
         return jsonify({"message": "No updatable fields provided or values are the same."}), 304
 
     try:
+        # Any of these decides whether (and which) interview reminders the user gets
+        recipient_fields = ('email', 'role', 'company_id', 'is_active', 'enable_email_interview_reminders',
+                            'interview_reminder_lead_time_minutes')
+        digest_fields = ('interview_reminder_digest', 'interview_reminder_digest_window_minutes')
+        reminder_schedule_service.sync_changes(
+            users=[user_to_update] if any(field in data for field in recipient_fields) else (),
+            rearm_users=[user_to_update] if any(field in data for field in digest_fields) else ())
         db.session.commit()
         current_app.logger.info(f"User ID {user_id} updated by superadmin {current_user.username}.")
         return jsonify(
@@ -2,6 +2,7 @@
 from flask import Blueprint, request, jsonify, current_app
 from app import db
 from app.models import User
+from app.services import reminder_schedule_service
 from flask_login import login_required, current_user
 from functools import wraps
 from datetime import datetime, timezone
@@ -72,7 +73,9 @@ def create_company_user():
             confirmed_on=datetime.now(timezone.utc), company_id=admin_company_id
         )
         new_user.set_password(password)
-        db.session.add(new_user); db.session.commit()
+        db.session.add(new_user)
+        reminder_schedule_service.sync_changes(users=[new_user])
+        db.session.commit()
         current_app.logger.info(f"User '{new_user.username}' created for company ID {admin_company_id} by company admin {current_user.username}.")
         return jsonify({
             "id": new_user.id, "username": new_user.username, "email": new_user.email,
@@ -107,6 +110,7 @@ def toggle_company_user_status(user_id):
     if new_status and not user_to_toggle.confirmed_on:
         user_to_toggle.confirmed_on = datetime.now(timezone.utc)
     try:
+        reminder_schedule_service.sync_changes(users=[user_to_toggle])
         db.session.commit()
         current_app.logger.info(f"User '{user_to_toggle.username}' (ID: {user_to_toggle.id}) status changed to {new_status} by company admin {current_user.username}.")
         return jsonify({
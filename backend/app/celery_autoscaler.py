@@ -0,0 +1,130 @@
+# backend/app/celery_autoscaler.py
+# Autoscaler βάσει βάθους ουράς και χρόνου αναμονής (ενεργοποιείται με `celery worker --autoscale=MAX,MIN`).
+
+import logging
+import math
+import socket
+import time
+from time import monotonic
+
+from celery.worker.autoscale import Autoscaler
+
+from app.celery_queues import get_queue_depth
+from app.services import queue_metrics_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTOSCALE_SETTINGS = {
+    'sample_interval': 5.0,          # Seconds between evaluations (broker depth is read at most this often)
+    'backlog_per_process': 2,        # Waiting messages one extra process/greenlet is expected to absorb
+    'target_latency_seconds': 10.0,  # p95 queue wait above this forces a scale-up step even at low depth
+    'scale_up_step': 4,              # Max processes added per decision (latency-driven scale-up)
+    'scale_down_step': 2,            # Max processes removed per decision
+    'scale_up_cooldown': 10.0,       # Seconds between two scale-ups
+    'scale_down_cooldown': 120.0,    # Seconds after any scaling before a scale-down
+}
+
+
+class QueueDepthAutoscaler(Autoscaler):
+    """
+    Sizes the pool between --autoscale MIN and MAX from the depth of the queues this worker consumes
+    and their recent p95 wait time (both read from Redis), with separate up/down cooldowns.
+    Celery's default autoscaler only looks at already-reserved messages, which with prefetch 1
+    means it never sees the backlog sitting in the broker.
+
+    Every evaluation is published through queue_metrics_service (GET /admin/autoscaler).
+    """
+
+    def __init__(self, pool, max_concurrency, min_concurrency=0, worker=None, keepalive=None, mutex=None):
+        self.settings = dict(DEFAULT_AUTOSCALE_SETTINGS)
+        app = worker.app if worker is not None else None
+        if app is not None:
+            self.settings.update(app.conf.get('nexona_autoscale') or {})
+        # keepalive is how often the event loop calls maybe_scale(); we evaluate on our own sample interval.
+        super().__init__(pool, max_concurrency, min_concurrency, worker=worker,
+                         keepalive=self.settings['sample_interval'], mutex=mutex)
+        self.redis_url = app.conf.get('nexona_redis_url') if app is not None else None
+        self.hostname = getattr(worker, 'hostname', None) or socket.gethostname()
+        self._last_evaluation = 0.0
+        self._last_scale_change = 0.0
+
+    @property
+    def pool_size(self):
+        # The gevent pool reports running greenlets as num_processes; its configured size is what we scale.
+        if getattr(self.pool, 'is_green', False) and getattr(self.pool, '_pool', None) is not None:
+            return self.pool._pool.size
+        return self.processes
+
+    def _consumed_queues(self):
+        try:
+            return sorted(queue.name for queue in self.worker.consumer.task_consumer.queues)
+        except AttributeError:
+            return sorted(self.worker.app.amqp.queues.consume_from or self.worker.app.amqp.queues)
+
+    def _desired_size(self, current_size, busy, depth, p95_latency):
+        desired = busy + math.ceil(depth / max(self.settings['backlog_per_process'], 1))
+        if depth and p95_latency is not None and p95_latency > self.settings['target_latency_seconds']:
+            desired = max(desired, current_size + self.settings['scale_up_step'])
+        if desired < current_size:
+            desired = max(desired, current_size - self.settings['scale_down_step'])
+        return max(self.min_concurrency, min(self.max_concurrency, desired))
+
+    def _maybe_scale(self, req=None):
+        now = monotonic()
+        if now - self._last_evaluation < self.settings['sample_interval']:
+            return False
+        self._last_evaluation = now
+
+        queues = self._consumed_queues()
+        depth_by_queue = {queue_name: get_queue_depth(self.worker.app, queue_name) for queue_name in queues}
+        latency_by_queue = {queue_name: queue_metrics_service.get_queue_latency_stats(self.redis_url, queue_name)
+                            for queue_name in queues}
+        depth = sum(depth_by_queue.values())
+        p95_values = [stats['p95_seconds'] for stats in latency_by_queue.values() if stats.get('samples')]
+        p95_latency = max(p95_values) if p95_values else None
+
+        current_size = self.pool_size
+        busy = self.qty
+        desired = self._desired_size(current_size, busy, depth, p95_latency)
+
+        action, reason = 'hold', None
+        if desired > current_size:
+            if now - (self._last_scale_up or 0) >= self.settings['scale_up_cooldown']:
+                action = 'scale_up'
+                self.scale_up(desired - current_size)
+            else:
+                reason = 'scale_up_cooldown'
+        elif desired < current_size:
+            if now - self._last_scale_change >= self.settings['scale_down_cooldown']:
+                action = 'scale_down'
+                self._shrink(current_size - desired)
+            else:
+                reason = 'scale_down_cooldown'
+        if action != 'hold':
+            self._last_scale_change = now
+
+        state = {
+            'hostname': self.hostname,
+            'queues': depth_by_queue,
+            'p95_latency_seconds': p95_latency,
+            'busy': busy,
+            'pool_size': current_size,
+            'desired': desired,
+            'min': self.min_concurrency,
+            'max': self.max_concurrency,
+            'action': action,
+            'held_by': reason,
+            'evaluated_at': time.time(),
+        }
+        decision = None
+        if action != 'hold':
+            decision = dict(state, new_pool_size=desired)
+            logger.info(f"Autoscaler {self.hostname}: {action} {current_size} -> {desired} "
+                        f"(depth={depth}, busy={busy}, p95={p95_latency}).")
+        queue_metrics_service.publish_autoscale_state(self.redis_url, self.hostname, state, decision)
+        return action != 'hold'
+
+    def info(self):
+        info = super().info()
+        info.update({'pool_size': self.pool_size, 'settings': self.settings})
+        return info
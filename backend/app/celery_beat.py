@@ -0,0 +1,122 @@
+# backend/app/celery_beat.py
+# Beat scheduler με εκλογή leader μέσω Redis: τρέχουν πολλά beat instances, αλλά μόνο ένα στέλνει tasks.
+
+import logging
+import socket
+import uuid
+from datetime import datetime
+
+import redis
+from celery.beat import Scheduler
+
+from app.services import queue_metrics_service, redis_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BEAT_SETTINGS = {
+    'leader_ttl': 30.0,       # Seconds a leader stays leader without renewing; a standby takes over after this
+    'standby_interval': 5.0,  # How often a standby tries to become leader
+}
+
+LEADER_LOCK_KEY = 'nexona:beat:leader_lock'
+LAST_RUN_KEY = 'nexona:beat:last_run_at'  # HASH entry name -> ISO last_run_at, shared by all beat instances
+
+
+class LeaderElectedScheduler(Scheduler):
+    """
+    In-memory beat scheduler for running several `celery beat` instances side by side.
+
+    - Leader election: the instance holding the Redis lock LEADER_LOCK_KEY sends the periodic tasks and
+      renews the lock every tick; the others only retry the lock. If the leader dies, its lock expires
+      after leader_ttl seconds and a standby takes over.
+    - The last run time of every entry lives in Redis (LAST_RUN_KEY) instead of a local schedule file,
+      so a new leader continues the schedule instead of starting over.
+    - Schedule lag (how late each entry was sent) is published through queue_metrics_service.
+    If Redis is unreachable the leader steps down: skipping ticks is safer than two leaders.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.redis_url = None
+        self.settings = dict(DEFAULT_BEAT_SETTINGS)
+        self.instance_id = f'{socket.gethostname()}:{uuid.uuid4().hex[:8]}'
+        self._leader_lock = None
+        self._is_leader = False
+        super().__init__(*args, **kwargs)
+
+    def setup_schedule(self):
+        self.redis_url = self.app.conf.get('nexona_redis_url')
+        self.settings.update(self.app.conf.get('nexona_beat') or {})
+        super().setup_schedule()
+
+    # --- Leader election ---
+
+    def _redis(self):
+        return redis_service.get_redis_client(self.redis_url)
+
+    def _ensure_leadership(self) -> bool:
+        try:
+            if self._leader_lock is None:
+                self._leader_lock = self._redis().lock(LEADER_LOCK_KEY, timeout=self.settings['leader_ttl'],
+                                                       blocking=False, thread_local=False)
+            if self._is_leader:
+                self._leader_lock.reacquire()  # Resets the TTL; raises if another instance holds the lock now
+                queue_metrics_service.publish_beat_leader(self.redis_url, self.instance_id,
+                                                          self.settings['leader_ttl'])
+                return True
+            if self._leader_lock.acquire(blocking=False):
+                self._is_leader = True
+                self._on_elected()
+                return True
+        except redis.exceptions.LockError as lock_err:
+            logger.warning(f"Beat {self.instance_id} lost leadership: {lock_err}")
+            self._is_leader = False
+        except redis.RedisError as redis_err:
+            if self._is_leader:
+                logger.error(f"Beat {self.instance_id} cannot reach Redis ({redis_err}); stepping down.")
+            self._is_leader = False
+        return False
+
+    def _on_elected(self):
+        # Continue from the last runs recorded by the previous leader.
+        stored = self._redis().hgetall(LAST_RUN_KEY)
+        for name, entry in self.schedule.items():
+            raw_last_run = stored.get(name.encode())
+            if raw_last_run:
+                entry.last_run_at = datetime.fromisoformat(raw_last_run.decode())
+        self._heap = None  # Rebuild the heap from the restored run times on the next tick
+        queue_metrics_service.publish_beat_leader(self.redis_url, self.instance_id, self.settings['leader_ttl'],
+                                                  elected=True)
+        logger.info(f"Beat {self.instance_id} elected leader ({len(stored)} stored run time(s) restored).")
+
+    def tick(self, *args, **kwargs):
+        if not self._ensure_leadership():
+            return self.settings['standby_interval']
+        # Wake up often enough to renew the leader lock well before it expires.
+        return min(super().tick(*args, **kwargs), self.settings['leader_ttl'] / 3.0)
+
+    # --- Sending + lag metrics ---
+
+    def apply_entry(self, entry, producer=None):
+        # `entry` still carries the previous run time (tick() reserved the next one before calling us).
+        lag_seconds = max(-entry.schedule.remaining_estimate(entry.last_run_at).total_seconds(), 0.0)
+        super().apply_entry(entry, producer=producer)
+        next_entry = self.schedule.get(entry.name)
+        try:
+            if next_entry is not None:
+                self._redis().hset(LAST_RUN_KEY, entry.name, next_entry.last_run_at.isoformat())
+        except redis.RedisError as redis_err:
+            logger.warning(f"Could not store last run of beat entry {entry.name}: {redis_err}")
+        queue_metrics_service.record_beat_dispatch(self.redis_url, entry.name, lag_seconds, self.instance_id)
+
+    def close(self):
+        if self._is_leader and self._leader_lock is not None:
+            try:
+                self._leader_lock.release()  # Hand over immediately instead of after leader_ttl
+            except (redis.exceptions.LockError, redis.RedisError):
+                pass
+        self._is_leader = False
+        super().close()
+
+    @property
+    def info(self):
+        return f'    . leader election -> {LEADER_LOCK_KEY} (ttl {self.settings["leader_ttl"]}s, id {self.instance_id})'
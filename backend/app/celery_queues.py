@@ -0,0 +1,96 @@
+# backend/app/celery_queues.py
+# Δηλωμένες ουρές Celery, routing και όρια χρόνου ανά ουρά.
+# Κάθε ουρά καταναλώνεται από δικό της worker (βλ. docker-compose.yml), ώστε ένα backlog
+# στο parsing να μην καθυστερεί τα emails και τις υπενθυμίσεις.
+
+from fnmatch import fnmatch
+
+from kombu import Exchange, Queue
+
+DEFAULT_QUEUE = 'celery'  # Το όνομα που χρησιμοποιούσε ήδη ο default worker
+CV_FETCH_QUEUE = 'cv_fetch'
+CV_PARSE_QUEUE = 'cv_parse'
+CV_PERSIST_QUEUE = 'cv_persist'
+EMAIL_QUEUE = 'email'
+REMINDERS_QUEUE = 'reminders'
+
+ALL_QUEUES = (DEFAULT_QUEUE, CV_FETCH_QUEUE, CV_PARSE_QUEUE, CV_PERSIST_QUEUE, EMAIL_QUEUE, REMINDERS_QUEUE)
+
+# Task name (or glob) -> queue. Applies to send_task() by name as well.
+TASK_QUEUE_ROUTES = {
+    'tasks.parsing.fetch_cv_stage': CV_FETCH_QUEUE,
+    'tasks.parsing.parse_cv_stage': CV_PARSE_QUEUE,
+    'tasks.parsing.persist_cv_stage': CV_PERSIST_QUEUE,
+    'tasks.parsing.parse_cv_task': CV_FETCH_QUEUE,  # Legacy entry point, only re-publishes the chain
+    'tasks.communication.prune_email_outbox': DEFAULT_QUEUE,  # Bulk DELETE; not worth an email worker slot
+    'tasks.communication.*': EMAIL_QUEUE,
+    'tasks.reminders.rebuild_interview_reminders': DEFAULT_QUEUE,  # Hourly full pass; needs more than 58s
+    'tasks.reminders.*': REMINDERS_QUEUE,
+}
+
+# (soft_time_limit, time_limit) in seconds for the tasks of each queue.
+# Under the prefork pool the soft limit raises SoftTimeLimitExceeded inside the task so its normal
+# retry/fail path runs, and the hard limit kills a stuck child process. Other pools do not give that:
+# gevent drops the soft limit and enforces the hard one as gevent.Timeout (a BaseException, which the
+# tasks' `except Exception` paths never see), and the threads pool enforces neither. So the CV stages
+# always run on prefork; the email worker may use gevent only because every SMTP call has its own
+# timeout (MAIL_TIMEOUT_SECONDS) well below these limits.
+QUEUE_TIME_LIMITS = {
+    DEFAULT_QUEUE: (300, 360),
+    CV_FETCH_QUEUE: (60, 90),
+    CV_PARSE_QUEUE: (150, 180),
+    CV_PERSIST_QUEUE: (60, 90),
+    EMAIL_QUEUE: (30, 45),
+    REMINDERS_QUEUE: (50, 58),  # Must finish before the next beat tick (every 60s)
+}
+
+
+class QueueTimeLimitAnnotation:
+    """
+    Celery task annotation that applies the time limits of the queue a task is routed to.
+    (A plain dict annotation only matches exact task names, not the globs used in TASK_QUEUE_ROUTES.)
+    """
+
+    def annotate(self, task):
+        queue_name = queue_for_task(task.name)
+        soft_limit, hard_limit = QUEUE_TIME_LIMITS.get(queue_name, QUEUE_TIME_LIMITS[DEFAULT_QUEUE])
+        return {'soft_time_limit': soft_limit, 'time_limit': hard_limit}
+
+
+def queue_for_task(task_name: str) -> str:
+    """Returns the queue a task name is routed to (DEFAULT_QUEUE if no route matches)."""
+    if task_name in TASK_QUEUE_ROUTES:
+        return TASK_QUEUE_ROUTES[task_name]
+    for task_pattern, queue_name in TASK_QUEUE_ROUTES.items():
+        if fnmatch(task_name, task_pattern):
+            return queue_name
+    return DEFAULT_QUEUE
+
+
+def get_queue_depth(celery_app, queue_name: str) -> int:
+    """Number of messages waiting in a broker queue (not yet reserved by a worker). 0 if it cannot be read."""
+    with celery_app.connection_or_acquire() as conn:
+        try:
+            return conn.default_channel.queue_declare(queue=queue_name, passive=True).message_count
+        except Exception:
+            return 0
+
+
+def build_celery_routing_config():
+    """Returns the queue/routing/time-limit part of the Celery configuration (merged in create_app)."""
+    task_queues = tuple(Queue(name, Exchange(name, type='direct'), routing_key=name) for name in ALL_QUEUES)
+    task_routes = {
+        task_pattern: {'queue': queue_name, 'routing_key': queue_name}
+        for task_pattern, queue_name in TASK_QUEUE_ROUTES.items()
+    }
+    return {
+        'task_queues': task_queues,
+        'task_default_queue': DEFAULT_QUEUE,
+        'task_default_exchange': DEFAULT_QUEUE,
+        'task_default_routing_key': DEFAULT_QUEUE,
+        'task_routes': task_routes,
+        'task_annotations': (QueueTimeLimitAnnotation(),),
+        # Long acks_late tasks: a child reserves only the message it is working on.
+        # Workers for short tasks (email) raise this with --prefetch-multiplier.
+        'worker_prefetch_multiplier': 1,
+    }
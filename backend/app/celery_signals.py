@@ -0,0 +1,204 @@
+# backend/app/celery_signals.py
+# Celery signal handlers (συνδέονται μία φορά από το create_app).
+# Τρέχουν έξω από Flask app context: τα queue metrics διαβάζουν από το celery.conf, τα lifecycle hooks
+# ανοίγουν context στο celery.flask_app (το μοναδικό app της διεργασίας).
+
+import logging
+import random
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from celery.signals import (before_task_publish, task_prerun, task_postrun, worker_init, worker_ready,
+                            worker_shutdown, worker_process_init, worker_process_shutdown)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app import celery, db
+from app.services import (queue_metrics_service, redis_service, s3_service, http_client_service, mail_service,
+                          task_metrics_service)
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED_AT_HEADER = 'nexona_published_at'
+
+
+@before_task_publish.connect(weak=False, dispatch_uid='nexona_stamp_published_at')
+def _stamp_published_at(headers=None, **kwargs):
+    """Adds the publish time to every task message, so the worker can measure queue wait time."""
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_prerun.connect(weak=False, dispatch_uid='nexona_record_queue_latency')
+def _record_queue_latency(task=None, **kwargs):
+    """Queue wait time of the task that is about to run (from its ETA/countdown if it had one)."""
+    if task is None:
+        return
+    request = task.request
+    published_at = getattr(request, PUBLISHED_AT_HEADER, None)
+    if published_at is None:
+        return
+    ready_at = float(published_at)
+    if request.eta:
+        try:
+            ready_at = max(ready_at, datetime.fromisoformat(str(request.eta)).timestamp())
+        except ValueError:
+            pass
+    queue_name = (request.delivery_info or {}).get('routing_key')
+    queue_metrics_service.record_queue_latency(task.app.conf.get('nexona_redis_url'), queue_name,
+                                               time.time() - ready_at)
+
+
+# --- Per-task resource accounting ---
+# RSS delta, wall time and DB time of every task run, plus a sampled tracemalloc peak. tracemalloc and the
+# RSS delta are process-wide, so they only describe one task when the process runs one task at a time
+# (prefork children, solo pool); under threads/gevent the RSS numbers include concurrent tasks and
+# tracemalloc is never sampled.
+
+_task_accounting = {}
+_db_time = threading.local()  # greenlet-local under gevent (threading is monkey-patched)
+_runs_tasks_serially = False
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _db_timer_start(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_db_time, 'active', False):
+        _db_time.started = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _db_timer_stop(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(_db_time, 'started', None)
+    if getattr(_db_time, 'active', False) and started is not None:
+        _db_time.seconds += time.perf_counter() - started
+        _db_time.queries += 1
+        _db_time.started = None
+
+
+@task_prerun.connect(weak=False, dispatch_uid='nexona_task_accounting_start')
+def _start_task_accounting(task_id=None, task=None, **kwargs):
+    if task is None:
+        return
+    settings = task.app.conf.get('nexona_task_metrics') or {}
+    if not settings.get('enabled', True):
+        return
+    sample_tracemalloc = (_runs_tasks_serially and not tracemalloc.is_tracing()
+                          and random.random() < settings.get('tracemalloc_sample_rate', 0))
+    if sample_tracemalloc:
+        tracemalloc.start()
+    _db_time.active, _db_time.seconds, _db_time.queries, _db_time.started = True, 0.0, 0, None
+    _task_accounting[task_id] = (time.perf_counter(), task_metrics_service.current_rss_kb(), sample_tracemalloc)
+
+
+@task_postrun.connect(weak=False, dispatch_uid='nexona_task_accounting_stop')
+def _stop_task_accounting(task_id=None, task=None, state=None, **kwargs):
+    accounting = _task_accounting.pop(task_id, None)
+    if accounting is None:
+        return
+    started, rss_before_kb, sampled_tracemalloc = accounting
+    wall_seconds = time.perf_counter() - started
+    tracemalloc_peak_kb = None
+    if sampled_tracemalloc:
+        tracemalloc_peak_kb = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    db_seconds, db_queries = getattr(_db_time, 'seconds', 0.0), getattr(_db_time, 'queries', 0)
+    _db_time.active = False
+    rss_after_kb = task_metrics_service.current_rss_kb()
+    rss_delta_kb = rss_after_kb - rss_before_kb if rss_before_kb is not None and rss_after_kb is not None else None
+
+    settings = task.app.conf.get('nexona_task_metrics') or {}
+    task_metrics_service.record_task_run(
+        task.app.conf.get('nexona_redis_url'), task.name, wall_seconds, db_seconds, db_queries,
+        rss_delta_kb, rss_after_kb, tracemalloc_peak_kb=tracemalloc_peak_kb,
+        failed=state == 'FAILURE', retention_hours=settings.get('retention_hours',
+                                                                task_metrics_service.DEFAULT_RETENTION_HOURS))
+
+
+# --- Worker lifecycle ---
+# Prefork: the parent builds the app once (celery_worker.py) and forks the pool. A child must not reuse
+# sockets it inherited (SQLAlchemy pool, S3/HTTP keep-alive connections), so each child drops them right
+# after fork and opens its own before its first task. Solo/threads/gevent pools run tasks in the main
+# process, so the same warm-up runs there once the worker is ready.
+
+def _dispose_engines(close=True):
+    # close=False after fork: forget the parent's connections without closing sockets the parent still uses.
+    for engine in db.engines.values():
+        engine.dispose(close=close)
+
+
+def _warm_up_clients():
+    """Opens one DB connection and builds the S3 client and HTTP session, so the first task does not pay for it."""
+    try:
+        with db.engine.connect():
+            pass
+    except Exception as db_err:
+        logger.warning(f"Worker warm-up: database not reachable yet ({db_err}); the pool will connect on first use.")
+    try:
+        s3_service.warm_s3_client()
+        http_client_service.get_http_session()
+    except Exception as client_err:
+        logger.warning(f"Worker warm-up: could not pre-build S3/HTTP clients: {client_err}")
+
+
+def _close_clients():
+    mail_service.reset_mail_pool()
+    http_client_service.reset_http_session()
+    s3_service.reset_s3_clients()
+    redis_service.reset_redis_clients()
+    _dispose_engines()
+
+
+def _is_prefork_pool(pool):
+    from celery.concurrency.prefork import TaskPool as PreforkTaskPool
+    return isinstance(pool, PreforkTaskPool)
+
+
+@worker_init.connect(weak=False, dispatch_uid='nexona_worker_init')
+def _on_worker_init(**kwargs):
+    """Main worker process, before the pool starts: nothing DB-side may be inherited by the children."""
+    with celery.flask_app.app_context():
+        _dispose_engines()
+
+
+@worker_process_init.connect(weak=False, dispatch_uid='nexona_worker_process_init')
+def _on_worker_process_init(**kwargs):
+    """Freshly forked pool child: drop inherited connections and clients, then warm up its own."""
+    global _runs_tasks_serially
+    _runs_tasks_serially = True  # a prefork child executes one task at a time
+    app = celery.flask_app
+    with app.app_context():
+        _dispose_engines(close=False)
+        s3_service.reset_s3_clients()
+        http_client_service.reset_http_session()
+        mail_service.reset_mail_pool()
+        _warm_up_clients()
+    logger.info(f"Worker child ready (app id {id(app)}): connections reset after fork and clients warmed up.")
+
+
+@worker_process_shutdown.connect(weak=False, dispatch_uid='nexona_worker_process_shutdown')
+def _on_worker_process_shutdown(**kwargs):
+    with celery.flask_app.app_context():
+        _close_clients()
+
+
+@worker_ready.connect(weak=False, dispatch_uid='nexona_worker_ready')
+def _on_worker_ready(sender=None, **kwargs):
+    """Solo/threads/gevent pools execute tasks in this process: warm up here (prefork children do it themselves)."""
+    global _runs_tasks_serially
+    if sender is None or _is_prefork_pool(getattr(sender, 'pool', None)):
+        return
+    from celery.concurrency.solo import TaskPool as SoloTaskPool
+    _runs_tasks_serially = isinstance(sender.pool, SoloTaskPool)
+    if sender.app.conf.get('worker_max_memory_per_child'):
+        logger.warning(f"worker_max_memory_per_child only recycles prefork children; this "
+                       f"{type(sender.pool).__module__.rsplit('.', 1)[-1]} worker is never recycled for memory.")
+    with celery.flask_app.app_context():
+        _warm_up_clients()
+
+
+@worker_shutdown.connect(weak=False, dispatch_uid='nexona_worker_shutdown')
+def _on_worker_shutdown(**kwargs):
+    with celery.flask_app.app_context():
+        _close_clients()
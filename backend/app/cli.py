@@ -0,0 +1,131 @@
+# backend/app/cli.py
+# Εντολές `flask ...` για λειτουργίες συντήρησης (εγγράφονται στο create_app).
+
+import json
+from datetime import datetime, timezone
+
+import click
+from dateutil import parser as dateutil_parser
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.services import dead_letter_service, reminder_schedule_service, task_metrics_service
+
+dead_letters_cli = AppGroup('dead-letters', help="Failed CV parses (parse_dead_letters): list and bulk replay.")
+
+
+def _dead_letter_filter_options(command):
+    options = [
+        click.option('--company-id', type=int, default=None, help="Only this company."),
+        click.option('--error-class', default=None, help="e.g. ConnectionError, TextkernelError, S3DownloadError."),
+        click.option('--stage', 'failed_stage', type=click.Choice(['fetch', 'parse', 'persist']), default=None),
+        click.option('--failed-after', default=None, help="ISO datetime, inclusive."),
+        click.option('--failed-before', default=None, help="ISO datetime, exclusive."),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def _build_filters(company_id, error_class, failed_stage, failed_after, failed_before, status='pending'):
+    return {
+        'company_id': company_id,
+        'error_class': error_class,
+        'failed_stage': failed_stage,
+        'status': status,
+        'failed_after': dateutil_parser.isoparse(failed_after) if failed_after else None,
+        'failed_before': dateutil_parser.isoparse(failed_before) if failed_before else None,
+    }
+
+
+@dead_letters_cli.command('list')
+@_dead_letter_filter_options
+@click.option('--status', type=click.Choice(['pending', 'replayed', 'discarded']), default='pending')
+@click.option('--limit', type=int, default=50, show_default=True)
+def list_dead_letters(company_id, error_class, failed_stage, failed_after, failed_before, status, limit):
+    """Shows the matching dead letters (oldest first) and a count per error class."""
+    query = dead_letter_service.build_dead_letter_query(
+        **_build_filters(company_id, error_class, failed_stage, failed_after, failed_before, status))
+    total = query.count()
+    by_error_class = {}
+    for dead_letter in query.limit(limit).all():
+        by_error_class[dead_letter.error_class] = by_error_class.get(dead_letter.error_class, 0) + 1
+        click.echo(f"#{dead_letter.id} company={dead_letter.company_id} stage={dead_letter.failed_stage} "
+                   f"error={dead_letter.error_class} attempts={dead_letter.attempts} "
+                   f"failed_at={dead_letter.failed_at.isoformat() if dead_letter.failed_at else '-'} s3={dead_letter.s3_key}")
+    click.echo(f"Total matching: {total} (shown: {min(total, limit)}, by error class: {json.dumps(by_error_class)})")
+
+
+@dead_letters_cli.command('replay')
+@_dead_letter_filter_options
+@click.option('--rate', 'rate_per_minute', type=int, default=None,
+              help="CVs re-enqueued per minute (default PARSE_REPLAY_RATE_PER_MINUTE).")
+@click.option('--limit', type=int, default=None, help="Replay at most this many.")
+@click.option('--dry-run', is_flag=True, help="Only report what would be replayed.")
+def replay_dead_letters(company_id, error_class, failed_stage, failed_after, failed_before, rate_per_minute, limit,
+                        dry_run):
+    """Re-enqueues all pending dead letters matching the filters, in rate-limited batches."""
+    summary = dead_letter_service.schedule_replay(
+        rate_per_minute=rate_per_minute, limit=limit, dry_run=dry_run,
+        **_build_filters(company_id, error_class, failed_stage, failed_after, failed_before))
+    prefix = "[DRY RUN] Would replay" if dry_run else "Scheduled replay of"
+    click.echo(f"{prefix} {summary['selected']} parse(s) in {summary['batches']} batch(es) of {summary['batch_size']} "
+               f"at {summary['rate_per_minute']}/min (~{summary['estimated_duration_seconds']}s).")
+
+
+@dead_letters_cli.command('backfill')
+@click.option('--company-id', type=int, default=None, help="Only this company.")
+def backfill_dead_letters(company_id):
+    """Creates dead letters for ParsingFailed candidates from before dead-letter tracking existed."""
+    created = dead_letter_service.backfill_from_failed_candidates(company_id=company_id)
+    click.echo(f"Created {created} dead letter(s) (error class LegacyParsingFailed).")
+
+
+task_metrics_cli = AppGroup('task-metrics', help="Per-task memory, wall time and DB time recorded by the workers.")
+
+
+def _kib(value):
+    return '-' if value is None else f"{value}KiB"
+
+
+@task_metrics_cli.command('top')
+@click.option('--hours', type=int, default=24, show_default=True, help="Look-back window.")
+@click.option('--limit', type=int, default=10, show_default=True)
+@click.option('--sort-by', type=click.Choice(task_metrics_service.SORT_FIELDS), default='max_rss_delta_kb', show_default=True)
+@click.option('--series', 'show_series', is_flag=True, help="Also print the hourly RSS delta of each task.")
+def top_task_metrics(hours, limit, sort_by, show_series):
+    """Shows the most memory-hungry task types (and suspected leaks) over the window."""
+    report = task_metrics_service.get_task_metrics_report(current_app.config.get('REDIS_URL'), hours=hours,
+                                                          limit=limit, sort_by=sort_by)
+    if not report['tasks']:
+        click.echo(f"No task metrics recorded in the last {hours}h.")
+        return
+    for row in report['tasks']:
+        leak = "  <-- suspected leak" if row['suspected_leak'] else ""
+        click.echo(f"{row['task']}: runs={row['runs']} failures={row['failures']} "
+                   f"rss_delta avg={_kib(row['avg_rss_delta_kb'])} max={_kib(row['max_rss_delta_kb'])} "
+                   f"peak_rss={_kib(row['max_rss_kb'])} tracemalloc_peak={_kib(row['max_tracemalloc_peak_kb'])} "
+                   f"wall avg={row['avg_wall_seconds']}s max={row['max_wall_seconds']}s "
+                   f"db avg={row['avg_db_seconds']}s ({row['avg_db_queries']} queries){leak}")
+        if show_series:
+            for point in report['series'].get(row['task'], []):
+                hour = datetime.fromtimestamp(point['hour'], tz=timezone.utc).strftime('%Y-%m-%d %H:00')
+                click.echo(f"    {hour} runs={point['runs']} avg_rss_delta={_kib(point['avg_rss_delta_kb'])} "
+                           f"max_rss_delta={_kib(point['max_rss_delta_kb'])}")
+
+
+reminders_cli = AppGroup('reminders', help="Precomputed interview reminders (interview_reminders).")
+
+
+@reminders_cli.command('rebuild')
+def rebuild_reminders():
+    """Re-computes the reminders of every upcoming interview (run once after the migration)."""
+    totals = reminder_schedule_service.rebuild_all_reminders()
+    click.echo(f"{totals['candidates']} candidate(s) checked: {totals['created']} reminder(s) created, "
+               f"{totals['updated']} updated, {totals['deleted']} deleted.")
+
+
+def register_cli(app):
+    app.cli.add_command(dead_letters_cli)
+    app.cli.add_command(task_metrics_cli)
+    app.cli.add_command(reminders_cli)
@@ -35,8 +35,20 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
                               'sqlite:///' + os.path.join(basedir, 'fallback_app.db')  # Fallback in backend/
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_pre_ping': True,
+        'pool_recycle': 1800,
+    }
+    # Sessions are scoped per task/request app context; the pool only has to cover the tasks that are
+    # inside a DB block at the same time, not the whole worker concurrency. Added to the engine options
+    # by create_app for pooled backends only (SQLite's StaticPool/SingletonThreadPool reject them).
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 5)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 10)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 30)
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL') or 'redis://redis:6379/0'
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND') or 'redis://redis:6379/0'
+    # Redis used directly by app services (pipeline scratch space etc.). Defaults to the broker.
+    REDIS_URL = os.environ.get('REDIS_URL') or CELERY_BROKER_URL
     AWS_ACCESS_KEY_ID = os.environ.get('AWS_ACCESS_KEY_ID')
     AWS_SECRET_ACCESS_KEY = os.environ.get('AWS_SECRET_ACCESS_KEY')
     S3_BUCKET = os.environ.get('S3_BUCKET')
@@ -70,6 +82,91 @@ class Config:
     CELERY_TASK_ALWAYS_EAGER = _is_truthy(os.environ.get('CELERY_TASK_ALWAYS_EAGER', 'False'))
     CELERY_TASK_EAGER_PROPAGATES = _is_truthy(
         os.environ.get('CELERY_TASK_EAGER_PROPAGATES', str(CELERY_TASK_ALWAYS_EAGER)))
+    CELERY_RESULT_EXPIRES = int(os.environ.get('CELERY_RESULT_EXPIRES') or 3600)  # Seconds
+    CELERY_BROKER_POOL_LIMIT = int(os.environ.get('CELERY_BROKER_POOL_LIMIT') or 10)  # Pooled producer connections
+    # Task messages whose publish after a commit failed are kept in task_publish_outbox and republished this often
+    TASK_PUBLISH_RELAY_INTERVAL_SECONDS = float(os.environ.get('TASK_PUBLISH_RELAY_INTERVAL_SECONDS') or 30)
+
+    # Queue-depth autoscaler (app/celery_autoscaler.py), used by workers started with --autoscale=MAX,MIN
+    AUTOSCALE_SAMPLE_INTERVAL = float(os.environ.get('AUTOSCALE_SAMPLE_INTERVAL') or 5)
+    AUTOSCALE_BACKLOG_PER_PROCESS = int(os.environ.get('AUTOSCALE_BACKLOG_PER_PROCESS') or 2)
+    AUTOSCALE_TARGET_LATENCY_SECONDS = float(os.environ.get('AUTOSCALE_TARGET_LATENCY_SECONDS') or 10)
+    AUTOSCALE_SCALE_UP_STEP = int(os.environ.get('AUTOSCALE_SCALE_UP_STEP') or 4)
+    AUTOSCALE_SCALE_DOWN_STEP = int(os.environ.get('AUTOSCALE_SCALE_DOWN_STEP') or 2)
+    AUTOSCALE_SCALE_UP_COOLDOWN = float(os.environ.get('AUTOSCALE_SCALE_UP_COOLDOWN') or 10)
+    AUTOSCALE_SCALE_DOWN_COOLDOWN = float(os.environ.get('AUTOSCALE_SCALE_DOWN_COOLDOWN') or 120)
+
+    # Highly available beat (app/celery_beat.py): leader lock TTL and standby retry interval
+    BEAT_LEADER_TTL_SECONDS = float(os.environ.get('BEAT_LEADER_TTL_SECONDS') or 30)
+    BEAT_STANDBY_INTERVAL_SECONDS = float(os.environ.get('BEAT_STANDBY_INTERVAL_SECONDS') or 5)
+
+    # Per-task resource accounting (app/celery_signals.py) and worker recycling
+    TASK_METRICS_ENABLED = _is_truthy(os.environ.get('TASK_METRICS_ENABLED', 'True'))
+    TASK_TRACEMALLOC_SAMPLE_RATE = float(os.environ.get('TASK_TRACEMALLOC_SAMPLE_RATE') or 0.02)
+    TASK_METRICS_RETENTION_HOURS = int(os.environ.get('TASK_METRICS_RETENTION_HOURS') or 168)
+    # A prefork child whose RSS exceeds this (KiB) is replaced after its current task; 0 disables it.
+    # Prefork only: a gevent/threads worker is never recycled. The tasks that grow the most (get_file_bytes
+    # in cv_fetch, the base64 encoding in cv_parse) therefore run on prefork workers (docker-compose.yml).
+    CELERY_WORKER_MAX_MEMORY_PER_CHILD_KB = int(os.environ.get('CELERY_WORKER_MAX_MEMORY_PER_CHILD_KB') or 524288)
+
+    # Outbound connection pools (shared per worker process; size them >= worker concurrency)
+    HTTP_POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE') or 32)
+    S3_MAX_POOL_CONNECTIONS = int(os.environ.get('S3_MAX_POOL_CONNECTIONS') or 32)
+    # Open SMTP connections kept per worker process (app/services/mail_service.py); an idle one is
+    # checked with NOOP before reuse once it has been idle for MAIL_POOL_IDLE_SECONDS.
+    MAIL_POOL_SIZE = int(os.environ.get('MAIL_POOL_SIZE') or 4)
+    MAIL_POOL_IDLE_SECONDS = int(os.environ.get('MAIL_POOL_IDLE_SECONDS') or 30)
+    MAIL_TIMEOUT_SECONDS = int(os.environ.get('MAIL_TIMEOUT_SECONDS') or 10)  # Per SMTP call, below the email queue limits
+    EMAIL_TEMPLATE_CACHE_SIZE = int(os.environ.get('EMAIL_TEMPLATE_CACHE_SIZE') or 512)  # Compiled templates per process
+    # Transactional email outbox (app/services/email_outbox_service.py): rows claimed per batch and sent (and
+    # committed) per chunk, how long a claimed row stays leased to its dispatcher (must exceed the email queue's
+    # hard time limit), send attempts before a transiently failing email is given up, the periodic dispatcher
+    # run (it is also kicked after every commit that enqueues an email) and how long finished rows are kept
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE') or 100)
+    OUTBOX_SEND_CHUNK_SIZE = int(os.environ.get('OUTBOX_SEND_CHUNK_SIZE') or 10)
+    OUTBOX_SENDING_LEASE_SECONDS = int(os.environ.get('OUTBOX_SENDING_LEASE_SECONDS') or 120)
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS') or 8)
+    OUTBOX_DISPATCH_INTERVAL_SECONDS = float(os.environ.get('OUTBOX_DISPATCH_INTERVAL_SECONDS') or 10)
+    OUTBOX_RETENTION_DAYS = int(os.environ.get('OUTBOX_RETENTION_DAYS') or 14)
+    # Per-user unread notification count cached in Redis (app/services/notification_service.py); the key is
+    # dropped on every change, the TTL only bounds how long a missed invalidation can show a wrong count
+    NOTIFICATION_UNREAD_CACHE_SECONDS = int(os.environ.get('NOTIFICATION_UNREAD_CACHE_SECONDS') or 300)
+
+    # CV processing pipeline (fetch -> parse -> persist)
+    CV_PIPELINE_BLOB_TTL_SECONDS = int(os.environ.get('CV_PIPELINE_BLOB_TTL_SECONDS') or 3600)
+    # Per-company fair-share dispatch into the pipeline (app/services/parse_dispatch_service.py)
+    PARSE_FAIR_SHARE_ENABLED = _is_truthy(os.environ.get('PARSE_FAIR_SHARE_ENABLED', 'True'))
+    PARSE_DISPATCH_MAX_IN_FLIGHT = int(os.environ.get('PARSE_DISPATCH_MAX_IN_FLIGHT') or 16)  # Broker backlog cap
+    PARSE_DISPATCH_INTERVAL_SECONDS = float(os.environ.get('PARSE_DISPATCH_INTERVAL_SECONDS') or 5)
+    # Minimum share of dispatches given to bulk/import CVs while interactive uploads are waiting (0..1)
+    PARSE_LOW_PRIORITY_MIN_SHARE = float(os.environ.get('PARSE_LOW_PRIORITY_MIN_SHARE') or 0.2)
+    BULK_UPLOAD_MAX_FILES = int(os.environ.get('BULK_UPLOAD_MAX_FILES') or 200)
+    # Upload admission control (app/services/upload_admission_service.py)
+    PARSE_ADMISSION_ENABLED = _is_truthy(os.environ.get('PARSE_ADMISSION_ENABLED', 'True'))
+    PARSE_ADMISSION_MODE = os.environ.get('PARSE_ADMISSION_MODE') or 'defer'  # 'defer' (202 + ETA) or 'reject' (503)
+    PARSE_ADMISSION_MAX_COMPANY_BACKLOG = int(os.environ.get('PARSE_ADMISSION_MAX_COMPANY_BACKLOG') or 1000)  # per company, overridable in CompanySettings
+    PARSE_ADMISSION_DEFER_DRAIN_SECONDS = int(os.environ.get('PARSE_ADMISSION_DEFER_DRAIN_SECONDS') or 900)
+    PARSE_ADMISSION_REJECT_DRAIN_SECONDS = int(os.environ.get('PARSE_ADMISSION_REJECT_DRAIN_SECONDS') or 3600)
+    PARSE_ADMISSION_MIN_RATE_PER_MINUTE = float(os.environ.get('PARSE_ADMISSION_MIN_RATE_PER_MINUTE') or 10)  # Floor for the measured drain rate
+    PARSE_ADMISSION_CACHE_SECONDS = float(os.environ.get('PARSE_ADMISSION_CACHE_SECONDS') or 5)
+    # Bulk replay of dead-lettered parses: CVs re-enqueued per minute, and per replay task
+    PARSE_REPLAY_RATE_PER_MINUTE = int(os.environ.get('PARSE_REPLAY_RATE_PER_MINUTE') or 300)
+    PARSE_REPLAY_BATCH_SIZE = int(os.environ.get('PARSE_REPLAY_BATCH_SIZE') or 50)
+
+    # Interview reminders (app/services/reminder_schedule_service.py): rows claimed per batch by the
+    # every-minute tick, and how often the whole interview_reminders table is reconciled
+    REMINDER_CLAIM_BATCH_SIZE = int(os.environ.get('REMINDER_CLAIM_BATCH_SIZE') or 200)
+    # Interviews without assigned interviewers remind every reminder-enabled user of the company (the old
+    # behaviour); off = only assigned interviewers are ever reminded
+    REMINDER_UNASSIGNED_TO_COMPANY_USERS = _is_truthy(os.environ.get('REMINDER_UNASSIGNED_TO_COMPANY_USERS', 'True'))
+    # Reminders due within the horizon get an ETA send task; keep it well under the broker's visibility
+    # timeout (Redis: 1h), and the arm interval well under the horizon.
+    REMINDER_ETA_HORIZON_SECONDS = int(os.environ.get('REMINDER_ETA_HORIZON_SECONDS') or 900)
+    REMINDER_ARM_INTERVAL_SECONDS = int(os.environ.get('REMINDER_ARM_INTERVAL_SECONDS') or 300)
+    # A reminder still pending this long after due_at is sent by the every-minute catch-up instead
+    REMINDER_CATCHUP_GRACE_SECONDS = int(os.environ.get('REMINDER_CATCHUP_GRACE_SECONDS') or 120)
+    REMINDER_REBUILD_INTERVAL_SECONDS = int(os.environ.get('REMINDER_REBUILD_INTERVAL_SECONDS') or 3600)
+    BULK_SCHEDULE_MAX_CANDIDATES = int(os.environ.get('BULK_SCHEDULE_MAX_CANDIDATES') or 200)  # Per bulk scheduling request
 
     # Superadmin and Default Company Settings from Environment for seeding
     SUPERADMIN_EMAIL = os.environ.get('SUPERADMIN_EMAIL')
@@ -51,6 +51,13 @@ class CompanySettings(db.Model):
     interview_invitation_email_template = db.Column(db.Text, nullable=True)
     default_interview_reminder_timing_minutes = db.Column(db.Integer, default=1440, nullable=True)
     enable_reminders_feature_for_company = db.Column(db.Boolean, default=True, nullable=True)
+    # Share of CV parsing capacity under contention (fair-share dispatcher): weight 2 gets twice the CVs of weight 1.
+    parse_queue_weight = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    # Max CVs waiting to be parsed before uploads get 429 (None = PARSE_ADMISSION_MAX_COMPANY_BACKLOG).
+    parse_admission_max_backlog = db.Column(db.Integer, nullable=True)
+    # Bumped whenever one of the email templates above changes; workers cache compiled templates per version
+    # (app/services/email_template_service.py).
+    email_templates_version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     # Αν θέλεις created_at/updated_at εδώ, πρόσθεσέ τα και κάνε νέο migration
     # created_at = db.Column(db.DateTime, default=lambda: datetime.now(dt_timezone.utc))
@@ -63,7 +70,10 @@ class CompanySettings(db.Model):
             'rejection_email_template': self.rejection_email_template,
             'interview_invitation_email_template': self.interview_invitation_email_template,
             'default_interview_reminder_timing_minutes': self.default_interview_reminder_timing_minutes,
-            'enable_reminders_feature_for_company': self.enable_reminders_feature_for_company
+            'enable_reminders_feature_for_company': self.enable_reminders_feature_for_company,
+            'parse_queue_weight': self.parse_queue_weight,
+            'parse_admission_max_backlog': self.parse_admission_max_backlog,
+            'email_templates_version': self.email_templates_version
         }
         # if hasattr(self, 'created_at') and self.created_at:
         #     data['created_at'] = self.created_at.isoformat()
@@ -86,6 +96,10 @@ class User(UserMixin, db.Model):
                            onupdate=lambda: datetime.now(dt_timezone.utc), nullable=True)
     enable_email_interview_reminders = db.Column(db.Boolean, default=True, nullable=True)
     interview_reminder_lead_time_minutes = db.Column(db.Integer, default=60, nullable=True)
+    # Digest mode: one email listing every interview whose reminder falls within the next
+    # interview_reminder_digest_window_minutes, instead of one email per interview.
+    interview_reminder_digest = db.Column(db.Boolean, default=False, nullable=False, server_default=db.false())
+    interview_reminder_digest_window_minutes = db.Column(db.Integer, default=720, nullable=False, server_default='720')
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -105,6 +119,8 @@ class User(UserMixin, db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'enable_email_interview_reminders': self.enable_email_interview_reminders,
             'interview_reminder_lead_time_minutes': self.interview_reminder_lead_time_minutes,
+            'interview_reminder_digest': self.interview_reminder_digest,
+            'interview_reminder_digest_window_minutes': self.interview_reminder_digest_window_minutes,
         }
         if include_company_info and self.company:
             data['company_name'] = self.company.name
@@ -136,7 +152,7 @@ class Candidate(db.Model):
     interview_datetime = db.Column(db.DateTime(timezone=True), nullable=True)
     interview_location = db.Column(db.String(255), nullable=True)
     interview_type = db.Column(db.String(100), nullable=True)
-    interviewers = db.Column(JSONB, nullable=True, default=list)
+    interviewers = db.Column(JSONB, nullable=True, default=list)  # List of user ids, e.g. [3, 7]
     offers = db.Column(JSONB, nullable=True, default=list)
     evaluation_rating = db.Column(db.String(50), nullable=True)
     notes = db.Column(db.Text, nullable=True)
@@ -148,8 +164,19 @@ class Candidate(db.Model):
                                 lazy='dynamic')
     __table_args__ = (
         UniqueConstraint('email', 'company_id', name='uq_candidates_email_company_id'),
+        # Serves the containment filter `interviewers @> '[<user_id>]'` (has_interviewer below).
+        db.Index('ix_candidates_interviewers_gin', 'interviewers', postgresql_using='gin',
+                 postgresql_ops={'interviewers': 'jsonb_path_ops'}),
     )
 
+    @staticmethod
+    def has_interviewer(user_id: int):
+        """Filter: candidates whose interviewers list contains this user id (uses the jsonb_path_ops GIN index)."""
+        return Candidate.interviewers.contains([user_id])
+
+    def get_interviewer_ids(self) -> set:
+        return {interviewer for interviewer in (self.interviewers or []) if isinstance(interviewer, int)}
+
     def get_full_name(self):
         parts = [self.first_name, self.last_name]
         return " ".join(filter(None, parts)) or "N/A"
@@ -249,4 +276,273 @@ class Position(db.Model):
         }
 
 
-print("Models.py loaded (User.confirmed_on removed, Candidate.add_history_event updated).")
\ No newline at end of file
+class CvParseJob(db.Model):
+    """
+    Idempotency record for one CV pipeline run, keyed by (placeholder_candidate_id, s3_key).
+    A redelivered stage resumes from the last completed state instead of re-parsing or re-merging.
+    """
+    __tablename__ = 'cv_parse_jobs'
+    STATE_STARTED = 'started'
+    STATE_PARSED = 'parsed'
+    STATE_PERSISTED = 'persisted'
+    STATE_FAILED = 'failed'
+
+    id = db.Column(db.Integer, primary_key=True)
+    # No FK: the placeholder candidate is deleted when it is merged into an existing candidate.
+    placeholder_candidate_id = db.Column(UUID(as_uuid=True), nullable=False)
+    s3_key = db.Column(db.String(512), nullable=False)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id', ondelete='CASCADE'), nullable=False, index=True)
+    state = db.Column(db.String(20), nullable=False, default=STATE_STARTED, index=True)
+    parsed_data = db.Column(JSONB, nullable=True)
+    result_candidate_id = db.Column(UUID(as_uuid=True), nullable=True, index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(dt_timezone.utc))
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(dt_timezone.utc),
+                           onupdate=lambda: datetime.now(dt_timezone.utc))
+    __table_args__ = (
+        UniqueConstraint('placeholder_candidate_id', 's3_key', name='uq_cv_parse_jobs_placeholder_s3_key'),
+    )
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'placeholder_candidate_id': str(self.placeholder_candidate_id),
+            's3_key': self.s3_key,
+            'company_id': self.company_id,
+            'state': self.state,
+            'result_candidate_id': str(self.result_candidate_id) if self.result_candidate_id else None,
+            'attempts': self.attempts,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+
+class ParseDeadLetter(db.Model):
+    """
+    Dead-letter record for a CV pipeline run that ended in ParsingFailed (one row per parse job).
+    Keeps what is needed to filter failures and replay them in bulk after e.g. a parser outage.
+    """
+    __tablename__ = 'parse_dead_letters'
+    STATUS_PENDING = 'pending'      # Failed, waiting for a replay
+    STATUS_REPLAYED = 'replayed'    # Re-enqueued; a new failure sets it back to pending
+    STATUS_DISCARDED = 'discarded'  # Cannot be replayed (placeholder deleted or merged meanwhile)
+
+    id = db.Column(db.Integer, primary_key=True)
+    parse_job_id = db.Column(db.Integer, db.ForeignKey('cv_parse_jobs.id', ondelete='CASCADE'), nullable=False,
+                             unique=True)
+    placeholder_candidate_id = db.Column(UUID(as_uuid=True), nullable=False)
+    s3_key = db.Column(db.String(512), nullable=False)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id', ondelete='CASCADE'), nullable=False, index=True)
+    failed_stage = db.Column(db.String(20), nullable=True)
+    error_class = db.Column(db.String(100), nullable=False, index=True)
+    error_message = db.Column(db.Text, nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING, index=True)
+    replay_count = db.Column(db.Integer, nullable=False, default=0)
+    failed_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(dt_timezone.utc), index=True)
+    replayed_at = db.Column(db.DateTime(timezone=True), nullable=True)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'parse_job_id': self.parse_job_id,
+            'placeholder_candidate_id': str(self.placeholder_candidate_id),
+            's3_key': self.s3_key,
+            'company_id': self.company_id,
+            'failed_stage': self.failed_stage,
+            'error_class': self.error_class,
+            'error_message': self.error_message,
+            'attempts': self.attempts,
+            'status': self.status,
+            'replay_count': self.replay_count,
+            'failed_at': self.failed_at.isoformat() if self.failed_at else None,
+            'replayed_at': self.replayed_at.isoformat() if self.replayed_at else None,
+        }
+
+
+class InterviewReminder(db.Model):
+    """
+    Precomputed interview reminder: one row per (candidate, recipient user), due at the interview time minus
+    the user's lead time. Kept in sync by reminder_schedule_service whenever an interview, a user's reminder
+    settings or a company's reminder flag change; the beat tick only claims the rows that are due.
+    """
+    __tablename__ = 'interview_reminders'
+    STATUS_PENDING = 'pending'      # Waiting for due_at
+    STATUS_SENT = 'sent'            # Claimed and handed to the email task
+    STATUS_EXPIRED = 'expired'      # Claimed only after the interview had already started
+    STATUS_CANCELLED = 'cancelled'  # Claimed, but the interview had changed in a way the sync missed
+
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'),
+                             nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    interview_datetime = db.Column(db.DateTime(timezone=True), nullable=False)  # The interview this reminder is for
+    due_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    lead_time_minutes = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING)
+    # Bumped whenever due_at or the interview changes; an ETA send task carries the version it was queued for
+    # and does nothing if the row has moved on since (stale tasks are invalidated, not revoked).
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    armed_version = db.Column(db.Integer, nullable=True)  # Version an ETA send task is queued for, if any
+    candidate = db.relationship('Candidate', lazy='select')
+    sent_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(dt_timezone.utc))
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(dt_timezone.utc),
+                           onupdate=lambda: datetime.now(dt_timezone.utc))
+    __table_args__ = (
+        UniqueConstraint('candidate_id', 'user_id', name='uq_interview_reminders_candidate_user'),
+        # The claim query walks only the pending rows, in due_at order.
+        db.Index('ix_interview_reminders_pending_due_at', 'due_at', postgresql_where=db.text("status = 'pending'")),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'candidate_id': str(self.candidate_id),
+            'user_id': self.user_id,
+            'interview_datetime': self.interview_datetime.isoformat() if self.interview_datetime else None,
+            'due_at': self.due_at.isoformat() if self.due_at else None,
+            'lead_time_minutes': self.lead_time_minutes,
+            'status': self.status,
+            'version': self.version,
+            'armed': self.armed_version is not None and self.armed_version == self.version,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+        }
+
+
+class SentReminder(db.Model):
+    """
+    Ledger of the reminders actually dispatched: at most one row per (candidate, interview time, user, kind).
+    Inserted in the same transaction that dispatches the email, so two senders racing for the same reminder
+    (ETA task, catch-up claim, a redelivered message, a reschedule back to an earlier time) send it once.
+    """
+    __tablename__ = 'sent_reminders'
+    KIND_INTERVIEW_REMINDER = 'interview_reminder'
+
+    id = db.Column(db.Integer, primary_key=True)
+    candidate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'),
+                             nullable=False)
+    interview_datetime = db.Column(db.DateTime(timezone=True), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    kind = db.Column(db.String(30), nullable=False, default=KIND_INTERVIEW_REMINDER)
+    reminder_id = db.Column(db.Integer, db.ForeignKey('interview_reminders.id', ondelete='SET NULL'), nullable=True)
+    sent_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(dt_timezone.utc))
+    __table_args__ = (
+        UniqueConstraint('candidate_id', 'interview_datetime', 'user_id', 'kind',
+                         name='uq_sent_reminders_candidate_interview_user_kind'),
+    )
+
+
+class OutboxEmail(db.Model):
+    """
+    Transactional email outbox: the row is written in the same transaction as the state change that triggers
+    the email (rejection, interview invitation), so a committed change always gets its email and a rolled-back
+    one never does. The dispatcher (app/services/email_outbox_service.py) claims pending rows in batches,
+    renders them and sends them over a pooled SMTP connection.
+    """
+    __tablename__ = 'outbox'
+    STATUS_PENDING = 'pending'  # Waiting for next_attempt_at (new, or a transient failure backing off)
+    STATUS_SENDING = 'sending'  # Claimed by a dispatcher until next_attempt_at (its lease), then claimable again
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'    # Permanent SMTP failure, or still failing after OUTBOX_MAX_ATTEMPTS
+    STATUS_SKIPPED = 'skipped'  # No longer applies at send time (candidate gone, no address, superseded)
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(40), nullable=False)  # email_template_service.KIND_*
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id', ondelete='CASCADE'), nullable=True)
+    candidate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'),
+                             nullable=True)
+    payload = db.Column(JSONB, nullable=True)  # State the email was enqueued for (e.g. the confirmation_uuid)
+    status = db.Column(db.String(20), nullable=False, default=STATUS_PENDING)
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    next_attempt_at = db.Column(db.DateTime(timezone=True), nullable=False,
+                                default=lambda: datetime.now(dt_timezone.utc))
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(dt_timezone.utc),
+                           index=True)
+    sent_at = db.Column(db.DateTime(timezone=True), nullable=True, index=True)
+    __table_args__ = (
+        # The dispatcher walks only the claimable rows, in next_attempt_at order.
+        db.Index('ix_outbox_claimable_next_attempt_at', 'next_attempt_at',
+                 postgresql_where=db.text("status IN ('pending', 'sending')")),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'company_id': self.company_id,
+            'candidate_id': str(self.candidate_id) if self.candidate_id else None,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+        }
+
+
+class Notification(db.Model):
+    """
+    In-app notification of one user. Written in bulk by notification_service (one multi-row INSERT per fan-out);
+    the unread count per user is cached in Redis so the frontend polls a single value instead of this table.
+    """
+    __tablename__ = 'notifications'
+    KIND_INTERVIEW_CONFIRMED = 'interview_confirmed'
+    KIND_INTERVIEW_DECLINED = 'interview_declined'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    company_id = db.Column(db.Integer, db.ForeignKey('companies.id', ondelete='CASCADE'), nullable=True)
+    kind = db.Column(db.String(50), nullable=False)
+    candidate_id = db.Column(UUID(as_uuid=True), db.ForeignKey('candidates.candidate_id', ondelete='CASCADE'),
+                             nullable=True, index=True)
+    title = db.Column(db.String(255), nullable=False)
+    body = db.Column(db.Text, nullable=True)
+    data = db.Column(JSONB, nullable=True)
+    is_read = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(dt_timezone.utc))
+    read_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    __table_args__ = (
+        # A user's list, newest first (keyset pagination on id).
+        db.Index('ix_notifications_user_id_id', 'user_id', 'id'),
+        # Recomputing a user's unread count (cache miss) reads only the unread rows.
+        db.Index('ix_notifications_unread_user_id', 'user_id', postgresql_where=db.text('NOT is_read')),
+    )
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'candidate_id': str(self.candidate_id) if self.candidate_id else None,
+            'title': self.title,
+            'body': self.body,
+            'data': self.data or {},
+            'is_read': self.is_read,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'read_at': self.read_at.isoformat() if self.read_at else None,
+        }
+
+
+class PendingTaskPublish(db.Model):
+    """
+    A Celery task message whose publish after a DB commit failed (broker unreachable). Written outside the
+    committed transaction by task_publish_service and republished by its relay with backoff until it succeeds.
+    """
+    __tablename__ = 'task_publish_outbox'
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_name = db.Column(db.String(255), nullable=False)
+    args = db.Column(JSONB, nullable=False)
+    kwargs = db.Column(JSONB, nullable=False)
+    options = db.Column(JSONB, nullable=False)  # send_task options; relative times already made absolute
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    next_attempt_at = db.Column(db.DateTime(timezone=True), nullable=False,
+                                default=lambda: datetime.now(dt_timezone.utc), index=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), nullable=False, default=lambda: datetime.now(dt_timezone.utc))
+
+
+print("Models.py loaded (User.confirmed_on removed, Candidate.add_history_event updated).")
@@ -0,0 +1,41 @@
+# backend/app/services/cv_pipeline_service.py
+
+import logging
+
+from celery import chain
+
+from app import celery
+
+logger = logging.getLogger(__name__)
+
+# Stage task names. Each stage is routed to its own queue (see task_routes in app/__init__.py)
+# so the S3/Textkernel bound stages and the DB bound stage can be scaled independently.
+FETCH_STAGE_TASK = 'tasks.parsing.fetch_cv_stage'
+PARSE_STAGE_TASK = 'tasks.parsing.parse_cv_stage'
+PERSIST_STAGE_TASK = 'tasks.parsing.persist_cv_stage'
+
+
+def build_cv_pipeline(placeholder_candidate_id: str, s3_file_key: str, company_id: int, priority: int = None):
+    """
+    Builds the fetch -> parse -> persist chain for one uploaded CV.
+    Each stage receives the (compact) descriptor returned by the previous one.
+    priority (broker message priority, 0 = highest) is set on every stage, so an interactive upload
+    stays ahead of bulk imports in each queue of the pipeline.
+    """
+    # ignore_result: published by name from the web tier, which would otherwise subscribe to the result backend.
+    stage_options = {'ignore_result': True}
+    if priority is not None:
+        stage_options['priority'] = priority
+    return chain(
+        celery.signature(FETCH_STAGE_TASK, args=[str(placeholder_candidate_id), s3_file_key, company_id],
+                         **stage_options),
+        celery.signature(PARSE_STAGE_TASK, **stage_options),
+        celery.signature(PERSIST_STAGE_TASK, **stage_options),
+    )
+
+
+def enqueue_cv_parse(placeholder_candidate_id: str, s3_file_key: str, company_id: int, priority: int = None):
+    """Publishes the CV processing pipeline for a placeholder candidate."""
+    result = build_cv_pipeline(placeholder_candidate_id, s3_file_key, company_id, priority=priority).apply_async()
+    logger.info(f"CV pipeline queued for placeholder {placeholder_candidate_id} (S3: {s3_file_key}, priority: {priority}).")
+    return result
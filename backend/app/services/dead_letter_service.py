@@ -0,0 +1,166 @@
+# backend/app/services/dead_letter_service.py
+
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+from flask import current_app
+
+from app import db
+from app.models import Candidate, CvParseJob, ParseDeadLetter
+from . import parse_dispatch_service, task_publish_service
+
+logger = logging.getLogger(__name__)
+
+REPLAY_BATCH_TASK = 'tasks.parsing.replay_dead_letters_batch'
+MAX_REPLAY_SELECTION = 50000
+
+
+def record_parse_failure(job: CvParseJob, stage: str, error_class: str, error_message: str):
+    """
+    Adds (or refreshes) the dead-letter row of a failed parse job. Runs inside the caller's
+    transaction; the caller commits together with the ParsingFailed status.
+    """
+    dead_letter = ParseDeadLetter.query.filter_by(parse_job_id=job.id).first()
+    if dead_letter is None:
+        dead_letter = ParseDeadLetter(parse_job_id=job.id, replay_count=0)
+        db.session.add(dead_letter)
+    dead_letter.placeholder_candidate_id = job.placeholder_candidate_id
+    dead_letter.s3_key = job.s3_key
+    dead_letter.company_id = job.company_id
+    dead_letter.failed_stage = stage
+    dead_letter.error_class = (error_class or 'UnknownError')[:100]
+    dead_letter.error_message = (error_message or '')[:2000]
+    dead_letter.attempts = job.attempts or 0
+    dead_letter.status = ParseDeadLetter.STATUS_PENDING
+    dead_letter.failed_at = datetime.now(dt_timezone.utc)
+    return dead_letter
+
+
+def build_dead_letter_query(company_id=None, error_class=None, failed_stage=None, status=ParseDeadLetter.STATUS_PENDING,
+                            failed_after=None, failed_before=None):
+    """Filtered query over parse_dead_letters, oldest failure first."""
+    query = ParseDeadLetter.query
+    if company_id:
+        query = query.filter(ParseDeadLetter.company_id == company_id)
+    if error_class:
+        query = query.filter(ParseDeadLetter.error_class == error_class)
+    if failed_stage:
+        query = query.filter(ParseDeadLetter.failed_stage == failed_stage)
+    if status:
+        query = query.filter(ParseDeadLetter.status == status)
+    if failed_after:
+        query = query.filter(ParseDeadLetter.failed_at >= failed_after)
+    if failed_before:
+        query = query.filter(ParseDeadLetter.failed_at < failed_before)
+    return query.order_by(ParseDeadLetter.failed_at.asc(), ParseDeadLetter.id.asc())
+
+
+def schedule_replay(rate_per_minute: int = None, limit: int = None, dry_run: bool = False, **filters) -> dict:
+    """
+    Selects pending dead letters matching the filters and schedules their replay in batches spaced out
+    so that at most rate_per_minute CVs re-enter the parse queue per minute.
+
+    :return: summary with the number selected, batches and the time until the last batch runs.
+    """
+    rate_per_minute = rate_per_minute or current_app.config.get('PARSE_REPLAY_RATE_PER_MINUTE', 300)
+    batch_size = current_app.config.get('PARSE_REPLAY_BATCH_SIZE', 50)
+    limit = min(limit or MAX_REPLAY_SELECTION, MAX_REPLAY_SELECTION)
+    if rate_per_minute <= 0:
+        raise ValueError("rate_per_minute must be positive.")
+
+    dead_letter_ids = [row.id for row in build_dead_letter_query(**filters).with_entities(ParseDeadLetter.id).limit(limit)]
+    batch_size = max(1, min(batch_size, rate_per_minute))
+    seconds_per_batch = 60.0 * batch_size / rate_per_minute
+    batches = [dead_letter_ids[i:i + batch_size] for i in range(0, len(dead_letter_ids), batch_size)]
+
+    if not dry_run:
+        task_publish_service.publish_tasks(
+            task_publish_service.task_message(REPLAY_BATCH_TASK, args=[batch_ids],
+                                              countdown=round(batch_index * seconds_per_batch, 1))
+            for batch_index, batch_ids in enumerate(batches))
+        logger.info(f"Scheduled replay of {len(dead_letter_ids)} dead-lettered parse(s) in {len(batches)} batch(es) "
+                    f"at {rate_per_minute}/min (filters: {filters}).")
+
+    return {
+        'selected': len(dead_letter_ids),
+        'batches': len(batches),
+        'batch_size': batch_size,
+        'rate_per_minute': rate_per_minute,
+        'estimated_duration_seconds': round(max(len(batches) - 1, 0) * seconds_per_batch, 1),
+        'dry_run': dry_run,
+    }
+
+
+def replay_dead_letters(dead_letter_ids) -> dict:
+    """
+    Re-enqueues the given dead letters (low-priority lane). The parse job resumes where it can:
+    a job that already holds Textkernel output goes straight to persist instead of being parsed again.
+    """
+    replayed, discarded, skipped = 0, 0, 0
+    now = datetime.now(dt_timezone.utc)
+    to_submit = []
+
+    dead_letters = ParseDeadLetter.query.filter(ParseDeadLetter.id.in_(dead_letter_ids)).with_for_update(
+        skip_locked=True).all()
+    for dead_letter in dead_letters:
+        if dead_letter.status != ParseDeadLetter.STATUS_PENDING:
+            skipped += 1
+            continue
+        job = CvParseJob.query.get(dead_letter.parse_job_id)
+        placeholder = Candidate.query.get(dead_letter.placeholder_candidate_id)
+        if job is None or placeholder is None or placeholder.current_status != 'ParsingFailed':
+            dead_letter.status = ParseDeadLetter.STATUS_DISCARDED
+            discarded += 1
+            continue
+
+        job.state = CvParseJob.STATE_PARSED if job.parsed_data else CvParseJob.STATE_STARTED
+        job.last_error = None
+        placeholder.current_status = 'Processing'
+        dead_letter.status = ParseDeadLetter.STATUS_REPLAYED
+        dead_letter.replay_count = (dead_letter.replay_count or 0) + 1
+        dead_letter.replayed_at = now
+        to_submit.append((str(dead_letter.placeholder_candidate_id), dead_letter.s3_key, dead_letter.company_id))
+        replayed += 1
+
+    db.session.commit()
+    # Publish only after the reset is committed, so the fetch stage sees the re-opened job.
+    for placeholder_candidate_id, s3_key, company_id in to_submit:
+        parse_dispatch_service.submit_cv_parse(placeholder_candidate_id, s3_key, company_id,
+                                               priority=parse_dispatch_service.PRIORITY_LOW)
+
+    logger.info(f"Dead-letter replay batch: {replayed} replayed, {discarded} discarded, {skipped} skipped.")
+    return {'replayed': replayed, 'discarded': discarded, 'skipped': skipped}
+
+
+def backfill_from_failed_candidates(company_id: int = None, batch_size: int = 500) -> int:
+    """
+    Creates parse jobs + dead letters for ParsingFailed candidates that predate the dead-letter table
+    (error_class 'LegacyParsingFailed'), so they can be replayed like any other failure.
+
+    :return: number of dead letters created.
+    """
+    created = 0
+    while True:
+        query = Candidate.query.filter(
+            Candidate.current_status == 'ParsingFailed',
+            Candidate.cv_storage_path.isnot(None),
+            ~db.session.query(CvParseJob.id).filter(
+                CvParseJob.placeholder_candidate_id == Candidate.candidate_id).exists()
+        )
+        if company_id:
+            query = query.filter(Candidate.company_id == company_id)
+        candidates = query.limit(batch_size).all()
+        if not candidates:
+            break
+        for candidate in candidates:
+            job = CvParseJob(placeholder_candidate_id=candidate.candidate_id, s3_key=candidate.cv_storage_path,
+                             company_id=candidate.company_id, state=CvParseJob.STATE_FAILED, attempts=0,
+                             last_error="ParsingFailed before dead-letter tracking.")
+            db.session.add(job)
+            db.session.flush()
+            last_note = (candidate.notes or '').strip().splitlines()[-1:] or ['']
+            record_parse_failure(job, None, 'LegacyParsingFailed', last_note[0])
+            created += 1
+        db.session.commit()
+    logger.info(f"Dead-letter backfill created {created} record(s).")
+    return created
@@ -0,0 +1,497 @@
+# backend/app/services/email_outbox_service.py
+# Transactional outbox για τα emails προς υποψηφίους και τις υπενθυμίσεις συνεντεύξεων προς χρήστες: η γραμμή
+# στο outbox γράφεται στην ίδια συναλλαγή με την αλλαγή κατάστασης, και ένας dispatcher τη στέλνει αργότερα σε
+# batches πάνω σε pooled SMTP σύνδεση.
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import redis
+from kombu import exceptions as kombu_exceptions
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import event, func, or_
+from sqlalchemy.orm import Session, joinedload
+
+from app import db
+from app.models import Candidate, OutboxEmail
+from . import email_template_service, mail_service, redis_service, task_publish_service
+
+logger = logging.getLogger(__name__)
+
+# - Enqueue: enqueue_rejection()/enqueue_interview_invitation() only add a row to the caller's session; the
+#   email exists if and only if the caller's transaction commits. After that commit the dispatcher is kicked
+#   (debounced through Redis); if the broker is down, the periodic dispatcher run picks the row up instead.
+# - Dispatch: dispatch_batch() claims up to OUTBOX_BATCH_SIZE due rows with FOR UPDATE SKIP LOCKED (concurrent
+#   dispatchers take disjoint batches) and moves them to 'sending' under a lease in a short transaction of its
+#   own. It then loads their candidates in one query, renders each email from the compiled template cache
+#   (email_template_service) and sends them over a pooled SMTP connection (mail_service.send_messages) in chunks
+#   of OUTBOX_SEND_CHUNK_SIZE, committing the outcome of each chunk before the next one is sent. No transaction
+#   is open during an SMTP call, and a rollback never returns an email that was sent to the pending state.
+# - The caller's deadline is checked before every chunk; rows not sent by then go back to pending for the next run.
+# - Delivery is at-least-once: a dispatcher killed mid-chunk leaves that chunk's rows in 'sending', and they are
+#   claimed again (and possibly sent twice) once their lease of OUTBOX_SENDING_LEASE_SECONDS expires.
+# - Rendering happens at send time from the candidate's current data. An invitation whose confirmation_uuid
+#   has changed since it was enqueued (interview rescheduled again) and a rejection whose candidate is no longer
+#   rejected are skipped, so only the latest state reaches the candidate.
+# - Interview reminders (to users) are enqueued by reminder_schedule_service in the transaction that records them
+#   in the sent_reminders ledger; their payload holds the rendered fields, as decided when the reminder was due.
+
+DISPATCH_TASK = 'tasks.communication.dispatch_email_outbox'
+DISPATCH_KICK_KEY = 'nexona:email_outbox:kick'
+PENDING_KICK_KEY = 'nexona_pending_outbox_kick'
+REJECTION_STATUSES = ('Rejected', 'Declined')
+REMINDER_KINDS = (email_template_service.KIND_INTERVIEW_REMINDER, email_template_service.KIND_INTERVIEW_REMINDER_DIGEST)
+# Rows the dispatcher may claim once next_attempt_at has come (for 'sending' rows that is the end of the lease).
+CLAIMABLE_STATUSES = (OutboxEmail.STATUS_PENDING, OutboxEmail.STATUS_SENDING)
+MAX_RETRY_DELAY_SECONDS = 3600
+
+
+def _now():
+    return datetime.now(dt_timezone.utc)
+
+
+def batch_size() -> int:
+    return current_app.config.get('OUTBOX_BATCH_SIZE', 100)
+
+
+def send_chunk_size() -> int:
+    return max(current_app.config.get('OUTBOX_SEND_CHUNK_SIZE', 10), 1)
+
+
+def sending_lease_seconds() -> int:
+    return current_app.config.get('OUTBOX_SENDING_LEASE_SECONDS', 120)
+
+
+# --- Enqueue (inside the caller's transaction) ---
+
+def _add(session, kind: str, company_id=None, candidate_id=None, payload: dict = None) -> OutboxEmail:
+    session = session or db.session()
+    row = OutboxEmail(kind=kind, company_id=company_id, candidate_id=candidate_id, payload=payload or None,
+                      status=OutboxEmail.STATUS_PENDING, next_attempt_at=_now())
+    session.add(row)
+    session.info[PENDING_KICK_KEY] = True
+    return row
+
+
+def enqueue(kind: str, candidate, payload: dict = None, session=None) -> OutboxEmail:
+    """Adds an outbox row for `candidate` to the session; it is sent only if that session's transaction commits."""
+    return _add(session, kind, candidate.company_id, candidate.candidate_id, payload)
+
+
+def enqueue_rejection(candidate, session=None) -> OutboxEmail:
+    return enqueue(email_template_service.KIND_REJECTION, candidate, session=session)
+
+
+def enqueue_interview_invitation(candidate, session=None) -> OutboxEmail:
+    """The invitation for the candidate's current interview (and confirmation_uuid, which must already be set)."""
+    return enqueue(email_template_service.KIND_INTERVIEW_INVITATION, candidate,
+                   payload={'confirmation_uuid': str(candidate.confirmation_uuid)}, session=session)
+
+
+def enqueue_interview_invitations(invitations, session=None) -> int:
+    """
+    Bulk enqueue for many candidates at once (one INSERT): `invitations` is a list of dicts
+    {candidate_id, company_id, confirmation_uuid}. Sent only if the session's transaction commits.
+    """
+    session = session or db.session()
+    if not invitations:
+        return 0
+    now = _now()
+    session.execute(OutboxEmail.__table__.insert(), [
+        {'kind': email_template_service.KIND_INTERVIEW_INVITATION, 'company_id': invitation['company_id'],
+         'candidate_id': invitation['candidate_id'], 'payload': {'confirmation_uuid': str(invitation['confirmation_uuid'])},
+         'status': OutboxEmail.STATUS_PENDING, 'attempts': 0, 'next_attempt_at': now, 'created_at': now}
+        for invitation in invitations
+    ])
+    session.info[PENDING_KICK_KEY] = True
+    return len(invitations)
+
+
+def enqueue_interview_reminder(user_email: str, interview: dict, company_id=None, candidate_id=None,
+                               session=None) -> OutboxEmail:
+    """
+    The reminder of one interview to a user. `interview`: dict {candidate_name, interview_datetime_iso,
+    interview_location}. Sent only if the session's transaction commits.
+    """
+    return _add(session, email_template_service.KIND_INTERVIEW_REMINDER, company_id, candidate_id,
+                {'user_email': user_email, **interview})
+
+
+def enqueue_interview_reminder_digest(user_email: str, interviews: list, company_id=None,
+                                      session=None) -> OutboxEmail:
+    """One email listing several interviews to a user in digest mode (see build_interview_reminder_digest_message)."""
+    return _add(session, email_template_service.KIND_INTERVIEW_REMINDER_DIGEST, company_id, None,
+                {'user_email': user_email, 'interviews': interviews})
+
+
+def kick_dispatcher():
+    """Schedules a dispatcher run, at most one per second; rows committed within that second go in the same run."""
+    redis_client = redis_service.get_redis_client()
+    try:
+        if redis_client is not None and not redis_client.set(DISPATCH_KICK_KEY, 1, nx=True, ex=1):
+            return  # A run is already scheduled and has not started yet
+        task_publish_service.publish_tasks([task_publish_service.task_message(DISPATCH_TASK, countdown=1)])
+    except (redis.RedisError, OSError, kombu_exceptions.KombuError) as kick_err:
+        logger.warning(f"Could not kick the email outbox dispatcher: {kick_err}. The periodic run will send the emails.")
+
+
+@event.listens_for(Session, 'after_commit')
+def _kick_after_commit(session):
+    if session.info.pop(PENDING_KICK_KEY, None):
+        kick_dispatcher()
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_kick_after_rollback(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_KICK_KEY, None)
+
+
+# --- Message builders (shared with the per-candidate email tasks) ---
+
+def _sender_display_name(sender_config) -> str:
+    try:
+        return sender_config.split('<')[0].strip().replace('"', '') or "Η Ομάδα Προσλήψεων"
+    except Exception:
+        return "Η Ομάδα Προσλήψεων"
+
+
+def build_rejection_message(candidate) -> Message:
+    """The rejection email of the candidate (company template if it has one). ValueError if it cannot be sent."""
+    if not candidate.email:
+        raise ValueError("candidate has no email address")
+    sender_config = current_app.config.get('MAIL_SENDER', '"CV Manager App" <noreply@example.com>')
+    app_name = current_app.config.get('APP_NAME', 'NEXONA')
+    sender_display_name = _sender_display_name(sender_config)
+    first_name = candidate.first_name or 'Υποψήφιε/α'
+
+    body_text = f"""Αγαπητέ/ή {first_name},
+
+Εξετάσαμε το βιογραφικό σας σημείωμα για τη θέση εργασίας στην εταιρεία μας.
+
+Θα θέλαμε να σας ευχαριστήσουμε θερμά για το ενδιαφέρον που δείξατε. Ωστόσο, λυπούμαστε που σας ενημερώνουμε ότι προς το παρόν δεν θα προχωρήσουμε σε περαιτέρω συνεργασία μαζί σας για την συγκεκριμένη θέση.
+
+Το βιογραφικό σας θα παραμείνει στη βάση δεδομένων μας και θα το λάβουμε υπόψη για πιθανές μελλοντικές θέσεις εργασίας που μπορεί να ταιριάζουν με τα προσόντα σας.
+
+Σας ευχόμαστε καλή επιτυχία στην αναζήτηση εργασίας σας.
+
+Με εκτίμηση,
+{sender_display_name}
+""".strip()
+
+    html_body, is_company_template = email_template_service.render(
+        email_template_service.KIND_REJECTION, candidate.company_id,
+        candidate_name=first_name, sender_display_name=sender_display_name,
+        company_name=candidate.company.name if candidate.company else '', app_name=app_name)
+    if is_company_template:
+        body_text = None  # The default plain-text version would not match the company's own wording
+    return Message(subject=f"Ενημέρωση σχετικά με την αίτησή σας - {app_name}", sender=sender_config,
+                   recipients=[candidate.email], body=body_text, html=html_body)
+
+
+def build_interview_invitation_message(candidate) -> Message:
+    """The invitation with the confirm/decline links of the candidate's current interview. ValueError if not sendable."""
+    if not candidate.email:
+        raise ValueError("candidate has no email address")
+    if not candidate.interview_datetime:
+        raise ValueError("candidate has no interview scheduled")
+    if not candidate.confirmation_uuid:
+        raise ValueError("candidate is missing confirmation_uuid")
+    sender_config = current_app.config.get('MAIL_SENDER', '"CV Manager App" <noreply@example.com>')
+    app_name = current_app.config.get('APP_NAME', 'NEXONA')
+    # IMPORTANT: Set APP_BASE_URL in .env or config (e.g., http://yourdomain.com or http://localhost:5000)
+    base_url = current_app.config.get('APP_BASE_URL', 'http://localhost:5000')
+
+    html_body, _ = email_template_service.render(
+        email_template_service.KIND_INTERVIEW_INVITATION, candidate.company_id,
+        candidate_name=candidate.get_full_name(),
+        interview_datetime=candidate.interview_datetime.strftime('%d/%m/%Y στις %H:%M'),
+        interview_location=candidate.interview_location,
+        confirm_url=f"{base_url}/api/v1/interviews/confirm/{candidate.confirmation_uuid}",
+        decline_url=f"{base_url}/api/v1/interviews/decline/{candidate.confirmation_uuid}",
+        company_name=candidate.company.name if candidate.company else '',
+        app_name=app_name)
+    return Message(f"Πρόσκληση Συνέντευξης - {app_name}", sender=sender_config, recipients=[candidate.email],
+                   html=html_body)
+
+
+def format_interview_time(interview_datetime_iso) -> str:
+    try:
+        return datetime.fromisoformat(interview_datetime_iso).astimezone(dt_timezone.utc).strftime("%d/%m/%Y %H:%M UTC")
+    except Exception as format_err:
+        logger.warning(f"Could not format interview datetime {interview_datetime_iso}: {format_err}")
+        return interview_datetime_iso
+
+
+def build_interview_reminder_message(user_email, candidate_name, interview_datetime_iso,
+                                     interview_location) -> Message:
+    """The reminder of one upcoming interview to a user (HR personnel). ValueError if it cannot be sent."""
+    if not user_email:
+        raise ValueError("no user email provided")
+    sender_config = current_app.config.get('MAIL_SENDER', '"CV Manager App" <noreply@example.com>')
+    app_name = current_app.config.get('APP_NAME', 'NEXONA')
+    formatted_time = format_interview_time(interview_datetime_iso)
+    body_text = f"""
+Γεια σας,
+
+Αυτό είναι μια υπενθύμιση για την επερχόμενη συνέντευξή σας:
+
+Υποψήφιος: {candidate_name or 'N/A'}
+Ημερομηνία & Ώρα: {formatted_time}
+Τοποθεσία: {interview_location or 'N/A'}
+
+- Σύστημα {app_name}
+""".strip()
+    html_body, _ = email_template_service.render(
+        email_template_service.KIND_INTERVIEW_REMINDER, candidate_name=candidate_name or 'N/A',
+        formatted_time=formatted_time, interview_location=interview_location or 'N/A', app_name=app_name)
+    return Message(subject=f"Υπενθύμιση Συνέντευξης: {candidate_name or 'Υποψήφιος'}", sender=sender_config,
+                   recipients=[user_email], body=body_text, html=html_body)
+
+
+def build_interview_reminder_digest_message(user_email, interviews) -> Message:
+    """
+    One email listing several upcoming interviews to a user in reminder digest mode. `interviews`: list of dicts
+    {candidate_name, interview_datetime_iso, interview_location, positions}. ValueError if it cannot be sent.
+    """
+    if not user_email or not interviews:
+        raise ValueError("no user email or no interviews provided")
+    sender_config = current_app.config.get('MAIL_SENDER', '"CV Manager App" <noreply@example.com>')
+    app_name = current_app.config.get('APP_NAME', 'NEXONA')
+    rows = [{'candidate_name': interview.get('candidate_name') or 'N/A',
+             'formatted_time': format_interview_time(interview.get('interview_datetime_iso')),
+             'interview_location': interview.get('interview_location') or 'N/A',
+             'positions': interview.get('positions') or []} for interview in interviews]
+    body_text = "Γεια σας,\n\nΥπενθύμιση για τις επερχόμενες συνεντεύξεις σας:\n\n" + "\n".join(
+        f"- {row['formatted_time']}: {row['candidate_name']}"
+        f"{' (' + ', '.join(row['positions']) + ')' if row['positions'] else ''} - {row['interview_location']}"
+        for row in rows) + f"\n\n- Σύστημα {app_name}"
+    html_body, _ = email_template_service.render(
+        email_template_service.KIND_INTERVIEW_REMINDER_DIGEST, interviews=rows, app_name=app_name)
+    return Message(subject=f"Υπενθύμιση: {len(rows)} επερχόμενες συνεντεύξεις", sender=sender_config,
+                   recipients=[user_email], body=body_text, html=html_body)
+
+
+def _build_reminder_message(row) -> Message:
+    payload = row.payload or {}
+    if row.kind == email_template_service.KIND_INTERVIEW_REMINDER:
+        return build_interview_reminder_message(payload.get('user_email'), payload.get('candidate_name'),
+                                                payload.get('interview_datetime_iso'),
+                                                payload.get('interview_location'))
+    return build_interview_reminder_digest_message(payload.get('user_email'), payload.get('interviews'))
+
+
+def _build_message(row, candidate):
+    """(Message, None) for a row that should be sent, else (None, reason it is skipped)."""
+    if row.kind in REMINDER_KINDS:
+        # Already settled against the sent_reminders ledger when it was enqueued: send it as recorded.
+        try:
+            return _build_reminder_message(row), None
+        except ValueError as build_err:
+            return None, str(build_err)
+    if candidate is None:
+        return None, "candidate no longer exists"
+    try:
+        if row.kind == email_template_service.KIND_REJECTION:
+            if candidate.current_status not in REJECTION_STATUSES:
+                return None, f"superseded: candidate is now '{candidate.current_status}'"
+            return build_rejection_message(candidate), None
+        if row.kind == email_template_service.KIND_INTERVIEW_INVITATION:
+            enqueued_uuid = (row.payload or {}).get('confirmation_uuid')
+            if enqueued_uuid and enqueued_uuid != str(candidate.confirmation_uuid):
+                return None, "superseded: the interview was rescheduled after this invitation was enqueued"
+            return build_interview_invitation_message(candidate), None
+    except ValueError as build_err:
+        return None, str(build_err)
+    return None, f"unknown outbox kind '{row.kind}'"
+
+
+# --- Dispatch ---
+
+def _retry_delay_seconds(attempts: int) -> int:
+    return min(30 * (2 ** max(attempts - 1, 0)), MAX_RETRY_DELAY_SECONDS)
+
+
+def _claim(limit: int, now) -> tuple:
+    """
+    Claims up to `limit` due rows (FOR UPDATE SKIP LOCKED) and moves them to 'sending' under a lease, counting the
+    attempt before anything is sent. A row whose lease expired with its attempts used up is marked failed instead.
+    Commits, so the row locks are held only for this short transaction.
+
+    :return: (ids of the claimed rows in due order, number of rows marked failed).
+    """
+    rows = (OutboxEmail.query
+            .filter(OutboxEmail.status.in_(CLAIMABLE_STATUSES), OutboxEmail.next_attempt_at <= now)
+            .order_by(OutboxEmail.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all())
+    max_attempts = current_app.config.get('OUTBOX_MAX_ATTEMPTS', 8)
+    lease_until = now + timedelta(seconds=sending_lease_seconds())
+    claimed_ids, exhausted = [], 0
+    for row in rows:
+        if row.status == OutboxEmail.STATUS_SENDING:
+            if (row.attempts or 0) >= max_attempts:
+                row.status = OutboxEmail.STATUS_FAILED
+                row.last_error = "dispatcher stopped while sending it; no attempts left"
+                exhausted += 1
+                logger.critical(f"Outbox email {row.id} ({row.kind}, candidate {row.candidate_id}) failed: its "
+                                f"dispatcher stopped while sending it after {row.attempts} attempt(s).")
+                continue
+            logger.warning(f"Outbox email {row.id} was left sending by a stopped dispatcher; claiming it again.")
+        row.status, row.next_attempt_at = OutboxEmail.STATUS_SENDING, lease_until
+        row.attempts = (row.attempts or 0) + 1
+        claimed_ids.append(row.id)
+    db.session.commit()
+    return claimed_ids, exhausted
+
+
+def _send_chunk(chunk) -> list:
+    """Sends the messages of `chunk` ((row_id, attempts, message) tuples), or logs them with MAIL_DEBUG."""
+    if current_app.config.get('MAIL_DEBUG', False):
+        for row_id, _, message in chunk:
+            logger.info(f"--- MAIL DEBUG: Outbox Email {row_id} --- Subject: {message.subject} | "
+                        f"From: {message.sender} | To: {message.recipients}")
+        return [{'status': mail_service.RESULT_SENT, 'error': None} for _ in chunk]
+    return mail_service.send_messages([message for _, _, message in chunk])
+
+
+def _record_outcomes(chunk, outcomes, result):
+    """Writes the outcome of every sent row of `chunk` (no commit)."""
+    max_attempts = current_app.config.get('OUTBOX_MAX_ATTEMPTS', 8)
+    now = _now()
+    for (row_id, attempts, _), outcome in zip(chunk, outcomes):
+        changes = {'last_error': outcome['error']}
+        if outcome['status'] == mail_service.RESULT_SENT:
+            changes.update(status=OutboxEmail.STATUS_SENT, sent_at=now)
+            result['sent'] += 1
+        elif outcome['status'] == mail_service.RESULT_RETRY and attempts < max_attempts:
+            changes.update(status=OutboxEmail.STATUS_PENDING,
+                           next_attempt_at=now + timedelta(seconds=_retry_delay_seconds(attempts)))
+            result['retry'] += 1
+        else:
+            changes.update(status=OutboxEmail.STATUS_FAILED)
+            result['failed'] += 1
+            logger.critical(f"Outbox email {row_id} failed after {attempts} attempt(s): {outcome['error']}")
+        OutboxEmail.query.filter_by(id=row_id).update(changes, synchronize_session=False)
+
+
+def _release(row_ids) -> int:
+    """Returns claimed rows that were not sent to pending, due now, without counting the attempt (no commit)."""
+    if not row_ids:
+        return 0
+    return (OutboxEmail.query
+            .filter(OutboxEmail.id.in_(row_ids), OutboxEmail.status == OutboxEmail.STATUS_SENDING)
+            .update({'status': OutboxEmail.STATUS_PENDING, 'next_attempt_at': _now(),
+                     'attempts': OutboxEmail.attempts - 1}, synchronize_session=False))
+
+
+def dispatch_batch(limit: int = None, deadline: float = None) -> dict:
+    """
+    Claims up to `limit` due rows, renders them and sends them in chunks of OUTBOX_SEND_CHUNK_SIZE over a pooled
+    SMTP connection, committing each chunk's outcomes as soon as it is sent. `deadline` (time.monotonic()) is
+    checked before every chunk: the rows not sent by then are released for the next run. With MAIL_DEBUG the
+    emails are logged instead of sent.
+
+    :return: dict with the number of rows claimed, sent, failed, retry (backing off), skipped and released.
+    """
+    limit = limit or batch_size()
+    claimed_ids, exhausted = _claim(limit, _now())
+    result = {'claimed': len(claimed_ids) + exhausted, 'sent': 0, 'failed': exhausted, 'retry': 0, 'skipped': 0,
+              'released': 0}
+    if not claimed_ids:
+        return result
+
+    order = {row_id: index for index, row_id in enumerate(claimed_ids)}
+    rows = sorted(OutboxEmail.query.filter(OutboxEmail.id.in_(claimed_ids)).all(), key=lambda row: order[row.id])
+    candidate_ids = {row.candidate_id for row in rows
+                     if row.candidate_id is not None and row.kind not in REMINDER_KINDS}
+    candidates = {c.candidate_id: c for c in Candidate.query.options(joinedload(Candidate.company))
+                  .filter(Candidate.candidate_id.in_(candidate_ids))} if candidate_ids else {}
+
+    to_send = []
+    for row in rows:
+        message, skip_reason = _build_message(row, candidates.get(row.candidate_id))
+        if message is None:
+            row.status, row.last_error = OutboxEmail.STATUS_SKIPPED, skip_reason
+            result['skipped'] += 1
+            logger.info(f"Outbox email {row.id} ({row.kind}, candidate {row.candidate_id}) skipped: {skip_reason}")
+        else:
+            to_send.append((row.id, row.attempts, message))
+    db.session.commit()  # Skips recorded; no transaction stays open while sending
+
+    chunk_size = send_chunk_size()
+    for start in range(0, len(to_send), chunk_size):
+        if deadline is not None and time.monotonic() >= deadline:
+            result['released'] = _release([row_id for row_id, _, _ in to_send[start:]])
+            db.session.commit()
+            logger.info(f"Outbox dispatch time budget used up; released {result['released']} email(s) for the next run.")
+            break
+        chunk = to_send[start:start + chunk_size]
+        _record_outcomes(chunk, _send_chunk(chunk), result)
+        db.session.commit()
+    return result
+
+
+def prune(retention_days: int = None) -> int:
+    """Deletes the sent, failed and skipped rows created more than `retention_days` ago. Commits."""
+    retention_days = retention_days or current_app.config.get('OUTBOX_RETENTION_DAYS', 14)
+    cutoff = _now() - timedelta(days=retention_days)
+    deleted = (OutboxEmail.query
+               .filter(OutboxEmail.status.notin_(CLAIMABLE_STATUSES), OutboxEmail.created_at < cutoff)
+               .delete(synchronize_session=False))
+    db.session.commit()
+    return deleted
+
+
+# --- Metrics ---
+
+def get_outbox_metrics(window_minutes: int = 60) -> dict:
+    """
+    Outbox lag and throughput, from the table itself:
+    - backlog: pending rows, how many are due now / backing off after a transient failure, and the age of the
+      oldest due row (how far behind the dispatcher is); rows being sent right now (claimed, under a lease);
+    - over the last `window_minutes`: emails sent (and per minute), and their enqueue-to-send latency (avg / max);
+      emails enqueued in the window that failed or were skipped.
+    """
+    now = _now()
+    since = now - timedelta(minutes=window_minutes)
+    is_pending = OutboxEmail.status == OutboxEmail.STATUS_PENDING
+    is_due = is_pending & (OutboxEmail.next_attempt_at <= now)
+    pending, due, backing_off, oldest_due_at, sending = db.session.query(
+        func.count(OutboxEmail.id).filter(is_pending),
+        func.count(OutboxEmail.id).filter(is_due),
+        func.count(OutboxEmail.id).filter(is_pending & (OutboxEmail.attempts > 0)),
+        func.min(OutboxEmail.created_at).filter(is_due),
+        func.count(OutboxEmail.id).filter(OutboxEmail.status == OutboxEmail.STATUS_SENDING),
+    ).filter(OutboxEmail.status.in_(CLAIMABLE_STATUSES)).one()
+
+    # Sent in the window, plus the rows enqueued in it that ended failed or skipped
+    recent = (db.session.query(OutboxEmail.status, OutboxEmail.created_at, OutboxEmail.sent_at)
+              .filter(or_(OutboxEmail.sent_at >= since,
+                          (OutboxEmail.created_at >= since) & OutboxEmail.status.in_(
+                              (OutboxEmail.STATUS_FAILED, OutboxEmail.STATUS_SKIPPED))))
+              .all())
+    latencies = [(sent_at - created_at).total_seconds() for status, created_at, sent_at in recent
+                 if status == OutboxEmail.STATUS_SENT and sent_at and created_at]
+    counts = {OutboxEmail.STATUS_SENT: len(latencies), OutboxEmail.STATUS_FAILED: 0, OutboxEmail.STATUS_SKIPPED: 0}
+    for status, _, _ in recent:
+        if status != OutboxEmail.STATUS_SENT:
+            counts[status] = counts.get(status, 0) + 1
+
+    return {
+        'pending': pending,
+        'due': due,
+        'backing_off': backing_off,
+        'oldest_due_age_seconds': round((now - oldest_due_at).total_seconds(), 1) if oldest_due_at else 0.0,
+        'sending': sending,
+        'window_minutes': window_minutes,
+        'sent': counts[OutboxEmail.STATUS_SENT],
+        'sent_per_minute': round(counts[OutboxEmail.STATUS_SENT] / window_minutes, 2),
+        'failed': counts[OutboxEmail.STATUS_FAILED],
+        'skipped': counts[OutboxEmail.STATUS_SKIPPED],
+        'send_latency_avg_seconds': round(sum(latencies) / len(latencies), 1) if latencies else None,
+        'send_latency_max_seconds': round(max(latencies), 1) if latencies else None,
+    }
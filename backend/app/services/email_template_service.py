@@ -0,0 +1,216 @@
+# backend/app/services/email_template_service.py
+# Registry των HTML templates των emails: κάθε (εταιρεία, είδος, έκδοση) γίνεται compile μία φορά ανά process
+# και το render γίνεται από το cached Template, αντί για render_template_string (parse+compile) σε κάθε αποστολή.
+# Τα templates της εταιρείας (CompanySettings.*_email_template) έχουν προτεραιότητα έναντι των default.
+
+import logging
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+from jinja2 import TemplateError
+from jinja2.sandbox import ImmutableSandboxedEnvironment
+from sqlalchemy import event
+
+from app import db
+from app.models import CompanySettings
+
+logger = logging.getLogger(__name__)
+
+KIND_REJECTION = 'rejection'
+KIND_INTERVIEW_INVITATION = 'interview_invitation'
+KIND_INTERVIEW_REMINDER = 'interview_reminder'
+KIND_INTERVIEW_REMINDER_DIGEST = 'interview_reminder_digest'
+
+# Template kind -> CompanySettings column a company can override it with.
+COMPANY_TEMPLATE_FIELDS = {
+    KIND_REJECTION: 'rejection_email_template',
+    KIND_INTERVIEW_INVITATION: 'interview_invitation_email_template',
+}
+
+# Variables passed to each kind (company templates may use any of them):
+#   rejection:            candidate_name, sender_display_name, company_name, app_name
+#   interview_invitation: candidate_name, interview_datetime, interview_location, confirm_url, decline_url,
+#                         company_name, app_name
+#   interview_reminder:   candidate_name, formatted_time, interview_location, app_name
+#   interview_reminder_digest: interviews (list of candidate_name, formatted_time, interview_location, positions),
+#                         app_name
+DEFAULT_TEMPLATES = {
+    KIND_REJECTION: """
+            <p>Αγαπητέ/ή {{ candidate_name }},</p>
+            <p>Εξετάσαμε το βιογραφικό σας σημείωμα για τη θέση εργασίας στην εταιρεία μας.</p>
+            <p>Θα θέλαμε να σας ευχαριστήσουμε θερμά για το ενδιαφέρον που δείξατε. Ωστόσο, λυπούμαστε που σας ενημερώνουμε ότι προς το παρόν δεν θα προχωρήσουμε σε περαιτέρω συνεργασία μαζί σας για την συγκεκριμένη θέση.</p>
+            <p>Το βιογραφικό σας θα παραμείνει στη βάση δεδομένων μας και θα το λάβουμε υπόψη για πιθανές μελλοντικές θέσεις εργασίας που μπορεί να ταιριάζουν με τα προσόντα σας.</p>
+            <p>Σας ευχόμαστε καλή επιτυχία στην αναζήτηση εργασίας σας.</p>
+            <br>
+            <p>Με εκτίμηση,</p>
+            <p>{{ sender_display_name }}</p>
+            """,
+    KIND_INTERVIEW_REMINDER: """
+            <p>Γεια σας,</p>
+            <p>Αυτό είναι μια υπενθύμιση για την επερχόμενη συνέντευξή σας:</p>
+            <ul>
+                <li><strong>Υποψήφιος:</strong> {{ candidate_name }}</li>
+                <li><strong>Ημερομηνία & Ώρα:</strong> {{ formatted_time }}</li>
+                <li><strong>Τοποθεσία:</strong> {{ interview_location }}</li>
+            </ul>
+            <p>- Σύστημα {{ app_name }}</p>
+            """,
+    KIND_INTERVIEW_REMINDER_DIGEST: """
+            <p>Γεια σας,</p>
+            <p>Υπενθύμιση για τις επερχόμενες συνεντεύξεις σας ({{ interviews|length }}):</p>
+            <table cellpadding="6" style="border-collapse: collapse;">
+                <tr><th align="left">Ημερομηνία & Ώρα</th><th align="left">Υποψήφιος</th><th align="left">Θέση</th><th align="left">Τοποθεσία</th></tr>
+                {% for interview in interviews %}
+                <tr>
+                    <td>{{ interview.formatted_time }}</td>
+                    <td>{{ interview.candidate_name }}</td>
+                    <td>{{ interview.positions|join(', ') or '-' }}</td>
+                    <td>{{ interview.interview_location }}</td>
+                </tr>
+                {% endfor %}
+            </table>
+            <p>- Σύστημα {{ app_name }}</p>
+            """,
+    KIND_INTERVIEW_INVITATION: """
+            <p>Αγαπητέ/ή {{ candidate_name }},</p>
+            <p>Θα θέλαμε να σας προσκαλέσουμε σε συνέντευξη για τη θέση που αιτηθήκατε στην εταιρεία μας.</p>
+            <p><strong>Στοιχεία Συνέντευξης:</strong></p>
+            <ul>
+                <li><strong>Ημερομηνία & Ώρα:</strong> {{ interview_datetime }}</li>
+                {% if interview_location %}
+                <li><strong>Τοποθεσία:</strong> {{ interview_location }}</li>
+                {% endif %}
+            </ul>
+            <p>Παρακαλούμε επιβεβαιώστε την παρουσία σας κάνοντας κλικ στον παρακάτω σύνδεσμο:</p>
+            <p style="margin: 20px 0;">
+                <a href="{{ confirm_url }}" style="display: inline-block; padding: 12px 20px; background-color: #28a745; color: white; text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    Επιβεβαίωση Παρουσίας
+                </a>
+            </p>
+            <p>Αν δεν μπορείτε να παρευρεθείτε την προγραμματισμένη ώρα ή χρειάζεστε αλλαγή, παρακαλούμε ενημερώστε μας κάνοντας κλικ εδώ:</p>
+            <p style="margin: 20px 0;">
+                <a href="{{ decline_url }}" style="display: inline-block; padding: 12px 20px; background-color: #dc3545; color: white; text-decoration: none; border-radius: 5px; font-weight: bold;">
+                    Αδυναμία Παρουσίας / Αίτημα Αλλαγής
+                </a>
+            </p>
+            <br>
+            <p>Με εκτίμηση,</p>
+            <p>Η Ομάδα Προσλήψεων</p>
+            <p>{{ app_name }}</p>
+            """,
+}
+
+# Company templates are written by company admins: render them sandboxed (no attribute/method access to
+# internals) and with autoescaping, like render_template_string did for the defaults.
+_jinja_env = ImmutableSandboxedEnvironment(autoescape=True)
+
+# (company_id or None, kind, version) -> (Template, is_company_template). LRU, guarded by _cache_lock.
+_template_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_size() -> int:
+    return current_app.config.get('EMAIL_TEMPLATE_CACHE_SIZE', 512)
+
+
+def _cache_get(key):
+    with _cache_lock:
+        cached = _template_cache.get(key)
+        if cached is not None:
+            _template_cache.move_to_end(key)
+        return cached
+
+
+def _cache_put(key, value):
+    company_id, kind, _version = key
+    with _cache_lock:
+        # A newer version replaces the older ones of the same (company, kind).
+        for stale_key in [k for k in _template_cache if k[0] == company_id and k[1] == kind and k != key]:
+            del _template_cache[stale_key]
+        _template_cache[key] = value
+        while len(_template_cache) > _cache_size():
+            _template_cache.popitem(last=False)
+
+
+def validate_template_source(source):
+    """Returns None if `source` compiles as an email template, else the syntax error message."""
+    try:
+        _jinja_env.from_string(source)
+    except TemplateError as template_err:
+        return str(template_err)
+    return None
+
+
+def _default_template(kind):
+    key = (None, kind, 0)
+    cached = _cache_get(key)
+    if cached is None:
+        cached = (_jinja_env.from_string(DEFAULT_TEMPLATES[kind]), False)
+        _cache_put(key, cached)
+    return cached
+
+
+def get_template(kind, company_id=None):
+    """
+    The compiled template for `kind`: the company's own template if it has one, else the default.
+    A cache hit costs one single-column query (the company's email_templates_version); the template
+    text is loaded and compiled only when that version is not cached yet.
+    Returns (jinja2.Template, is_company_template).
+    """
+    column_name = COMPANY_TEMPLATE_FIELDS.get(kind)
+    if company_id is None or column_name is None:
+        return _default_template(kind)
+
+    version = db.session.query(CompanySettings.email_templates_version).filter_by(company_id=company_id).scalar()
+    if version is None:
+        return _default_template(kind)
+    key = (company_id, kind, version)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    source = db.session.query(getattr(CompanySettings, column_name)).filter_by(company_id=company_id).scalar()
+    compiled = _default_template(kind)
+    if source and source.strip():
+        try:
+            compiled = (_jinja_env.from_string(source), True)
+        except TemplateError as template_err:
+            logger.warning(f"Company {company_id} {kind} email template v{version} does not compile "
+                           f"({template_err}); using the default template.")
+    _cache_put(key, compiled)
+    return compiled
+
+
+def render(kind, company_id=None, **context):
+    """
+    Renders the `kind` email (HTML) for the company. Returns (html, is_company_template).
+    If a company template fails at render time, the default template is used instead.
+    """
+    template, is_company_template = get_template(kind, company_id)
+    if is_company_template:
+        try:
+            return template.render(**context), True
+        except Exception as render_err:
+            logger.warning(f"Company {company_id} {kind} email template failed to render ({render_err}); "
+                           f"using the default template.")
+            template, is_company_template = _default_template(kind)
+    return template.render(**context), is_company_template
+
+
+def clear_cache():
+    with _cache_lock:
+        _template_cache.clear()
+
+
+@event.listens_for(CompanySettings, 'before_update')
+def _bump_email_templates_version(mapper, connection, target):
+    """Any change to a template column bumps the version, so every worker recompiles on its next send.
+
+    The increment is a SQL expression, so two concurrent template edits each add one to the stored value
+    instead of both writing the same number read earlier; the attribute is expired after the flush and
+    reloads the new version on its next access.
+    """
+    state = db.inspect(target)
+    if any(state.attrs[column_name].history.has_changes() for column_name in COMPANY_TEMPLATE_FIELDS.values()):
+        target.email_templates_version = CompanySettings.email_templates_version + 1
@@ -0,0 +1,48 @@
+# backend/app/services/http_client_service.py
+
+import logging
+import threading
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# One pooled session per process. Connections (TLS handshakes included) are reused across tasks
+# instead of opening a new socket per requests.post(). The session carries no cookies/auth state,
+# so sharing it between threads/greenlets of the same worker is safe.
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _build_http_session(pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, pool_block=False)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Returns the process-wide pooled HTTP session (created on first use).
+    pool_maxsize follows HTTP_POOL_MAXSIZE, which should be >= the worker concurrency.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                pool_maxsize = current_app.config.get('HTTP_POOL_MAXSIZE', 32)
+                _http_session = _build_http_session(pool_maxsize)
+                logger.info(f"Pooled HTTP session created (pool_maxsize={pool_maxsize}).")
+    return _http_session
+
+
+def reset_http_session():
+    """Drops the pooled session (e.g. in a freshly forked child, which must not share sockets with its parent)."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is not None:
+            _http_session.close()
+        _http_session = None
@@ -0,0 +1,147 @@
+# backend/app/services/interview_schedule_service.py
+# Μαζικός προγραμματισμός συνεντεύξεων (π.χ. assessment day): έλεγχος όλων των υποψηφίων με ένα query,
+# ενημέρωση όλων με ένα UPDATE ... FROM (VALUES ...) και οι προσκλήσεις στο email outbox με ένα INSERT.
+
+import logging
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+from flask import current_app
+from sqlalchemy import cast, column, func, literal, update, values
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app import db
+from app.models import Candidate
+from . import email_outbox_service, reminder_schedule_service
+
+logger = logging.getLogger(__name__)
+
+INTERVIEW_STATUS = 'Interview'
+# No interview can be scheduled for a CV still being parsed (or that failed to parse), nor after hiring.
+UNSCHEDULABLE_STATUSES = ('Processing', 'ParsingFailed', 'Hired')
+
+
+def max_candidates() -> int:
+    return current_app.config.get('BULK_SCHEDULE_MAX_CANDIDATES', 200)
+
+
+def validate_slots(slots, company_id=None) -> tuple:
+    """
+    Checks every slot against the candidates table in one query. `slots`: list of dicts {candidate_id (UUID),
+    interview_datetime (aware datetime), interview_location, interview_type}. `company_id` restricts the
+    candidates to one company (None: any company, superadmin).
+
+    :return: (candidates' current state by candidate_id, list of {candidate_id, error}); nothing is changed.
+             The candidate rows stay locked until the session's transaction ends.
+    """
+    errors = []
+    seen = set()
+    now = datetime.now(dt_timezone.utc)
+    for slot in slots:
+        if slot['candidate_id'] in seen:
+            errors.append({'candidate_id': str(slot['candidate_id']), 'error': "Candidate listed more than once."})
+        seen.add(slot['candidate_id'])
+        if slot['interview_datetime'] <= now:
+            errors.append({'candidate_id': str(slot['candidate_id']), 'error': "Interview time is in the past."})
+
+    rows = (db.session.query(Candidate.candidate_id, Candidate.company_id, Candidate.current_status,
+                             Candidate.interview_datetime)
+            .filter(Candidate.candidate_id.in_(seen))
+            .order_by(Candidate.candidate_id)  # Same lock order for concurrent bulk requests
+            .with_for_update()  # Held until the caller's commit: the state cannot change before the UPDATE
+            .all())
+    current = {row.candidate_id: row for row in rows if company_id is None or row.company_id == company_id}
+    for candidate_id in seen:
+        row = current.get(candidate_id)
+        if row is None:
+            # Candidates of another company are reported as missing, like the single-candidate endpoints do.
+            errors.append({'candidate_id': str(candidate_id), 'error': "Candidate not found."})
+        elif row.current_status in UNSCHEDULABLE_STATUSES:
+            errors.append({'candidate_id': str(candidate_id),
+                           'error': f"Cannot schedule an interview for a candidate in status '{row.current_status}'."})
+    return current, errors
+
+
+def _history_event(slot, previous, actor_id, actor_username, timestamp) -> dict:
+    """The candidate history entry of one scheduled slot (same shape as Candidate.add_history_event)."""
+    interview_iso = slot['interview_datetime'].isoformat()
+    if previous.current_status != INTERVIEW_STATUS:
+        # A status_change to 'Interview', as the single-candidate PUT writes (the notification recipients use it).
+        event_type = 'status_change'
+        description = f"Status changed from '{previous.current_status}' to '{INTERVIEW_STATUS}' (bulk scheduling)."
+    else:
+        event_type = 'interview_rescheduled'
+        description = "Interview rescheduled (bulk scheduling)."
+    return {
+        'timestamp': timestamp.isoformat(),
+        'event_type': event_type,
+        'description': description,
+        'actor_id': actor_id,
+        'actor_username': actor_username,
+        'details': {
+            'previous_status': previous.current_status,
+            'new_status': INTERVIEW_STATUS,
+            'previous_interview_datetime': previous.interview_datetime.isoformat() if previous.interview_datetime else None,
+            'interview_datetime': interview_iso,
+            'bulk': True,
+        },
+    }
+
+
+def schedule_interviews(slots, current, actor_id=None, actor_username=None, session=None) -> list:
+    """
+    Schedules the validated slots (see validate_slots) in one UPDATE statement: status 'Interview', the slot's
+    time/location/type, confirmation 'Pending' with a new confirmation_uuid, and one history event appended to
+    each candidate's history in the database. Queues all invitations in the email outbox with one INSERT and
+    syncs the candidates' interview reminders. Does not commit.
+
+    :return: one dict per scheduled candidate {candidate_id, interview_datetime, confirmation_uuid}.
+    """
+    session = session or db.session()
+    if not slots:
+        return []
+    now = datetime.now(dt_timezone.utc)
+    rows = []
+    for slot in slots:
+        rows.append((slot['candidate_id'], slot['interview_datetime'], slot.get('interview_location'),
+                     slot.get('interview_type'), uuid.uuid4(),
+                     _history_event(slot, current[slot['candidate_id']], actor_id, actor_username, now)))
+
+    slot_values = values(
+        column('candidate_id', UUID(as_uuid=True)),
+        column('interview_datetime', db.DateTime(timezone=True)),
+        column('interview_location', db.String),
+        column('interview_type', db.String),
+        column('confirmation_uuid', UUID(as_uuid=True)),
+        column('history_event', JSONB),
+        name='slots',
+    ).data(rows)
+    candidates = Candidate.__table__
+    session.execute(
+        update(candidates)
+        .where(candidates.c.candidate_id == slot_values.c.candidate_id)
+        .values(
+            current_status=INTERVIEW_STATUS,
+            interview_datetime=cast(slot_values.c.interview_datetime, db.DateTime(timezone=True)),
+            # A slot without a location/type keeps the candidate's current one
+            interview_location=func.coalesce(cast(slot_values.c.interview_location, db.String),
+                                             candidates.c.interview_location),
+            interview_type=func.coalesce(cast(slot_values.c.interview_type, db.String), candidates.c.interview_type),
+            candidate_confirmation_status='Pending',
+            confirmation_uuid=cast(slot_values.c.confirmation_uuid, UUID(as_uuid=True)),
+            history=func.coalesce(candidates.c.history, cast(literal('[]'), JSONB)).op('||')(
+                func.jsonb_build_array(cast(slot_values.c.history_event, JSONB))),
+            updated_at=now,
+        )
+    )
+
+    candidate_ids = [row[0] for row in rows]
+    reminder_schedule_service.sync_changes(session, candidate_ids=candidate_ids)
+    email_outbox_service.enqueue_interview_invitations([
+        {'candidate_id': candidate_id, 'company_id': current[candidate_id].company_id, 'confirmation_uuid': new_uuid}
+        for candidate_id, _, _, _, new_uuid, _ in rows
+    ], session=session)
+    logger.info(f"Bulk scheduled {len(rows)} interview(s) by user {actor_id} ({actor_username}).")
+    return [{'candidate_id': str(candidate_id), 'interview_datetime': interview_datetime.isoformat(),
+             'confirmation_uuid': str(new_uuid)}
+            for candidate_id, interview_datetime, _, _, new_uuid, _ in rows]
@@ -0,0 +1,89 @@
+# backend/app/services/locking_service.py
+
+import logging
+import zlib
+from contextlib import contextmanager
+
+import redis
+
+from app import db
+from . import redis_service
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_email(email):
+    """Normalizes an email the same way the parser and the candidate routes store it."""
+    if not email or not isinstance(email, str):
+        return None
+    return email.lower().strip() or None
+
+
+def _candidate_email_lock_keys(company_id: int, email: str):
+    """
+    Maps (company_id, normalized email) to the two int4 keys of pg_advisory_xact_lock.
+    The first key is the company id, the second a signed CRC32 of the email.
+    """
+    email_hash = zlib.crc32(email.encode('utf-8')) & 0xFFFFFFFF
+    if email_hash >= 2 ** 31:
+        email_hash -= 2 ** 32
+    return int(company_id), email_hash
+
+
+def lock_candidate_email(company_id: int, email: str) -> bool:
+    """
+    Takes a transaction-scoped advisory lock for (company_id, normalized email).
+
+    The lock is released automatically on commit or rollback, so callers must do the
+    "find existing candidate by email" lookup and the write that depends on it inside
+    the same transaction, after this call.
+
+    :return: True if the lock was taken, False if locking is not available (e.g. non-PostgreSQL engine).
+    """
+    normalized_email = normalize_email(email)
+    if company_id is None or not normalized_email:
+        return False
+
+    if db.engine.dialect.name != 'postgresql':
+        logger.debug(f"Advisory locks not supported on '{db.engine.dialect.name}'. Skipping email lock.")
+        return False
+
+    key_company, key_email = _candidate_email_lock_keys(company_id, normalized_email)
+    logger.debug(f"Acquiring advisory lock for company {company_id}, email '{normalized_email}' ({key_company}, {key_email}).")
+    db.session.execute(
+        db.text("SELECT pg_advisory_xact_lock(:key_company, :key_email)"),
+        {"key_company": key_company, "key_email": key_email}
+    )
+    return True
+
+
+TASK_RUN_LOCK_PREFIX = 'nexona:task_run_lock'
+
+
+@contextmanager
+def task_run_lock(task_name: str, timeout: float, redis_url: str = None):
+    """
+    Redis lock that keeps two runs of the same task from overlapping (e.g. a periodic task whose run
+    takes longer than its interval). Yields True if this run holds the lock, False if another run does.
+    The lock expires after `timeout` seconds, so it must be longer than the task's hard time limit.
+    If Redis is unavailable the run proceeds without the lock.
+    """
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        yield True
+        return
+    lock = redis_client.lock(f'{TASK_RUN_LOCK_PREFIX}:{task_name}', timeout=timeout, blocking=False)
+    try:
+        acquired = lock.acquire(blocking=False)
+    except redis.RedisError as redis_err:
+        logger.warning(f"Run lock for {task_name} unavailable ({redis_err}); running without it.")
+        yield True
+        return
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except (redis.exceptions.LockError, redis.RedisError):
+                pass  # Expired (or Redis gone) while we ran; nothing to release.
@@ -0,0 +1,217 @@
+# backend/app/services/mail_service.py
+# Pooled SMTP αποστολή: κάθε worker process κρατά ανοιχτές, authenticated συνδέσεις αντί για
+# connect/STARTTLS/LOGIN/QUIT ανά μήνυμα (αυτό κάνει το mail.send()).
+
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import current_app
+from flask_mail import BadHeaderError, Connection
+
+from app import mail
+
+logger = logging.getLogger(__name__)
+
+RESULT_SENT = 'sent'
+RESULT_FAILED = 'failed'  # Permanent: retrying the same message cannot succeed
+RESULT_RETRY = 'retry'    # Transient: connection/server trouble, worth another attempt later
+
+# Errors that mean "the connection is gone", not "this message is bad".
+_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError, TimeoutError)
+
+# Idle connections of this process: list of (flask_mail Connection, monotonic time it was last used).
+# A connection is checked out by one task at a time, so threads/greenlets of the same worker never share one.
+_idle_connections = []
+_pool_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return current_app.config.get('MAIL_POOL_SIZE', 4)
+
+
+def _idle_check_seconds() -> float:
+    return current_app.config.get('MAIL_POOL_IDLE_SECONDS', 30)
+
+
+def _timeout_seconds() -> float:
+    return current_app.config.get('MAIL_TIMEOUT_SECONDS', 10)
+
+
+class _TimeoutConnection(Connection):
+    """
+    flask_mail Connection whose SMTP socket has a timeout (flask_mail opens it without one, so a silent
+    server would block the task until the worker's time limit).
+    """
+
+    def __init__(self, mail_state, timeout):
+        super().__init__(mail_state)
+        self.timeout = timeout
+
+    def configure_host(self):
+        smtp_class = smtplib.SMTP_SSL if self.mail.use_ssl else smtplib.SMTP
+        host = smtp_class(self.mail.server, self.mail.port, timeout=self.timeout)
+        host.set_debuglevel(int(self.mail.debug))
+        if self.mail.use_tls:
+            host.starttls()
+        if self.mail.username and self.mail.password:
+            host.login(self.mail.username, self.mail.password)
+        return host
+
+
+def _open_connection():
+    """Opens (connect + STARTTLS + LOGIN) a flask_mail Connection; with MAIL_SUPPRESS_SEND it has no host."""
+    connection = _TimeoutConnection(mail.connect().mail, _timeout_seconds())
+    connection.__enter__()  # What `with mail.connect()` does on entry; the pool decides when to quit
+    return connection
+
+
+def _close_quietly(connection):
+    host = connection.host
+    connection.host = None
+    if host is None:
+        return
+    try:
+        host.quit()
+    except Exception:
+        try:
+            host.close()
+        except Exception:
+            pass
+
+
+def _reconnect(connection):
+    _close_quietly(connection)
+    connection.__enter__()
+
+
+def _is_alive(connection) -> bool:
+    if connection.host is None:
+        return connection.mail.suppress  # A suppressed connection has no host and is always "alive"
+    try:
+        return connection.host.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _checkout():
+    """An idle pooled connection (verified with NOOP if it sat idle for a while), or a new one."""
+    while True:
+        with _pool_lock:
+            if not _idle_connections:
+                break
+            connection, last_used = _idle_connections.pop()
+        if time.monotonic() - last_used < _idle_check_seconds() or _is_alive(connection):
+            return connection
+        _close_quietly(connection)  # Server dropped it (idle timeout); try the next one
+    return _open_connection()
+
+
+def _checkin(connection, healthy: bool):
+    if healthy and (connection.host is not None or connection.mail.suppress):
+        with _pool_lock:
+            if len(_idle_connections) < _pool_size():
+                _idle_connections.append((connection, time.monotonic()))
+                return
+    _close_quietly(connection)
+
+
+@contextmanager
+def pooled_connection():
+    """
+    Checks out a pooled SMTP connection for the duration of the block and returns it to the pool
+    afterwards (closed instead if the block failed with a connection-level error).
+    """
+    connection = _checkout()
+    healthy = True
+    try:
+        yield connection
+    except Exception as error:
+        healthy = not _is_connection_error(error)
+        raise
+    finally:
+        _checkin(connection, healthy)
+
+
+def _is_connection_error(error: Exception) -> bool:
+    if isinstance(error, _CONNECTION_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421  # "Service not available, closing transmission channel"
+    # smtplib errors subclass OSError too; only plain socket errors (DNS, reset, ...) count here
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+def is_permanent_error(error: Exception) -> bool:
+    """True for errors tied to the message itself (bad address/headers, 5xx replies)."""
+    if isinstance(error, (BadHeaderError, AssertionError, ValueError)):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        # {recipient: (code, reply)}: a 4xx (greylisting, mailbox busy) for any recipient is worth a retry
+        return all(500 <= code < 600 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+def _send_on(connection, message):
+    try:
+        connection.send(message)
+    except Exception as conn_err:
+        if not _is_connection_error(conn_err):
+            raise
+        # The pooled connection died between uses (or mid-batch): reconnect and try this message once more.
+        logger.info(f"SMTP connection lost ({conn_err!r}); reconnecting.")
+        _reconnect(connection)
+        connection.send(message)
+
+
+def send_message(message):
+    """Sends one flask_mail Message over a pooled connection (drop-in for mail.send). Raises on failure."""
+    with pooled_connection() as connection:
+        _send_on(connection, message)
+
+
+def send_messages(messages) -> list:
+    """
+    Sends the messages in order over one pooled connection. A failing message does not stop the others.
+    Returns one dict per message: {'status': RESULT_SENT | RESULT_FAILED | RESULT_RETRY, 'error': str | None}.
+    If the server becomes unreachable, the remaining messages are marked RESULT_RETRY without trying them.
+    """
+    results = []
+    try:
+        connection = _checkout()
+    except Exception as conn_err:
+        logger.error(f"Could not open an SMTP connection for a batch of {len(messages)}: {conn_err}")
+        return [{'status': RESULT_RETRY, 'error': str(conn_err)} for _ in messages]
+
+    healthy = True
+    try:
+        for index, message in enumerate(messages):
+            try:
+                _send_on(connection, message)
+                results.append({'status': RESULT_SENT, 'error': None})
+            except Exception as send_err:
+                if _is_connection_error(send_err):
+                    healthy = False
+                    logger.warning(f"SMTP connection failed at message {index + 1}/{len(messages)}: {send_err!r}")
+                    results.extend({'status': RESULT_RETRY, 'error': repr(send_err)} for _ in messages[index:])
+                    break
+                status = RESULT_FAILED if is_permanent_error(send_err) else RESULT_RETRY
+                logger.warning(f"Message {index + 1}/{len(messages)} to {getattr(message, 'recipients', None)} "
+                               f"not sent ({status}): {send_err!r}")
+                results.append({'status': status, 'error': repr(send_err)})
+    finally:
+        _checkin(connection, healthy)
+    return results
+
+
+def reset_mail_pool():
+    """Closes every pooled SMTP connection (freshly forked child, worker shutdown, tests)."""
+    with _pool_lock:
+        connections = [connection for connection, _ in _idle_connections]
+        _idle_connections.clear()
+    for connection in connections:
+        _close_quietly(connection)
@@ -0,0 +1,229 @@
+# backend/app/services/notification_service.py
+# In-app ειδοποιήσεις: εύρεση παραληπτών με ένα query, μαζική εισαγωγή στον πίνακα notifications και
+# cached μετρητής αδιάβαστων ανά χρήστη στο Redis.
+
+import logging
+from datetime import datetime, timezone as dt_timezone
+
+import redis
+from flask import current_app
+from sqlalchemy import and_, event, func, or_
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Notification, User
+from . import redis_service
+
+logger = logging.getLogger(__name__)
+
+# - Recipients of an interview response: the candidate's assigned interviewers, the user who moved the candidate
+#   to 'Interview' and the company admins (positions have no owner of their own). An interview nobody is assigned
+#   to notifies the whole recruiting team of the company. All of it is one query on users.
+# - Fan-out: one INSERT executed with the list of rows (executemany; psycopg2 batches it into multi-row VALUES).
+# - Unread counter: cached per user in Redis for NOTIFICATION_UNREAD_CACHE_SECONDS. A commit that adds or reads
+#   notifications bumps the affected users' generation and deletes their keys (one MULTI); the next read recounts
+#   from the partial unread index. A reader caches its count only if the generation it saw before counting is
+#   unchanged (WATCH), so a count taken before a commit is never written back after that commit's DEL.
+
+UNREAD_KEY_PREFIX = 'nexona:notifications:unread'
+UNREAD_GENERATION_KEY_PREFIX = 'nexona:notifications:unread_generation'
+PENDING_INVALIDATIONS_KEY = 'nexona_pending_unread_invalidations'
+RECRUITING_ROLES = ('user', 'company_admin')
+MAX_PAGE_SIZE = 100
+
+
+def _now():
+    return datetime.now(dt_timezone.utc)
+
+
+def _unread_key(user_id: int) -> str:
+    return f'{UNREAD_KEY_PREFIX}:{user_id}'
+
+
+def _generation_key(user_id: int) -> str:
+    return f'{UNREAD_GENERATION_KEY_PREFIX}:{user_id}'
+
+
+def _cache_seconds() -> int:
+    return current_app.config.get('NOTIFICATION_UNREAD_CACHE_SECONDS', 300)
+
+
+# --- Recipients ---
+
+def _interview_scheduler_id(candidate):
+    """Id of the user who last moved the candidate to 'Interview' (from the candidate's history), if any."""
+    for history_event in reversed(candidate.history or []):
+        if history_event.get('event_type') == 'status_change' and \
+                (history_event.get('details') or {}).get('new_status') == 'Interview':
+            actor_id = history_event.get('actor_id')
+            return actor_id if isinstance(actor_id, int) and not isinstance(actor_id, bool) else None
+    return None
+
+
+def resolve_interview_recipients(candidate) -> list:
+    """Active users to notify about the candidate's interview (ids), resolved in one query."""
+    interviewer_ids = candidate.get_interviewer_ids()
+    direct_ids = set(interviewer_ids)
+    scheduler_id = _interview_scheduler_id(candidate)
+    if scheduler_id is not None:
+        direct_ids.add(scheduler_id)
+
+    in_company = User.company_id == candidate.company_id
+    conditions = [and_(in_company, User.role == 'company_admin')]
+    if direct_ids:
+        # Assigned users of another company (stale assignment) are ignored; superadmins work across companies.
+        conditions.append(and_(User.id.in_(direct_ids), or_(in_company, User.role == 'superadmin')))
+    if not interviewer_ids:
+        conditions.append(and_(in_company, User.role.in_(RECRUITING_ROLES)))
+    rows = (db.session.query(User.id)
+            .filter(User.is_active.isnot(False), or_(*conditions))
+            .order_by(User.id)
+            .all())
+    return [user_id for user_id, in rows]
+
+
+# --- Fan-out ---
+
+def notify_users(user_ids, kind: str, title: str, body: str = None, company_id: int = None, candidate_id=None,
+                 data: dict = None, session=None) -> int:
+    """
+    Adds the same notification for every user in one bulk INSERT. Does not commit; the users' cached unread
+    counters are invalidated once the session commits.
+
+    :return: number of notifications inserted.
+    """
+    session = session or db.session()
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return 0
+    created_at = _now()
+    session.execute(Notification.__table__.insert(), [
+        {'user_id': user_id, 'company_id': company_id, 'kind': kind, 'candidate_id': candidate_id, 'title': title,
+         'body': body, 'data': data or None, 'is_read': False, 'created_at': created_at}
+        for user_id in user_ids
+    ])
+    _invalidate_after_commit(session, user_ids)
+    return len(user_ids)
+
+
+def notify_interview_response(candidate, kind: str, session=None) -> int:
+    """Notifies the candidate's recruiters that the candidate confirmed/declined the interview. Does not commit."""
+    candidate_name = candidate.get_full_name()
+    interview_time = candidate.interview_datetime.astimezone(dt_timezone.utc).strftime('%d/%m/%Y %H:%M UTC') \
+        if candidate.interview_datetime else 'N/A'
+    if kind == Notification.KIND_INTERVIEW_CONFIRMED:
+        title = f"{candidate_name}: επιβεβαίωσε τη συνέντευξη"
+        body = f"Ο/Η {candidate_name} επιβεβαίωσε την παρουσία στη συνέντευξη της {interview_time}."
+    else:
+        title = f"{candidate_name}: αδυναμία παρουσίας / αίτημα αλλαγής"
+        body = f"Ο/Η {candidate_name} δήλωσε αδυναμία για τη συνέντευξη της {interview_time} ή ζήτησε αλλαγή."
+    return notify_users(
+        resolve_interview_recipients(candidate), kind, title, body,
+        company_id=candidate.company_id, candidate_id=candidate.candidate_id,
+        data={'candidate_name': candidate_name,
+              'interview_datetime': candidate.interview_datetime.isoformat() if candidate.interview_datetime else None,
+              'interview_location': candidate.interview_location,
+              'confirmation_status': candidate.candidate_confirmation_status},
+        session=session)
+
+
+# --- Reading ---
+
+def list_notifications(user_id: int, unread_only: bool = False, limit: int = 20, before_id: int = None) -> list:
+    """The user's notifications, newest first; `before_id` continues from the last id of the previous page."""
+    query = Notification.query.filter(Notification.user_id == user_id)
+    if unread_only:
+        query = query.filter(Notification.is_read.is_(False))
+    if before_id is not None:
+        query = query.filter(Notification.id < before_id)
+    return query.order_by(Notification.id.desc()).limit(min(max(limit, 1), MAX_PAGE_SIZE)).all()
+
+
+def _count_unread(user_id: int) -> int:
+    return db.session.query(func.count(Notification.id)).filter(
+        Notification.user_id == user_id, Notification.is_read.is_(False)).scalar() or 0
+
+
+def _cache_unread_count(redis_client, user_id: int, generation, count: int):
+    """Caches `count` unless a commit changed the user's notifications since `generation` was read."""
+    generation_key = _generation_key(user_id)
+    with redis_client.pipeline() as pipe:
+        try:
+            pipe.watch(generation_key)
+            if pipe.get(generation_key) != generation:
+                return  # Counted before a commit that has since invalidated the key
+            pipe.multi()
+            pipe.set(_unread_key(user_id), count, ex=_cache_seconds())
+            pipe.execute()
+        except redis.WatchError:
+            pass  # Same: a commit bumped the generation while we were about to cache
+
+
+def get_unread_count(user_id: int) -> int:
+    """The user's unread count from the Redis cache; recounted from the database (and cached) on a miss."""
+    redis_client = redis_service.get_redis_client()
+    if redis_client is None:
+        return _count_unread(user_id)
+    try:
+        cached, generation = redis_client.mget(_unread_key(user_id), _generation_key(user_id))
+        if cached is not None:
+            return int(cached)
+    except redis.RedisError as redis_err:
+        logger.warning(f"Could not read cached unread count of user {user_id}: {redis_err}")
+        return _count_unread(user_id)
+
+    count = _count_unread(user_id)
+    try:
+        _cache_unread_count(redis_client, user_id, generation, count)
+    except redis.RedisError as redis_err:
+        logger.warning(f"Could not cache unread count of user {user_id}: {redis_err}")
+    return count
+
+
+def mark_read(user_id: int, notification_ids=None, session=None) -> int:
+    """
+    Marks the user's notifications (all unread ones if `notification_ids` is None) as read in one UPDATE.
+    Does not commit.
+
+    :return: number of notifications marked.
+    """
+    session = session or db.session()
+    query = session.query(Notification).filter(Notification.user_id == user_id, Notification.is_read.is_(False))
+    if notification_ids is not None:
+        query = query.filter(Notification.id.in_(notification_ids))
+    marked = query.update({Notification.is_read: True, Notification.read_at: _now()}, synchronize_session=False)
+    if marked:
+        _invalidate_after_commit(session, [user_id])
+    return marked
+
+
+# --- Cache invalidation after commit ---
+
+def _invalidate_after_commit(session, user_ids):
+    session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_unread_counters(session):
+    user_ids = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    if not user_ids:
+        return
+    redis_client = redis_service.get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        pipe = redis_client.pipeline()  # MULTI: readers never see a new generation with the old count
+        for user_id in user_ids:
+            pipe.incr(_generation_key(user_id))
+            pipe.expire(_generation_key(user_id), _cache_seconds())
+        pipe.delete(*(_unread_key(user_id) for user_id in user_ids))
+        pipe.execute()
+    except redis.RedisError as redis_err:
+        # The counters correct themselves when their keys expire.
+        logger.warning(f"Could not invalidate the unread counters of {len(user_ids)} user(s): {redis_err}")
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_invalidations_after_rollback(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop(PENDING_INVALIDATIONS_KEY, None)
@@ -0,0 +1,419 @@
+# backend/app/services/parse_dispatch_service.py
+
+import json
+import logging
+import time
+
+import redis
+from flask import current_app
+
+from app import celery, db
+from app.celery_queues import CV_FETCH_QUEUE, CV_PARSE_QUEUE, get_queue_depth
+from app.models import CompanySettings
+from . import redis_service, cv_pipeline_service
+
+logger = logging.getLogger(__name__)
+
+# Fair-share scheduling for the CV pipeline.
+# Uploads are not published to the broker directly. Each company gets its own Redis list, and a single
+# dispatcher moves items into cv_fetch only while the broker backlog is below PARSE_DISPATCH_MAX_IN_FLIGHT.
+# The next company is picked by weighted fair queuing: every company has a virtual time that advances by
+# 1/weight per dispatched CV, and the company with the lowest virtual time goes next. A tenant that
+# bulk-imports 5,000 CVs therefore only ever competes for its share, not for the whole FIFO.
+#
+# On top of that there are two priority lanes. Interactive uploads (a recruiter waiting on the candidate
+# page) go to the high lane, bulk imports to the low lane. The dispatcher drains the high lane first but
+# hands at least PARSE_LOW_PRIORITY_MIN_SHARE of the dispatches to the low lane while it has work, so
+# imports keep moving. Each lane runs its own weighted fair queuing between companies.
+#
+# Dispatch is a reliable-queue hand-off: the entry is moved (LMOVE) from the company's list to an in-flight
+# list and removed from there only once its pipeline is published (or it is put back after a failed publish).
+# An entry left in flight by a dispatcher that died in between is re-queued by a later dispatcher run once it
+# is older than IN_FLIGHT_STALE_SECONDS. A CV may then be dispatched twice; the pipeline's CvParseJob record
+# makes the second run a no-op.
+
+KEY_PREFIX = 'nexona:parse_fair'
+PRIORITY_HIGH = 'high'
+PRIORITY_LOW = 'low'
+PRIORITY_LANES = (PRIORITY_HIGH, PRIORITY_LOW)
+# Broker message priority per lane (Redis transport: lower number is served first) for what is
+# already inside the pipeline queues.
+BROKER_PRIORITY = {PRIORITY_HIGH: 0, PRIORITY_LOW: 6}
+
+LOW_LANE_CREDIT_KEY = f'{KEY_PREFIX}:low_credit'   # Accumulated low-lane share not yet used
+DISPATCH_LOCK_KEY = f'{KEY_PREFIX}:dispatch_lock'
+DISPATCH_LOCK_TIMEOUT = 60
+IN_FLIGHT_KEY = f'{KEY_PREFIX}:in_flight'              # LIST of entries popped but not yet published
+IN_FLIGHT_SINCE_KEY = f'{KEY_PREFIX}:in_flight_since'  # HASH entry -> when it was popped
+IN_FLIGHT_STALE_SECONDS = 2 * DISPATCH_LOCK_TIMEOUT  # By then the dispatcher that popped it is gone
+DISPATCH_KICK_KEY = f'{KEY_PREFIX}:kick'
+DISPATCH_TASK = 'tasks.parsing.dispatch_parse_queue'
+DISPATCH_RATE_KEY_TTL = 900  # Per-minute dispatch counters (drain-rate estimate for upload admission control)
+
+
+def _active_companies_key(lane) -> str:
+    """ZSET company_id -> virtual time (only companies with pending CVs in this lane)."""
+    return f'{KEY_PREFIX}:{lane}:active'
+
+
+def _virtual_time_key(lane) -> str:
+    """HASH company_id -> last virtual time in this lane (kept while the company is idle)."""
+    return f'{KEY_PREFIX}:{lane}:vtime'
+
+
+def _company_queue_key(company_id, lane) -> str:
+    return f'{KEY_PREFIX}:{lane}:queue:{company_id}'
+
+
+def _company_stats_key(company_id, lane) -> str:
+    return f'{KEY_PREFIX}:{lane}:stats:{company_id}'
+
+
+def _dispatch_rate_key(minute: int) -> str:
+    return f'{KEY_PREFIX}:dispatched_per_minute:{minute}'
+
+
+def is_enabled() -> bool:
+    return bool(current_app.config.get('PARSE_FAIR_SHARE_ENABLED', True))
+
+
+def submit_cv_parse(placeholder_candidate_id: str, s3_file_key: str, company_id: int, priority: str = PRIORITY_HIGH):
+    """
+    Queues a CV for parsing in the company's fair-share sub-queue of the given lane and wakes the dispatcher.
+    Falls back to publishing the pipeline directly if fair-share is disabled or Redis is unavailable.
+
+    :param priority: PRIORITY_HIGH for interactive uploads, PRIORITY_LOW for bulk/import paths.
+    """
+    if priority not in PRIORITY_LANES:
+        raise ValueError(f"Unknown parse priority '{priority}'.")
+    broker_priority = BROKER_PRIORITY[priority]
+
+    redis_client = redis_service.get_redis_client() if is_enabled() else None
+    if redis_client is None:
+        return cv_pipeline_service.enqueue_cv_parse(placeholder_candidate_id, s3_file_key, company_id,
+                                                    priority=broker_priority)
+
+    entry = json.dumps({
+        'placeholder_candidate_id': str(placeholder_candidate_id),
+        's3_file_key': s3_file_key,
+        'company_id': company_id,
+        'priority': priority,
+        'enqueued_at': time.time(),
+    })
+    try:
+        _push_entry(redis_client, company_id, entry, priority)
+    except redis.RedisError as redis_err:
+        logger.warning(f"Fair-share queue unavailable ({redis_err}). Publishing CV pipeline for {placeholder_candidate_id} directly.")
+        return cv_pipeline_service.enqueue_cv_parse(placeholder_candidate_id, s3_file_key, company_id,
+                                                    priority=broker_priority)
+
+    logger.info(f"CV {placeholder_candidate_id} queued in {priority}-priority sub-queue of company {company_id}.")
+    kick_dispatcher(redis_client)
+    return None
+
+
+def _push_entry(redis_client, company_id, entry: str, lane: str, at_head: bool = False):
+    """Appends (or with at_head, prepends) to the company's sub-queue and (re)activates the company in the lane."""
+    min_active = redis_client.zrange(_active_companies_key(lane), 0, 0, withscores=True)
+    # A company that was idle re-joins at the current minimum virtual time: it neither jumps ahead of
+    # the active companies nor pays for the time it was idle.
+    floor_vtime = min_active[0][1] if min_active else 0.0
+    last_vtime = redis_client.hget(_virtual_time_key(lane), company_id)
+    join_vtime = max(floor_vtime, float(last_vtime) if last_vtime else 0.0)
+
+    pipe = redis_client.pipeline()
+    if at_head:
+        pipe.lpush(_company_queue_key(company_id, lane), entry)
+    else:
+        pipe.rpush(_company_queue_key(company_id, lane), entry)
+    pipe.zadd(_active_companies_key(lane), {str(company_id): join_vtime}, nx=True)
+    pipe.execute()
+
+
+def kick_dispatcher(redis_client=None):
+    """Schedules a dispatcher run, at most one per second (debounced through a short-lived Redis key)."""
+    redis_client = redis_client or redis_service.get_redis_client()
+    if redis_client is None:
+        return
+    try:
+        if redis_client.set(DISPATCH_KICK_KEY, 1, nx=True, ex=1):
+            celery.send_task(DISPATCH_TASK, ignore_result=True)
+    except redis.RedisError as redis_err:
+        logger.warning(f"Could not kick fair-share dispatcher: {redis_err}. The periodic run will pick the CVs up.")
+
+
+def get_broker_queue_depth(queue_name: str) -> int:
+    """Number of messages waiting in a broker queue (not yet reserved by a worker)."""
+    return get_queue_depth(celery, queue_name)
+
+
+def get_pipeline_backlog() -> int:
+    """Messages waiting in the broker queues of the CV pipeline (dispatched, not yet picked up by a worker)."""
+    return get_broker_queue_depth(CV_FETCH_QUEUE) + get_broker_queue_depth(CV_PARSE_QUEUE)
+
+
+def _get_company_weights(company_ids) -> dict:
+    if not company_ids:
+        return {}
+    rows = db.session.query(CompanySettings.company_id, CompanySettings.parse_queue_weight).filter(
+        CompanySettings.company_id.in_(company_ids)).all()
+    return {company_id: max(weight or 1, 1) for company_id, weight in rows}
+
+
+def _choose_lane(redis_client, low_min_share: float):
+    """
+    High lane first, but every dispatch earns the low lane low_min_share of a credit; a full credit
+    is spent on a low-priority CV. Credit only accumulates while the low lane has work, so it
+    cannot build up into a burst after a quiet period.
+    """
+    high_pending = redis_client.zcard(_active_companies_key(PRIORITY_HIGH)) > 0
+    low_pending = redis_client.zcard(_active_companies_key(PRIORITY_LOW)) > 0
+    if not low_pending:
+        redis_client.delete(LOW_LANE_CREDIT_KEY)
+        return PRIORITY_HIGH if high_pending else None
+    if not high_pending:
+        return PRIORITY_LOW
+
+    credit = redis_client.incrbyfloat(LOW_LANE_CREDIT_KEY, low_min_share)
+    if credit >= 1.0:
+        redis_client.incrbyfloat(LOW_LANE_CREDIT_KEY, -1.0)
+        return PRIORITY_LOW
+    return PRIORITY_HIGH
+
+
+def _pop_next_in_lane(redis_client, lane: str, weights: dict):
+    """
+    Weighted fair queuing between the companies of one lane. The entry is moved to the in-flight list; the caller
+    calls _ack_in_flight() once it is published, or undo() to put it back. Returns (raw_entry, undo) or (None, None).
+    """
+    active_key = _active_companies_key(lane)
+    while True:
+        next_company = redis_client.zrange(active_key, 0, 0, withscores=True)
+        if not next_company:
+            return None, None
+        company_key, vtime = next_company[0]
+        company_id = int(company_key)
+        queue_key = _company_queue_key(company_id, lane)
+
+        raw_entry = redis_client.lmove(queue_key, IN_FLIGHT_KEY, 'LEFT', 'RIGHT')
+        if raw_entry is None:
+            redis_client.zrem(active_key, company_key)
+            continue
+
+        new_vtime = vtime + 1.0 / weights.get(company_id, 1)
+        pipe = redis_client.pipeline()
+        pipe.hset(IN_FLIGHT_SINCE_KEY, raw_entry, time.time())
+        pipe.hset(_virtual_time_key(lane), company_id, new_vtime)
+        if redis_client.llen(queue_key):
+            pipe.zadd(active_key, {company_key: new_vtime})
+        else:
+            pipe.zrem(active_key, company_key)
+        pipe.execute()
+
+        def undo():
+            # Put it back at the head of the company's queue; the next run retries it.
+            pipe = redis_client.pipeline()
+            pipe.lpush(queue_key, raw_entry)
+            pipe.zadd(active_key, {company_key: vtime})
+            pipe.lrem(IN_FLIGHT_KEY, 1, raw_entry)
+            pipe.hdel(IN_FLIGHT_SINCE_KEY, raw_entry)
+            pipe.execute()
+
+        return raw_entry, undo
+
+
+def _ack_in_flight(redis_client, raw_entry):
+    """Drops a published entry from the in-flight list."""
+    pipe = redis_client.pipeline()
+    pipe.lrem(IN_FLIGHT_KEY, 1, raw_entry)
+    pipe.hdel(IN_FLIGHT_SINCE_KEY, raw_entry)
+    pipe.execute()
+
+
+def _requeue_stale_in_flight(redis_client) -> int:
+    """
+    Puts entries that have been in flight for IN_FLIGHT_STALE_SECONDS back at the head of their company's
+    sub-queue: the dispatcher that popped them died before publishing or putting them back. Runs under the
+    dispatch lock. Returns the number of entries re-queued.
+    """
+    raw_entries = redis_client.lrange(IN_FLIGHT_KEY, 0, -1)
+    if not raw_entries:
+        return 0
+    now = time.time()
+    requeued = 0
+    for raw_entry, popped_at in zip(raw_entries, redis_client.hmget(IN_FLIGHT_SINCE_KEY, raw_entries)):
+        if popped_at is None:
+            # Its dispatcher died between the move and recording the time: start the clock now.
+            redis_client.hsetnx(IN_FLIGHT_SINCE_KEY, raw_entry, now)
+            continue
+        if now - float(popped_at) < IN_FLIGHT_STALE_SECONDS:
+            continue
+        entry = json.loads(raw_entry)
+        lane = entry.get('priority') if entry.get('priority') in PRIORITY_LANES else PRIORITY_HIGH
+        _push_entry(redis_client, entry['company_id'], raw_entry, lane, at_head=True)
+        _ack_in_flight(redis_client, raw_entry)
+        requeued += 1
+        logger.warning(f"CV {entry['placeholder_candidate_id']} was left in flight by a stopped dispatcher; "
+                       f"re-queued in the {lane}-priority sub-queue of company {entry['company_id']}.")
+    return requeued
+
+
+def dispatch_pending() -> int:
+    """
+    Moves queued CVs from the per-company sub-queues into the CV pipeline (high lane first with a
+    low-lane floor, weighted round-robin between companies inside each lane) until the pipeline
+    backlog reaches PARSE_DISPATCH_MAX_IN_FLIGHT. Only one dispatcher runs at a time.
+
+    :return: number of CVs dispatched.
+    """
+    redis_client = redis_service.get_redis_client()
+    if redis_client is None:
+        return 0
+
+    lock = redis_client.lock(DISPATCH_LOCK_KEY, timeout=DISPATCH_LOCK_TIMEOUT, blocking=False)
+    if not lock.acquire():
+        logger.debug("Fair-share dispatcher already running elsewhere. Skipping.")
+        return 0
+
+    dispatched = 0
+    try:
+        _requeue_stale_in_flight(redis_client)
+        max_in_flight = current_app.config.get('PARSE_DISPATCH_MAX_IN_FLIGHT', 16)
+        low_min_share = current_app.config.get('PARSE_LOW_PRIORITY_MIN_SHARE', 0.2)
+        budget = max_in_flight - get_pipeline_backlog()
+        if budget <= 0:
+            return 0
+
+        active_company_ids = set()
+        for lane in PRIORITY_LANES:
+            active_company_ids.update(int(cid) for cid in redis_client.zrange(_active_companies_key(lane), 0, -1))
+        weights = _get_company_weights(list(active_company_ids))
+        db.session.close()
+
+        while budget > 0:
+            lane = _choose_lane(redis_client, low_min_share)
+            if lane is None:
+                break
+            raw_entry, undo = _pop_next_in_lane(redis_client, lane, weights)
+            if raw_entry is None:
+                continue
+
+            entry = json.loads(raw_entry)
+            try:
+                cv_pipeline_service.enqueue_cv_parse(entry['placeholder_candidate_id'], entry['s3_file_key'],
+                                                     entry['company_id'], priority=BROKER_PRIORITY[lane])
+            except Exception as publish_err:
+                undo()
+                logger.error(f"Fair-share dispatch of {entry['placeholder_candidate_id']} failed: {publish_err}")
+                break
+
+            _ack_in_flight(redis_client, raw_entry)
+            _record_dispatch(redis_client, entry['company_id'], lane,
+                             time.time() - entry.get('enqueued_at', time.time()))
+            dispatched += 1
+            budget -= 1
+    finally:
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            pass  # Expired while we were dispatching; harmless.
+
+    if dispatched:
+        logger.info(f"Fair-share dispatcher moved {dispatched} CV(s) into the pipeline.")
+    return dispatched
+
+
+def _record_dispatch(redis_client, company_id: int, lane: str, wait_seconds: float):
+    stats_key = _company_stats_key(company_id, lane)
+    previous_max = redis_client.hget(stats_key, 'max_wait_seconds')
+    pipe = redis_client.pipeline()
+    pipe.hincrby(stats_key, 'dispatched', 1)
+    pipe.hincrbyfloat(stats_key, 'total_wait_seconds', wait_seconds)
+    pipe.hset(stats_key, 'last_wait_seconds', round(wait_seconds, 3))
+    pipe.hset(stats_key, 'last_dispatched_at', time.time())
+    if previous_max is None or wait_seconds > float(previous_max):
+        pipe.hset(stats_key, 'max_wait_seconds', round(wait_seconds, 3))
+    rate_key = _dispatch_rate_key(int(time.time() // 60))
+    pipe.incr(rate_key)
+    pipe.expire(rate_key, DISPATCH_RATE_KEY_TTL)
+    pipe.execute()
+
+
+def get_dispatch_rate_per_minute(redis_client=None, window_minutes: int = 5) -> float:
+    """CVs moved into the pipeline per minute, averaged over the last window_minutes full minutes."""
+    redis_client = redis_client or redis_service.get_redis_client()
+    if redis_client is None:
+        return 0.0
+    current_minute = int(time.time() // 60)
+    counts = redis_client.mget([_dispatch_rate_key(current_minute - i) for i in range(1, window_minutes + 1)])
+    return sum(int(count) for count in counts if count) / float(window_minutes)
+
+
+def get_pending_counts(redis_client=None, company_id: int = None) -> dict:
+    """CVs waiting in the fair-share sub-queues per lane: all companies, or only company_id."""
+    redis_client = redis_client or redis_service.get_redis_client()
+    if redis_client is None:
+        return {lane: 0 for lane in PRIORITY_LANES}
+    pending = {}
+    for lane in PRIORITY_LANES:
+        if company_id is not None:
+            pending[lane] = redis_client.llen(_company_queue_key(company_id, lane))
+        else:
+            company_ids = redis_client.zrange(_active_companies_key(lane), 0, -1)
+            pipe = redis_client.pipeline(transaction=False)
+            for cid in company_ids:
+                pipe.llen(_company_queue_key(int(cid), lane))
+            pending[lane] = sum(pipe.execute()) if company_ids else 0
+    return pending
+
+
+def _lane_metrics(redis_client, lane: str, now: float) -> dict:
+    company_ids = set()
+    for pattern in (f'{KEY_PREFIX}:{lane}:stats:*', f'{KEY_PREFIX}:{lane}:queue:*'):
+        for key in redis_client.scan_iter(match=pattern):
+            company_ids.add(int(key.decode().rsplit(':', 1)[1]))
+    active_vtimes = dict(redis_client.zrange(_active_companies_key(lane), 0, -1, withscores=True))
+    weights = _get_company_weights(list(company_ids))
+
+    companies = []
+    for company_id in sorted(company_ids):
+        queue_key = _company_queue_key(company_id, lane)
+        depth = redis_client.llen(queue_key)
+        oldest_raw = redis_client.lindex(queue_key, 0)
+        oldest_wait = round(now - json.loads(oldest_raw).get('enqueued_at', now), 3) if oldest_raw else 0.0
+        stats = {k.decode(): float(v) for k, v in redis_client.hgetall(_company_stats_key(company_id, lane)).items()}
+        dispatched = int(stats.get('dispatched', 0))
+        companies.append({
+            'company_id': company_id,
+            'weight': weights.get(company_id, 1),
+            'depth': depth,
+            'oldest_wait_seconds': oldest_wait,
+            'dispatched': dispatched,
+            'avg_wait_seconds': round(stats.get('total_wait_seconds', 0.0) / dispatched, 3) if dispatched else None,
+            'last_wait_seconds': stats.get('last_wait_seconds'),
+            'max_wait_seconds': stats.get('max_wait_seconds'),
+            'virtual_time': active_vtimes.get(str(company_id).encode()),
+        })
+    return {'total_depth': sum(c['depth'] for c in companies), 'companies': companies}
+
+
+def get_fair_share_metrics() -> dict:
+    """Per-lane, per-company sub-queue depth, oldest waiting CV and dispatch wait times, plus the pipeline backlog."""
+    redis_client = redis_service.get_redis_client()
+    if redis_client is None:
+        return {'enabled': False, 'lanes': {}}
+
+    now = time.time()
+    lanes = {lane: _lane_metrics(redis_client, lane, now) for lane in PRIORITY_LANES}
+    low_credit = redis_client.get(LOW_LANE_CREDIT_KEY)
+    return {
+        'enabled': is_enabled(),
+        'max_in_flight': current_app.config.get('PARSE_DISPATCH_MAX_IN_FLIGHT', 16),
+        'low_priority_min_share': current_app.config.get('PARSE_LOW_PRIORITY_MIN_SHARE', 0.2),
+        'low_priority_credit': float(low_credit) if low_credit else 0.0,
+        'in_flight': redis_client.llen(IN_FLIGHT_KEY),
+        'broker_backlog': {CV_FETCH_QUEUE: get_broker_queue_depth(CV_FETCH_QUEUE),
+                           CV_PARSE_QUEUE: get_broker_queue_depth(CV_PARSE_QUEUE)},
+        'total_depth': sum(lane_metrics['total_depth'] for lane_metrics in lanes.values()),
+        'lanes': lanes,
+    }
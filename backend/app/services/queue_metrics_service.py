@@ -0,0 +1,176 @@
+# backend/app/services/queue_metrics_service.py
+
+import json
+import logging
+import time
+
+import redis
+
+from . import redis_service
+
+logger = logging.getLogger(__name__)
+
+# Queue wait-time samples and autoscaler decisions, kept in Redis so every worker and the API see the same view.
+# These helpers take an explicit redis_url: they are called from Celery signal handlers and the autoscaler
+# thread, which run outside a Flask app context.
+
+KEY_PREFIX = 'nexona:queue_metrics'
+LATENCY_SAMPLES = 200                 # Last N wait-time samples per queue
+AUTOSCALE_DECISIONS_KEY = f'{KEY_PREFIX}:autoscale:decisions'
+AUTOSCALE_DECISIONS_KEPT = 1000
+AUTOSCALE_WORKER_STATE_TTL = 300      # A worker that stopped reporting disappears after 5 minutes
+BEAT_LEADER_KEY = f'{KEY_PREFIX}:beat:leader'
+BEAT_ENTRY_STATS_PREFIX = f'{KEY_PREFIX}:beat:entry'
+TASK_OVERLAP_PREFIX = f'{KEY_PREFIX}:overlap_skips'
+
+
+def _latency_key(queue_name: str) -> str:
+    return f'{KEY_PREFIX}:latency:{queue_name}'
+
+
+def _autoscale_worker_key(hostname: str) -> str:
+    return f'{KEY_PREFIX}:autoscale:worker:{hostname}'
+
+
+def record_queue_latency(redis_url: str, queue_name: str, wait_seconds: float):
+    """Stores how long a task waited in its queue (publish -> start). Never raises."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None or not queue_name:
+        return
+    sample = json.dumps([round(time.time(), 3), round(max(wait_seconds, 0.0), 3)])
+    try:
+        pipe = redis_client.pipeline()
+        pipe.lpush(_latency_key(queue_name), sample)
+        pipe.ltrim(_latency_key(queue_name), 0, LATENCY_SAMPLES - 1)
+        pipe.execute()
+    except redis.RedisError as redis_err:
+        logger.debug(f"Could not record latency for queue {queue_name}: {redis_err}")
+
+
+def get_queue_latency_stats(redis_url: str, queue_name: str, max_age_seconds: float = 300) -> dict:
+    """p50/p95/max of the recent wait-time samples of a queue (samples older than max_age_seconds are ignored)."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return {'samples': 0}
+    try:
+        raw_samples = redis_client.lrange(_latency_key(queue_name), 0, LATENCY_SAMPLES - 1)
+    except redis.RedisError as redis_err:
+        logger.debug(f"Could not read latency for queue {queue_name}: {redis_err}")
+        return {'samples': 0}
+
+    cutoff = time.time() - max_age_seconds
+    waits = sorted(wait for sampled_at, wait in (json.loads(s) for s in raw_samples) if sampled_at >= cutoff)
+    if not waits:
+        return {'samples': 0}
+    return {
+        'samples': len(waits),
+        'p50_seconds': waits[len(waits) // 2],
+        'p95_seconds': waits[min(len(waits) - 1, int(len(waits) * 0.95))],
+        'max_seconds': waits[-1],
+    }
+
+
+def publish_autoscale_state(redis_url: str, hostname: str, state: dict, decision: dict = None):
+    """Latest autoscaler evaluation of a worker, plus the decision log when it actually scaled. Never raises."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        pipe.set(_autoscale_worker_key(hostname), json.dumps(state), ex=AUTOSCALE_WORKER_STATE_TTL)
+        if decision:
+            pipe.lpush(AUTOSCALE_DECISIONS_KEY, json.dumps(decision))
+            pipe.ltrim(AUTOSCALE_DECISIONS_KEY, 0, AUTOSCALE_DECISIONS_KEPT - 1)
+        pipe.execute()
+    except redis.RedisError as redis_err:
+        logger.debug(f"Could not publish autoscale state for {hostname}: {redis_err}")
+
+
+def get_autoscaler_metrics(redis_url: str, decisions_limit: int = 100) -> dict:
+    """Current state of every autoscaling worker and the most recent scaling decisions."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return {'workers': [], 'decisions': []}
+    workers = []
+    for key in redis_client.scan_iter(match=_autoscale_worker_key('*')):
+        raw_state = redis_client.get(key)
+        if raw_state:
+            workers.append(json.loads(raw_state))
+    decisions = [json.loads(d) for d in redis_client.lrange(AUTOSCALE_DECISIONS_KEY, 0, decisions_limit - 1)]
+    return {'workers': sorted(workers, key=lambda w: w.get('hostname', '')), 'decisions': decisions}
+
+
+def publish_beat_leader(redis_url: str, instance_id: str, ttl_seconds: float, elected: bool = False):
+    """Which beat instance is the leader (expires with its lock). Never raises."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hset(BEAT_LEADER_KEY, mapping={'instance_id': instance_id, 'renewed_at': time.time()})
+        if elected:
+            pipe.hset(BEAT_LEADER_KEY, 'elected_at', time.time())
+            pipe.hincrby(BEAT_LEADER_KEY, 'elections', 1)
+        pipe.expire(BEAT_LEADER_KEY, int(ttl_seconds) * 10)
+        pipe.execute()
+    except redis.RedisError as redis_err:
+        logger.debug(f"Could not publish beat leader {instance_id}: {redis_err}")
+
+
+def record_beat_dispatch(redis_url: str, entry_name: str, lag_seconds: float, instance_id: str):
+    """Schedule lag of one periodic send (how long after its due time the entry was sent). Never raises."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return
+    stats_key = f'{BEAT_ENTRY_STATS_PREFIX}:{entry_name}'
+    try:
+        previous_max = redis_client.hget(stats_key, 'max_lag_seconds')
+        pipe = redis_client.pipeline()
+        pipe.hincrby(stats_key, 'sent', 1)
+        pipe.hincrbyfloat(stats_key, 'total_lag_seconds', lag_seconds)
+        pipe.hset(stats_key, mapping={'last_lag_seconds': round(lag_seconds, 3), 'last_sent_at': time.time(),
+                                      'last_sent_by': instance_id})
+        if previous_max is None or lag_seconds > float(previous_max):
+            pipe.hset(stats_key, 'max_lag_seconds', round(lag_seconds, 3))
+        pipe.execute()
+    except redis.RedisError as redis_err:
+        logger.debug(f"Could not record beat lag for {entry_name}: {redis_err}")
+
+
+def record_overlap_skip(redis_url: str, task_name: str):
+    """Counts a run of a non-overlapping task that was skipped because the previous run still held the lock."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return
+    try:
+        redis_client.hincrby(TASK_OVERLAP_PREFIX, task_name, 1)
+    except redis.RedisError as redis_err:
+        logger.debug(f"Could not record overlap skip of {task_name}: {redis_err}")
+
+
+def get_beat_metrics(redis_url: str, beat_schedule: dict) -> dict:
+    """Current beat leader, per-entry send count and schedule lag, and skipped overlapping runs per task."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return {'leader': None, 'entries': {}, 'overlap_skips': {}}
+
+    def _decode(mapping):
+        return {k.decode(): v.decode() for k, v in mapping.items()}
+
+    leader = _decode(redis_client.hgetall(BEAT_LEADER_KEY)) or None
+    overlap_skips = {k: int(v) for k, v in _decode(redis_client.hgetall(TASK_OVERLAP_PREFIX)).items()}
+    entries = {}
+    for entry_name, entry in (beat_schedule or {}).items():
+        stats = _decode(redis_client.hgetall(f'{BEAT_ENTRY_STATS_PREFIX}:{entry_name}'))
+        sent = int(stats.get('sent', 0))
+        entries[entry_name] = {
+            'task': entry.get('task'),
+            'sent': sent,
+            'avg_lag_seconds': round(float(stats['total_lag_seconds']) / sent, 3) if sent else None,
+            'last_lag_seconds': float(stats['last_lag_seconds']) if 'last_lag_seconds' in stats else None,
+            'max_lag_seconds': float(stats['max_lag_seconds']) if 'max_lag_seconds' in stats else None,
+            'last_sent_at': float(stats['last_sent_at']) if 'last_sent_at' in stats else None,
+            'last_sent_by': stats.get('last_sent_by'),
+            'overlap_skips': overlap_skips.get(entry.get('task'), 0),
+        }
+    return {'leader': leader, 'entries': entries, 'overlap_skips': overlap_skips}
@@ -0,0 +1,41 @@
+# backend/app/services/redis_service.py
+
+import logging
+
+import redis
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# One client (and connection pool) per process and URL. redis-py clients are thread-safe.
+_redis_clients = {}
+
+
+def get_redis_client(redis_url: str = None):
+    """
+    Returns a shared Redis client for the configured REDIS_URL (defaults to the Celery broker).
+    Code that runs outside a Flask app context (Celery signal handlers, the autoscaler) passes the URL explicitly.
+
+    :return: redis.Redis instance, or None if REDIS_URL is not configured.
+    """
+    redis_url = redis_url or current_app.config.get('REDIS_URL')
+    if not redis_url:
+        logger.error("REDIS_URL configuration is missing.")
+        return None
+
+    client = _redis_clients.get(redis_url)
+    if client is None:
+        client = redis.Redis.from_url(redis_url, socket_timeout=5, socket_connect_timeout=5)
+        _redis_clients[redis_url] = client
+        logger.info("Redis client created for app services.")
+    return client
+
+
+def reset_redis_clients():
+    """Drops the cached clients and their connection pools (worker process shutdown)."""
+    for client in list(_redis_clients.values()):
+        try:
+            client.close()
+        except redis.RedisError:
+            pass
+    _redis_clients.clear()
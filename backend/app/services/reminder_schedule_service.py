@@ -0,0 +1,556 @@
+# backend/app/services/reminder_schedule_service.py
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from flask import current_app
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import contains_eager
+
+from app import db
+from app.models import (Candidate, CompanySettings, InterviewReminder, Position, SentReminder, User,
+                        candidate_position_association)
+from . import email_outbox_service, task_publish_service
+
+logger = logging.getLogger(__name__)
+
+# Interview reminders are precomputed into interview_reminders (one row per candidate + recipient, due at
+# interview time - lead time) instead of being searched for every minute per user.
+# - Sync: the write paths that change an interview (time, status, company, interviewers) or a user's reminder
+#   settings call sync_changes() right before their commit, in the same transaction; a sync error fails that
+#   commit. Other commits never touch this table. rebuild_all_reminders() (hourly task and
+#   `flask reminders rebuild`) covers changes made outside those paths.
+# - Send: a row due within REMINDER_ETA_HORIZON_SECONDS is "armed": a send task is queued with eta=due_at,
+#   carrying the row's version. Rows further out are armed by arm_due_soon_reminders() (beat) as they enter the
+#   horizon, so no ETA message sits in the broker long enough to hit the Redis visibility timeout (redelivery).
+#   Moving or cancelling an interview bumps/deletes the row, which turns any queued task into a no-op; a
+#   lead-time change re-computes (and re-arms) all of that user's rows in one sync.
+# - Catch-up: the beat tick claims rows still pending REMINDER_CATCHUP_GRACE_SECONDS after due_at (lost or
+#   late ETA task) in batches with FOR UPDATE SKIP LOCKED, so its cost is O(overdue reminders).
+# - Exactly once: every dispatch inserts into the sent_reminders ledger (unique per candidate, interview time,
+#   user and kind), ON CONFLICT DO NOTHING; a sender that loses the insert does not send. The email itself is an
+#   email outbox row written in that same transaction, so a committed ledger row always has its email queued
+#   (delivered at least once by the outbox dispatcher, even if the broker is down at commit time).
+#   The sync consults the ledger too, so an interview moved back to an already-reminded time is not re-armed.
+# Recipients: active users with reminders enabled, a valid lead time and the feature enabled for their company.
+# An interview with interviewers assigned (Candidate.interviewers, user ids) reminds only those interviewers;
+# one without interviewers reminds every such user of the company plus the superadmins, as before
+# (unless REMINDER_UNASSIGNED_TO_COMPANY_USERS is off, then nobody).
+# Digest mode (User.interview_reminder_digest): the first reminder of such a user that comes due sends ONE email
+# listing every interview whose reminder falls within the user's digest window, and marks those rows sent. Only
+# that first row gets an ETA task; rows inside the window of an already armed row are marked "covered" (armed
+# without a task), so a busy recruiter costs one send task and one email per window. A covered row whose anchor
+# moves away is picked up by the catch-up claim, which delivers digests the same way.
+
+MIN_LEAD_TIME_MINUTES = 1
+MAX_LEAD_TIME_MINUTES = 2880
+SYNC_CHUNK_SIZE = 500
+SEND_REMINDER_TASK = 'tasks.reminders.send_interview_reminder'
+MIN_DIGEST_WINDOW_MINUTES = 15
+MAX_DIGEST_WINDOW_MINUTES = 2880
+
+
+def _now():
+    return datetime.now(dt_timezone.utc)
+
+
+def _chunks(values, size=SYNC_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def eta_horizon_seconds() -> int:
+    return current_app.config.get('REMINDER_ETA_HORIZON_SECONDS', 900)
+
+
+def claim_batch_size() -> int:
+    return current_app.config.get('REMINDER_CLAIM_BATCH_SIZE', 200)
+
+
+def is_interview_status(status) -> bool:
+    return bool(status) and 'interview' in status.lower()
+
+
+def _remind_unassigned() -> bool:
+    return current_app.config.get('REMINDER_UNASSIGNED_TO_COMPANY_USERS', True)
+
+
+def _is_global_recipient(user) -> bool:
+    return not user.company_id or user.role == 'superadmin'
+
+
+def digest_window(user):
+    """The user's digest window as a timedelta, or None if the user gets one email per interview."""
+    if not user.interview_reminder_digest:
+        return None
+    minutes = user.interview_reminder_digest_window_minutes or MAX_DIGEST_WINDOW_MINUTES // 4
+    return timedelta(minutes=min(max(minutes, MIN_DIGEST_WINDOW_MINUTES), MAX_DIGEST_WINDOW_MINUTES))
+
+
+def _eligible_recipients(session, company_ids, user_ids) -> list:
+    """Users that can receive reminders among: the users of these companies + the global users, and these ids."""
+    conditions = [User.id.in_(user_ids)] if user_ids else []
+    if company_ids:
+        conditions += [User.company_id.in_(company_ids), User.company_id.is_(None), User.role == 'superadmin']
+    if not conditions:
+        return []
+    users = session.query(User).filter(
+        User.enable_email_interview_reminders.is_(True),
+        User.is_active.is_(True),
+        User.email.isnot(None),
+        User.interview_reminder_lead_time_minutes.between(MIN_LEAD_TIME_MINUTES, MAX_LEAD_TIME_MINUTES),
+        or_(*conditions),
+    ).all()
+    user_company_ids = {user.company_id for user in users if user.company_id}
+    enabled_company_ids = {company_id for (company_id,) in session.query(CompanySettings.company_id).filter(
+        CompanySettings.company_id.in_(user_company_ids),
+        CompanySettings.enable_reminders_feature_for_company.is_(True))} if user_company_ids else set()
+    return [user for user in users if not user.company_id or user.company_id in enabled_company_ids]
+
+
+def _recipients_for(session, candidates) -> dict:
+    """candidate_id -> users to remind about that candidate's interview."""
+    remind_unassigned = _remind_unassigned()
+    unassigned_company_ids = {c.company_id for c in candidates if not c.get_interviewer_ids()} \
+        if remind_unassigned else set()
+    interviewer_ids = set().union(*(c.get_interviewer_ids() for c in candidates))
+    users = _eligible_recipients(session, unassigned_company_ids, interviewer_ids)
+    users_by_id = {user.id: user for user in users}
+    by_scope = {}
+    for user in users:
+        by_scope.setdefault(None if _is_global_recipient(user) else user.company_id, []).append(user)
+
+    recipients = {}
+    for candidate in candidates:
+        assigned = [users_by_id[user_id] for user_id in sorted(candidate.get_interviewer_ids()) if user_id in users_by_id]
+        if candidate.get_interviewer_ids():
+            # Interviewers from another company (stale assignment) are ignored.
+            recipients[candidate.candidate_id] = [user for user in assigned if _is_global_recipient(user)
+                                                  or user.company_id == candidate.company_id]
+        elif remind_unassigned:
+            recipients[candidate.candidate_id] = by_scope.get(candidate.company_id, []) + by_scope.get(None, [])
+    return recipients
+
+
+def sync_candidate_reminders(session, candidate_ids) -> dict:
+    """
+    Brings the reminder rows of these candidates in line with their interview and the recipients' settings.
+    Does not commit.
+
+    :return: dict with the number of rows created, updated, deleted and armed (ETA send task queued).
+    """
+    now = _now()
+    counts = {'created': 0, 'updated': 0, 'deleted': 0, 'armed': 0}
+    for chunk in _chunks(set(candidate_ids)):
+        candidates = session.query(Candidate).filter(Candidate.candidate_id.in_(chunk)).all()
+        upcoming = [candidate for candidate in candidates
+                    if candidate.interview_datetime and candidate.interview_datetime > now
+                    and is_interview_status(candidate.current_status)]
+        recipients = _recipients_for(session, upcoming) if upcoming else {}
+
+        desired = {}
+        for candidate in upcoming:
+            for user in recipients.get(candidate.candidate_id, []):
+                lead_time = user.interview_reminder_lead_time_minutes
+                desired[(candidate.candidate_id, user.id)] = (candidate.interview_datetime,
+                                                              candidate.interview_datetime - timedelta(minutes=lead_time),
+                                                              lead_time)
+
+        existing = {(row.candidate_id, row.user_id): row for row in
+                    session.query(InterviewReminder).filter(InterviewReminder.candidate_id.in_(chunk))}
+        already_sent = set(session.query(SentReminder.candidate_id, SentReminder.user_id,
+                                         SentReminder.interview_datetime).filter(
+            SentReminder.candidate_id.in_(chunk), SentReminder.kind == SentReminder.KIND_INTERVIEW_REMINDER,
+            SentReminder.interview_datetime > now))
+        changed = []
+        for key, row in existing.items():
+            if key not in desired and row.status == InterviewReminder.STATUS_PENDING:
+                session.delete(row)
+                counts['deleted'] += 1
+
+        for (candidate_id, user_id), (interview_datetime, due_at, lead_time) in desired.items():
+            row = existing.get((candidate_id, user_id))
+            if due_at <= now:
+                # The reminder moment has already passed (interview set at short notice, moved closer or lead
+                # time raised): nothing to send, and a pending row for the old timing must not fire either.
+                if row is not None and (row.status == InterviewReminder.STATUS_PENDING
+                                        or row.interview_datetime != interview_datetime):
+                    session.delete(row)
+                    counts['deleted'] += 1
+                continue
+            status = (InterviewReminder.STATUS_SENT if (candidate_id, user_id, interview_datetime) in already_sent
+                      else InterviewReminder.STATUS_PENDING)
+            if row is None:
+                row = InterviewReminder(candidate_id=candidate_id, user_id=user_id,
+                                        interview_datetime=interview_datetime, due_at=due_at,
+                                        lead_time_minutes=lead_time, status=status, version=1)
+                session.add(row)
+                counts['created'] += 1
+            elif row.interview_datetime != interview_datetime:
+                # Rescheduled: a new reminder for the new time, even if one was sent for the old time.
+                row.interview_datetime, row.due_at, row.lead_time_minutes = interview_datetime, due_at, lead_time
+                row.status, row.sent_at = status, None
+                row.version += 1
+                counts['updated'] += 1
+            elif row.status == InterviewReminder.STATUS_PENDING and row.due_at != due_at:
+                row.due_at, row.lead_time_minutes = due_at, lead_time
+                row.version += 1
+                counts['updated'] += 1
+            else:
+                continue
+            changed.append(row)
+
+        if changed:
+            session.flush()  # New rows need their ids for the send task
+            counts['armed'] += _arm(session, changed, now)
+    return counts
+
+
+def _candidate_ids_for_users(session, user_ids) -> set:
+    """Candidates whose reminders can change when these users' settings change."""
+    user_ids = sorted(user_ids)
+    candidate_ids = {candidate_id for (candidate_id,) in session.query(InterviewReminder.candidate_id).filter(
+        InterviewReminder.user_id.in_(user_ids), InterviewReminder.status == InterviewReminder.STATUS_PENDING)}
+    upcoming = session.query(Candidate.candidate_id).filter(Candidate.interview_datetime > _now())
+    # Interviews they are assigned to: one GIN-indexed containment test per user.
+    for chunk in _chunks(user_ids, size=50):
+        candidate_ids.update(candidate_id for (candidate_id,) in
+                             upcoming.filter(or_(*[Candidate.has_interviewer(user_id) for user_id in chunk])))
+    if _remind_unassigned():
+        # ...and the unassigned interviews of their company (of every company for superadmins).
+        unassigned = upcoming.filter(or_(Candidate.interviewers.is_(None), Candidate.interviewers == []))
+        users = session.query(User).filter(User.id.in_(user_ids)).all()
+        if any(_is_global_recipient(user) for user in users):
+            candidate_ids.update(candidate_id for (candidate_id,) in unassigned)
+        else:
+            company_ids = {user.company_id for user in users}
+            if company_ids:
+                candidate_ids.update(candidate_id for (candidate_id,) in
+                                     unassigned.filter(Candidate.company_id.in_(company_ids)))
+    return candidate_ids
+
+
+def _rearm_user_reminders(session, user_ids) -> int:
+    """Re-arms the users' pending reminders within the horizon (digest mode switched or window changed)."""
+    now = _now()
+    reminders = session.query(InterviewReminder).filter(
+        InterviewReminder.user_id.in_(user_ids), InterviewReminder.status == InterviewReminder.STATUS_PENDING,
+        InterviewReminder.due_at <= now + timedelta(seconds=eta_horizon_seconds())).all()
+    for reminder in reminders:
+        reminder.armed_version = None  # A task already queued for the same version finds the row handled: no-op
+    return _arm(session, reminders, now)
+
+
+def sync_reminders(session, candidate_ids=(), user_ids=(), company_ids=(), rearm_user_ids=()) -> dict:
+    """
+    Re-computes every reminder affected by changes to these candidates, users and company settings, and re-arms
+    the reminders of the users whose digest settings changed.
+    """
+    rearmed = _rearm_user_reminders(session, rearm_user_ids) if rearm_user_ids else 0
+    affected = set(candidate_ids)
+    if company_ids:
+        # A company's flag only concerns its own users, and they only get that company's interviews.
+        affected.update(candidate_id for (candidate_id,) in session.query(Candidate.candidate_id).filter(
+            Candidate.company_id.in_(company_ids), Candidate.interview_datetime > _now()))
+    if user_ids:
+        affected.update(_candidate_ids_for_users(session, user_ids))
+    counts = sync_candidate_reminders(session, affected) if affected else \
+        {'created': 0, 'updated': 0, 'deleted': 0, 'armed': 0}
+    counts['armed'] += rearmed
+    return counts
+
+
+def rebuild_all_reminders() -> dict:
+    """
+    Full reconciliation: re-computes the reminders of every upcoming interview and drops pending rows that no
+    longer apply. Fills the table after the migration and repairs anything changed outside the synced write paths.
+    """
+    session = db.session
+    candidate_ids = {candidate_id for (candidate_id,) in
+                     session.query(Candidate.candidate_id).filter(Candidate.interview_datetime > _now())}
+    candidate_ids.update(candidate_id for (candidate_id,) in session.query(InterviewReminder.candidate_id).filter(
+        InterviewReminder.status == InterviewReminder.STATUS_PENDING))
+    totals = {'candidates': len(candidate_ids), 'created': 0, 'updated': 0, 'deleted': 0, 'armed': 0}
+    for chunk in _chunks(candidate_ids):
+        counts = sync_candidate_reminders(session, chunk)
+        db.session.commit()
+        for key, value in counts.items():
+            totals[key] += value
+    logger.info(f"Interview reminders rebuilt: {totals}")
+    return totals
+
+
+def _digest_anchors(session, user_ids) -> tuple:
+    """(user_id -> digest window, user_id -> due_at of the user's pending rows that have a send task queued)."""
+    windows = {user.id: digest_window(user) for user in session.query(User).filter(
+        User.id.in_(user_ids), User.interview_reminder_digest.is_(True))}
+    anchors = {}
+    if windows:
+        for user_id, due_at in session.query(InterviewReminder.user_id, InterviewReminder.due_at).filter(
+                InterviewReminder.user_id.in_(windows), InterviewReminder.status == InterviewReminder.STATUS_PENDING,
+                InterviewReminder.armed_version == InterviewReminder.version):
+            anchors.setdefault(user_id, []).append(due_at)
+    return windows, anchors
+
+
+def _arm(session, reminders, now) -> int:
+    """
+    Queues an ETA send task (after commit) for every pending reminder due within the horizon. For digest users,
+    a reminder that falls within the window of one already armed is only marked covered (no task). Does not commit.
+    """
+    horizon = now + timedelta(seconds=eta_horizon_seconds())
+    to_arm = sorted((reminder for reminder in reminders
+                     if reminder.status == InterviewReminder.STATUS_PENDING and reminder.due_at <= horizon
+                     and reminder.armed_version != reminder.version), key=lambda reminder: reminder.due_at)
+    if not to_arm:
+        return 0
+    windows, anchors = _digest_anchors(session, {reminder.user_id for reminder in to_arm})
+    armed = 0
+    for reminder in to_arm:
+        window = windows.get(reminder.user_id)
+        if window is not None:
+            user_anchors = anchors.setdefault(reminder.user_id, [])
+            if any(anchor <= reminder.due_at <= anchor + window for anchor in user_anchors):
+                reminder.armed_version = reminder.version  # Collected by the digest of that anchor
+                continue
+            user_anchors.append(reminder.due_at)
+        task_publish_service.publish_after_commit(SEND_REMINDER_TASK, args=[reminder.id, reminder.version],
+                                                  session=session, eta=max(reminder.due_at, now))
+        reminder.armed_version = reminder.version
+        armed += 1
+    return armed
+
+
+def arm_due_soon_reminders(batch_size: int = None) -> dict:
+    """
+    Arms the pending reminders that have entered the ETA horizon and have no send task for their current version
+    (FOR UPDATE SKIP LOCKED, one batch). Commits.
+
+    :return: {'claimed': rows locked in this batch, 'armed': send tasks queued}. Rows covered by a digest are
+             claimed but not armed, so callers batch on 'claimed'.
+    """
+    now = _now()
+    reminders = (InterviewReminder.query
+                 .filter(InterviewReminder.status == InterviewReminder.STATUS_PENDING,
+                         InterviewReminder.due_at <= now + timedelta(seconds=eta_horizon_seconds()),
+                         or_(InterviewReminder.armed_version.is_(None),
+                             InterviewReminder.armed_version != InterviewReminder.version))
+                 .order_by(InterviewReminder.due_at)
+                 .limit(batch_size or claim_batch_size())
+                 .with_for_update(skip_locked=True)
+                 .all())
+    armed = _arm(db.session, reminders, now)
+    db.session.commit()
+    return {'claimed': len(reminders), 'armed': armed}
+
+
+def _record_sent(reminder, now) -> bool:
+    """Inserts the ledger row of this reminder; False if it was already dispatched (by any sender, ever)."""
+    sent_id = db.session.execute(
+        pg_insert(SentReminder.__table__).values(
+            candidate_id=reminder.candidate_id,
+            interview_datetime=reminder.interview_datetime,
+            user_id=reminder.user_id,
+            kind=SentReminder.KIND_INTERVIEW_REMINDER,
+            reminder_id=reminder.id,
+            sent_at=now,
+        ).on_conflict_do_nothing(constraint='uq_sent_reminders_candidate_interview_user_kind')
+        .returning(SentReminder.__table__.c.id)
+    ).scalar()
+    return sent_id is not None
+
+
+def _settle(reminder, candidate, user, now):
+    """
+    Closes a claimed reminder that must not be sent (expired, cancelled, or 'duplicate' if the ledger shows it
+    was already sent) and returns that outcome. Returns None if it is to be sent now: the ledger row is recorded
+    and the reminder marked sent, the caller enqueues the email in the same transaction.
+    """
+    if reminder.interview_datetime <= now:
+        reminder.status = InterviewReminder.STATUS_EXPIRED
+        return reminder.status
+    if (candidate is None or user is None or not user.email
+            or candidate.interview_datetime != reminder.interview_datetime
+            or not is_interview_status(candidate.current_status)):
+        reminder.status = InterviewReminder.STATUS_CANCELLED
+        return reminder.status
+    reminder.status = InterviewReminder.STATUS_SENT
+    if not _record_sent(reminder, now):
+        logger.info(f"Reminder {reminder.id}: already in the sent ledger, not sending it again.")
+        return 'duplicate'
+    reminder.sent_at = now
+    return None
+
+
+def _reminder_email_kwargs(candidate) -> dict:
+    return {
+        'candidate_name': candidate.get_full_name(),
+        'interview_datetime_iso': candidate.interview_datetime.isoformat(),
+        'interview_location': candidate.interview_location or "Not specified",
+    }
+
+
+def _deliver(reminder, candidate, user, now) -> str:
+    """
+    Marks one claimed reminder sent (recording it in the ledger and enqueueing its email in the outbox, same
+    transaction), expired or cancelled. Returns the outcome: the new status, or 'duplicate' if the ledger shows it
+    was already sent.
+    """
+    outcome = _settle(reminder, candidate, user, now)
+    if outcome is not None:
+        return outcome
+    email_outbox_service.enqueue_interview_reminder(user.email, _reminder_email_kwargs(candidate),
+                                                    company_id=candidate.company_id,
+                                                    candidate_id=candidate.candidate_id)
+    return reminder.status
+
+
+def _deliver_digest(user, now) -> dict:
+    """
+    Enqueues one digest email (outbox) for every pending reminder of a digest user due within the user's window, locking
+    them (SKIP LOCKED) and loading their candidates and positions in the same query. Does not commit.
+
+    :return: dict with the number of reminders sent, duplicate, expired and cancelled.
+    """
+    counts = {'sent': 0, 'duplicate': 0, 'expired': 0, 'cancelled': 0}
+    # One row per (reminder, position); Candidate.positions is a dynamic relationship, so the position names
+    # come from the outer join instead of an eager load.
+    rows = (db.session.query(InterviewReminder, Position.position_name)
+            .join(InterviewReminder.candidate)
+            .outerjoin(candidate_position_association,
+                       candidate_position_association.c.candidate_id == Candidate.candidate_id)
+            .outerjoin(Position, Position.position_id == candidate_position_association.c.position_id)
+            .options(contains_eager(InterviewReminder.candidate))
+            .filter(InterviewReminder.user_id == user.id,
+                    InterviewReminder.status == InterviewReminder.STATUS_PENDING,
+                    InterviewReminder.due_at <= now + digest_window(user))
+            .order_by(InterviewReminder.interview_datetime, InterviewReminder.id)
+            .with_for_update(of=InterviewReminder, skip_locked=True)
+            .all())
+    positions = {}
+    for reminder, position_name in rows:
+        names = positions.setdefault(reminder, [])
+        if position_name:
+            names.append(position_name)
+
+    interviews, candidates = [], []
+    for reminder, position_names in positions.items():
+        candidate = reminder.candidate
+        outcome = _settle(reminder, candidate, user, now)
+        if outcome is not None:
+            counts[outcome] += 1
+            continue
+        counts['sent'] += 1
+        interviews.append({**_reminder_email_kwargs(candidate), 'positions': position_names})
+        candidates.append(candidate)
+    if len(interviews) == 1:
+        # Same outbox row as a single reminder (_deliver): linked to the candidate and its company.
+        email_outbox_service.enqueue_interview_reminder(user.email, _reminder_email_kwargs(candidates[0]),
+                                                        company_id=candidates[0].company_id,
+                                                        candidate_id=candidates[0].candidate_id)
+    elif interviews:
+        # The interviews' company if they share one; a superadmin's digest can span companies, and then it
+        # belongs to none of them (default templates) rather than to the user's own company.
+        company_ids = {candidate.company_id for candidate in candidates}
+        email_outbox_service.enqueue_interview_reminder_digest(
+            user.email, interviews, company_id=company_ids.pop() if len(company_ids) == 1 else None)
+    if interviews:
+        logger.info(f"Reminder digest for user {user.id}: {len(interviews)} interview(s) in one email ({counts}).")
+    return counts
+
+
+def send_reminder(reminder_id: int, version: int) -> str:
+    """
+    Sends one reminder from its ETA task. A task whose row was deleted, re-versioned or already handled (by the
+    catch-up claim, or an earlier delivery of the same message) does nothing. Commits.
+
+    :return: the outcome of _deliver(), 'digest of N' for a digest user, or 'stale' / 'early'.
+    """
+    reminder = InterviewReminder.query.filter_by(id=reminder_id).with_for_update(skip_locked=True).first()
+    if reminder is None or reminder.version != version or reminder.status != InterviewReminder.STATUS_PENDING:
+        db.session.commit()
+        logger.debug(f"Reminder {reminder_id} v{version}: stale send task, nothing to do.")
+        return 'stale'
+    now = _now()
+    if reminder.due_at > now + timedelta(minutes=1):
+        # Delivered early (e.g. redelivered by the broker): leave it to a fresh arm near due_at.
+        reminder.armed_version = None
+        db.session.commit()
+        return 'early'
+    user = User.query.get(reminder.user_id)
+    if user is not None and user.interview_reminder_digest:
+        counts = _deliver_digest(user, now)
+        db.session.commit()
+        return f"digest of {counts['sent']}" if counts['sent'] else 'digest (nothing to send)'
+    status = _deliver(reminder, Candidate.query.get(reminder.candidate_id), user, now)
+    db.session.commit()
+    return status
+
+
+def claim_due_reminders(batch_size: int = None) -> dict:
+    """
+    Catch-up: claims up to batch_size reminders still pending REMINDER_CATCHUP_GRACE_SECONDS after they were due
+    (their ETA task was lost or is stuck behind a backlog), with FOR UPDATE SKIP LOCKED, and sends them. Commits.
+
+    :return: dict with the number of rows claimed, sent, duplicate (already in the ledger), expired and cancelled.
+    """
+    batch_size = batch_size or claim_batch_size()
+    now = _now()
+    overdue_before = now - timedelta(seconds=current_app.config.get('REMINDER_CATCHUP_GRACE_SECONDS', 120))
+    reminders = (InterviewReminder.query
+                 .filter(InterviewReminder.status == InterviewReminder.STATUS_PENDING,
+                         InterviewReminder.due_at <= overdue_before)
+                 .order_by(InterviewReminder.due_at)
+                 .limit(batch_size)
+                 .with_for_update(skip_locked=True)
+                 .all())
+    result = {'claimed': len(reminders), 'sent': 0, 'duplicate': 0, 'expired': 0, 'cancelled': 0}
+    if not reminders:
+        db.session.commit()
+        return result
+
+    candidates = {c.candidate_id: c for c in Candidate.query.filter(
+        Candidate.candidate_id.in_({r.candidate_id for r in reminders}))}
+    users = {u.id: u for u in User.query.filter(User.id.in_({r.user_id for r in reminders}))}
+    digest_users = [user for user in users.values() if user.interview_reminder_digest]
+    for reminder in reminders:
+        user = users.get(reminder.user_id)
+        if user is not None and user.interview_reminder_digest:
+            continue  # Delivered below, together with the rest of that user's window
+        result[_deliver(reminder, candidates.get(reminder.candidate_id), user, now)] += 1
+    for user in digest_users:
+        for key, value in _deliver_digest(user, now).items():
+            result[key] += value
+    db.session.commit()
+    logger.warning(f"Reminder catch-up: {result['claimed']} overdue reminder(s) claimed "
+                   f"({result['sent']} sent, {result['duplicate']} already sent, {result['expired']} expired, "
+                   f"{result['cancelled']} cancelled).")
+    return result
+
+
+# --- Sync from the write paths ---
+
+def sync_changes(session=None, candidates=(), candidate_ids=(), users=(), rearm_users=()) -> dict:
+    """
+    Re-computes the reminders affected by what the caller is about to commit. Called right before the commit by
+    the write paths that change an interview (time, status, company, interviewers) or who gets its reminders
+    (a user's reminder settings, activation, email, role or company; a new user). Flushes first, so new rows have
+    their ids. Errors propagate: the caller rolls back, and reminders never disagree with committed data.
+
+    :param candidates: Candidate objects whose interview may have changed; candidate_ids for bulk UPDATEs.
+    :param users: users whose reminder settings or eligibility changed.
+    :param rearm_users: users whose digest mode or window changed (same due times, different grouping).
+    """
+    session = session or db.session()
+    session.flush()
+    candidate_id_set = {candidate.candidate_id for candidate in candidates if candidate.candidate_id is not None}
+    candidate_id_set.update(candidate_ids)
+    user_ids = {user.id for user in users if user.id is not None}
+    rearm_user_ids = {user.id for user in rearm_users if user.id is not None}
+    counts = sync_reminders(session, candidate_id_set, user_ids, (), rearm_user_ids)
+    if any(counts.values()):
+        logger.info(f"Interview reminders synced ({len(candidate_id_set)} candidate(s), {len(user_ids)} user(s) "
+                    f"changed): {counts}")
+    return counts
@@ -1,22 +1,57 @@
 # backend/app/services/s3_service.py
 
 import boto3
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 from flask import current_app
 import logging
 import io # For BytesIO stream
+import threading
 
 # Configure basic logging for the service
 # Note: Flask's app logger might be preferred if configured globally
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# boto3 clients are thread-safe once created (client creation itself is not), so each process keeps
+# one client per credentials/region and reuses its HTTP connection pool across tasks and threads/greenlets.
+_s3_clients = {}
+_s3_clients_lock = threading.Lock()
+
+
 def _get_s3_client():
+    """Returns the shared S3 client for the current config, creating it on first use."""
+    client_key = (current_app.config.get('AWS_ACCESS_KEY_ID'), current_app.config.get('S3_REGION'))
+    s3_client = _s3_clients.get(client_key)
+    if s3_client is None:
+        with _s3_clients_lock:
+            s3_client = _s3_clients.get(client_key)
+            if s3_client is None:
+                s3_client = _create_s3_client()
+                if s3_client is not None:
+                    _s3_clients[client_key] = s3_client
+    return s3_client
+
+
+def reset_s3_clients():
+    """Drops the cached clients (e.g. in a freshly forked child, which must not share sockets with its parent)."""
+    with _s3_clients_lock:
+        _s3_clients.clear()
+
+
+def warm_s3_client() -> bool:
+    """Builds the shared client ahead of the first task (worker startup), so that task does not pay for it."""
+    return _get_s3_client() is not None
+
+
+def _create_s3_client():
     """Helper function to create and return an S3 client using config."""
     # Attempt to get credentials and region from Flask app config
     aws_access_key_id = current_app.config.get('AWS_ACCESS_KEY_ID')
     aws_secret_access_key = current_app.config.get('AWS_SECRET_ACCESS_KEY')
     region_name = current_app.config.get('S3_REGION')
+    # Connection pool sized for the worker concurrency (botocore's default is 10).
+    boto_config = BotoConfig(max_pool_connections=current_app.config.get('S3_MAX_POOL_CONNECTIONS', 32))
 
     # Check if explicit credentials are fully provided
     if aws_access_key_id and aws_secret_access_key and region_name:
@@ -26,7 +61,8 @@ def _get_s3_client():
                 's3',
                 aws_access_key_id=aws_access_key_id,
                 aws_secret_access_key=aws_secret_access_key,
-                region_name=region_name
+                region_name=region_name,
+                config=boto_config
             )
             # Optional: Add a check here, e.g., s3_client.list_buckets() but requires ListAllMyBuckets permission
             logger.info("S3 client created successfully using configured credentials.")
@@ -39,7 +75,7 @@ def _get_s3_client():
         logger.warning("AWS credentials or region not fully configured in app config. Attempting implicit credentials.")
         try:
             # Boto3 searches standard locations if no explicit creds are passed
-            s3_client = boto3.client('s3', region_name=region_name) # Still need region if not implicit
+            s3_client = boto3.client('s3', region_name=region_name, config=boto_config) # Still need region if not implicit
              # Optional check here too
             logger.info("S3 client created successfully using implicit credentials/region configuration.")
             return s3_client
@@ -0,0 +1,183 @@
+# backend/app/services/task_metrics_service.py
+
+import logging
+import os
+import time
+
+import redis
+
+from . import redis_service
+
+logger = logging.getLogger(__name__)
+
+# Per-task resource accounting (RSS delta, sampled tracemalloc peak, wall time, DB time), aggregated per task
+# name in hourly Redis buckets. Recorded from the Celery signal handlers (app/celery_signals.py), which run
+# outside a Flask app context, so the writers take an explicit redis_url.
+
+KEY_PREFIX = 'nexona:task_metrics'
+BUCKET_SECONDS = 3600
+DEFAULT_RETENTION_HOURS = 168
+
+# A task type is flagged as a suspected leak when most of its runs leave the process bigger than before.
+LEAK_MIN_RUNS = 20
+LEAK_GROWTH_RATIO = 0.8
+LEAK_MIN_AVG_GROWTH_KB = 256
+
+SORT_FIELDS = ('max_rss_delta_kb', 'avg_rss_delta_kb', 'max_rss_kb', 'max_tracemalloc_peak_kb',
+               'avg_wall_seconds', 'avg_db_seconds', 'runs')
+
+_PAGE_SIZE_KB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') else 4
+
+
+def current_rss_kb():
+    """
+    Current resident set size of this process in KiB, or None where /proc is not available (the peak RSS
+    getrusage offers instead would make every delta computed from it meaningless).
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE_KB
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _bucket(timestamp: float) -> int:
+    return int(timestamp // BUCKET_SECONDS) * BUCKET_SECONDS
+
+
+def _stats_key(bucket: int, task_name: str) -> str:
+    return f'{KEY_PREFIX}:{bucket}:stats:{task_name}'
+
+
+def _max_key(bucket: int, field: str) -> str:
+    return f'{KEY_PREFIX}:{bucket}:max:{field}'
+
+
+def _tasks_key(bucket: int) -> str:
+    return f'{KEY_PREFIX}:{bucket}:tasks'
+
+
+def record_task_run(redis_url: str, task_name: str, wall_seconds: float, db_seconds: float, db_queries: int,
+                    rss_delta_kb: int, rss_after_kb: int, tracemalloc_peak_kb: int = None, failed: bool = False,
+                    retention_hours: int = DEFAULT_RETENTION_HOURS):
+    """Adds one task run to the current hourly bucket (RSS fields only if both were read). Never raises."""
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None or not task_name:
+        return
+    bucket = _bucket(time.time())
+    ttl = int(retention_hours * 3600) + BUCKET_SECONDS
+    stats_key = _stats_key(bucket, task_name)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.sadd(_tasks_key(bucket), task_name)
+        pipe.hincrby(stats_key, 'runs', 1)
+        if failed:
+            pipe.hincrby(stats_key, 'failures', 1)
+        pipe.hincrbyfloat(stats_key, 'wall_seconds', wall_seconds)
+        pipe.hincrbyfloat(stats_key, 'db_seconds', db_seconds)
+        pipe.hincrby(stats_key, 'db_queries', db_queries)
+        pipe.zadd(_max_key(bucket, 'wall_seconds'), {task_name: wall_seconds}, gt=True)
+        if rss_delta_kb is not None and rss_after_kb is not None:
+            pipe.hincrby(stats_key, 'rss_samples', 1)
+            pipe.hincrby(stats_key, 'rss_delta_kb', rss_delta_kb)
+            if rss_delta_kb > 0:
+                pipe.hincrby(stats_key, 'rss_growth_runs', 1)
+            pipe.zadd(_max_key(bucket, 'rss_delta_kb'), {task_name: rss_delta_kb}, gt=True)
+            pipe.zadd(_max_key(bucket, 'rss_after_kb'), {task_name: rss_after_kb}, gt=True)
+        if tracemalloc_peak_kb is not None:
+            pipe.hincrby(stats_key, 'tracemalloc_samples', 1)
+            pipe.hincrby(stats_key, 'tracemalloc_peak_kb', tracemalloc_peak_kb)
+            pipe.zadd(_max_key(bucket, 'tracemalloc_peak_kb'), {task_name: tracemalloc_peak_kb}, gt=True)
+        for key in (stats_key, _tasks_key(bucket), _max_key(bucket, 'wall_seconds'), _max_key(bucket, 'rss_delta_kb'),
+                    _max_key(bucket, 'rss_after_kb'), _max_key(bucket, 'tracemalloc_peak_kb')):
+            pipe.expire(key, ttl)
+        pipe.execute()
+    except redis.RedisError as redis_err:
+        logger.debug(f"Could not record metrics for task {task_name}: {redis_err}")
+
+
+def get_task_metrics_report(redis_url: str, hours: int = 24, limit: int = 10, sort_by: str = 'max_rss_delta_kb') -> dict:
+    """
+    Per task type over the last `hours`: runs, failures, avg/max wall and DB time, avg/max RSS delta, peak RSS,
+    sampled tracemalloc peak and a leak suspicion flag; plus an hourly series of the RSS delta of the top tasks.
+    """
+    redis_client = redis_service.get_redis_client(redis_url)
+    if redis_client is None:
+        return {'hours': hours, 'tasks': [], 'series': {}}
+
+    now_bucket = _bucket(time.time())
+    buckets = [now_bucket - i * BUCKET_SECONDS for i in range(max(hours, 1))]
+    totals = {}
+    series = {}
+    for bucket in reversed(buckets):
+        task_names = sorted(name.decode() if isinstance(name, bytes) else name
+                            for name in redis_client.smembers(_tasks_key(bucket)))
+        if not task_names:
+            continue
+        maxima = {field: dict((member.decode() if isinstance(member, bytes) else member, score)
+                              for member, score in redis_client.zrange(_max_key(bucket, field), 0, -1, withscores=True))
+                  for field in ('wall_seconds', 'rss_delta_kb', 'rss_after_kb', 'tracemalloc_peak_kb')}
+        for task_name in task_names:
+            raw = redis_client.hgetall(_stats_key(bucket, task_name))
+            stats = {(k.decode() if isinstance(k, bytes) else k): float(v) for k, v in raw.items()}
+            runs = int(stats.get('runs', 0))
+            if not runs:
+                continue
+            total = totals.setdefault(task_name, {'runs': 0, 'failures': 0, 'wall_seconds': 0.0, 'db_seconds': 0.0,
+                                                  'db_queries': 0, 'rss_samples': 0, 'rss_delta_kb': 0,
+                                                  'rss_growth_runs': 0,
+                                                  'tracemalloc_samples': 0, 'tracemalloc_peak_kb': 0,
+                                                  'max_wall_seconds': 0.0, 'max_rss_delta_kb': 0,
+                                                  'max_rss_kb': 0, 'max_tracemalloc_peak_kb': 0})
+            for field in ('runs', 'failures', 'db_queries', 'rss_samples', 'rss_delta_kb', 'rss_growth_runs',
+                          'tracemalloc_samples', 'tracemalloc_peak_kb'):
+                total[field] += int(stats.get(field, 0))
+            total['wall_seconds'] += stats.get('wall_seconds', 0.0)
+            total['db_seconds'] += stats.get('db_seconds', 0.0)
+            total['max_wall_seconds'] = max(total['max_wall_seconds'], maxima['wall_seconds'].get(task_name, 0.0))
+            total['max_rss_delta_kb'] = max(total['max_rss_delta_kb'], int(maxima['rss_delta_kb'].get(task_name, 0)))
+            total['max_rss_kb'] = max(total['max_rss_kb'], int(maxima['rss_after_kb'].get(task_name, 0)))
+            total['max_tracemalloc_peak_kb'] = max(total['max_tracemalloc_peak_kb'],
+                                                   int(maxima['tracemalloc_peak_kb'].get(task_name, 0)))
+            rss_samples = int(stats.get('rss_samples', 0))
+            series.setdefault(task_name, []).append({
+                'hour': bucket, 'runs': runs,
+                'avg_rss_delta_kb': round(stats.get('rss_delta_kb', 0) / rss_samples, 1) if rss_samples else None,
+                'max_rss_delta_kb': int(maxima['rss_delta_kb'].get(task_name, 0)) if rss_samples else None,
+            })
+
+    tasks = []
+    for task_name, total in totals.items():
+        runs, rss_samples = total['runs'], total['rss_samples']
+        # RSS averages cover only the runs whose RSS could be read
+        avg_rss_delta_kb = total['rss_delta_kb'] / rss_samples if rss_samples else None
+        growth_ratio = total['rss_growth_runs'] / rss_samples if rss_samples else None
+        tasks.append({
+            'task': task_name,
+            'runs': runs,
+            'failures': total['failures'],
+            'avg_wall_seconds': round(total['wall_seconds'] / runs, 3),
+            'max_wall_seconds': round(total['max_wall_seconds'], 3),
+            'avg_db_seconds': round(total['db_seconds'] / runs, 3),
+            'db_time_share': round(total['db_seconds'] / total['wall_seconds'], 3) if total['wall_seconds'] else None,
+            'avg_db_queries': round(total['db_queries'] / runs, 1),
+            'avg_rss_delta_kb': round(avg_rss_delta_kb, 1) if rss_samples else None,
+            'max_rss_delta_kb': total['max_rss_delta_kb'] if rss_samples else None,
+            'max_rss_kb': total['max_rss_kb'] if rss_samples else None,
+            'rss_growth_ratio': round(growth_ratio, 3) if rss_samples else None,
+            'avg_tracemalloc_peak_kb': (round(total['tracemalloc_peak_kb'] / total['tracemalloc_samples'], 1)
+                                        if total['tracemalloc_samples'] else None),
+            'max_tracemalloc_peak_kb': total['max_tracemalloc_peak_kb'] or None,
+            'tracemalloc_samples': total['tracemalloc_samples'],
+            'suspected_leak': (rss_samples >= LEAK_MIN_RUNS and growth_ratio >= LEAK_GROWTH_RATIO
+                               and avg_rss_delta_kb >= LEAK_MIN_AVG_GROWTH_KB),
+        })
+
+    tasks.sort(key=lambda t: (t.get(sort_by) is not None, t.get(sort_by) or 0), reverse=True)
+    tasks = tasks[:limit]
+    return {
+        'hours': hours,
+        'sort_by': sort_by,
+        'tasks': tasks,
+        'series': {t['task']: series.get(t['task'], []) for t in tasks},
+    }
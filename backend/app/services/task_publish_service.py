@@ -0,0 +1,179 @@
+# backend/app/services/task_publish_service.py
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import celery, db
+from app.models import PendingTaskPublish
+
+logger = logging.getLogger(__name__)
+
+# Publishing Celery tasks from the web tier.
+# - publish_tasks() sends a list of messages through ONE producer taken from Celery's shared producer pool
+#   (broker_pool_limit connections per process), instead of checking a producer out per send_task(). The
+#   connection is reused, but every message is still its own round trip to the broker.
+# - publish_after_commit() queues a message on the current DB session and publishes it only once that
+#   session's transaction has committed: the task never runs against data that was rolled back, and a slow
+#   broker never holds a transaction (or its row locks) open. Rolled-back transactions drop their messages.
+# - If that publish fails (broker down), the messages not yet published are written to task_publish_outbox on
+#   a connection of their own, and relay_pending_publishes() (beat, every TASK_PUBLISH_RELAY_INTERVAL_SECONDS)
+#   republishes them with backoff. Delivery is at-least-once: the relay commits after publishing, so a relay
+#   that dies in between publishes those messages again on its next run.
+
+PENDING_PUBLISHES_KEY = 'nexona_pending_task_publishes'
+MAX_RELAY_DELAY_SECONDS = 3600
+
+
+def _now():
+    return datetime.now(dt_timezone.utc)
+
+
+def task_message(task_name: str, args=None, kwargs=None, **options) -> dict:
+    """One message for publish_tasks(): task name, args/kwargs and send_task options (countdown, priority...)."""
+    # send_task() by name does not know the task's ignore_result and would subscribe to the result backend
+    # for every message; the web tier never reads task results.
+    options.setdefault('ignore_result', True)
+    return {'name': task_name, 'args': list(args or []), 'kwargs': dict(kwargs or {}), 'options': options}
+
+
+def _send(producer, message):
+    celery.send_task(message['name'], args=message['args'], kwargs=message['kwargs'], producer=producer,
+                     **message['options'])
+
+
+def publish_tasks(messages) -> int:
+    """
+    Publishes the messages back-to-back on a single pooled producer connection (one broker round trip each).
+    Stops at the first broker error and raises it; messages before it are already published.
+
+    :return: number of messages published.
+    """
+    messages = list(messages)
+    if not messages:
+        return 0
+    published = 0
+    with celery.producer_or_acquire() as producer:
+        for message in messages:
+            _send(producer, message)
+            published += 1
+    logger.debug(f"Published {published} task message(s) on one pooled producer.")
+    return published
+
+
+def publish_after_commit(task_name: str, args=None, kwargs=None, session=None, **options):
+    """
+    Publishes the task after the current transaction of the session (default: db.session) commits.
+    Must be followed by a commit of that session; a rollback discards the message.
+    """
+    session = session or db.session()
+    session.info.setdefault(PENDING_PUBLISHES_KEY, []).append(task_message(task_name, args, kwargs, **options))
+
+
+# --- Failed publishes: kept in task_publish_outbox and relayed ---
+
+def _storable_options(options: dict, now) -> dict:
+    """send_task options as JSON, with countdown and relative expires turned into absolute times."""
+    options = dict(options)
+    countdown = options.pop('countdown', None)
+    if countdown is not None and options.get('eta') is None:
+        options['eta'] = now + timedelta(seconds=countdown)
+    if isinstance(options.get('expires'), (int, float)):
+        options['expires'] = now + timedelta(seconds=options['expires'])
+    return {key: value.isoformat() if isinstance(value, datetime) else value for key, value in options.items()}
+
+
+def _store_failed_publishes(messages, error) -> bool:
+    """Writes the messages to task_publish_outbox on a connection of its own. False if that failed too."""
+    now = _now()
+    try:
+        with db.engine.begin() as connection:
+            connection.execute(PendingTaskPublish.__table__.insert(), [
+                {'task_name': message['name'], 'args': message['args'], 'kwargs': message['kwargs'],
+                 'options': _storable_options(message['options'], now), 'attempts': 1,
+                 'next_attempt_at': now + timedelta(seconds=_relay_delay_seconds(1)), 'last_error': repr(error),
+                 'created_at': now}
+                for message in messages
+            ])
+        return True
+    except Exception as store_err:
+        logger.critical(f"Could not keep {len(messages)} unpublished task message(s) for the relay: {store_err}. "
+                        f"Lost messages: {[(m['name'], m['args']) for m in messages]}", exc_info=True)
+        return False
+
+
+def _relay_delay_seconds(attempts: int) -> int:
+    return min(30 * (2 ** max(attempts - 1, 0)), MAX_RELAY_DELAY_SECONDS)
+
+
+def relay_pending_publishes(limit: int = 500) -> dict:
+    """
+    Republishes up to `limit` due messages of task_publish_outbox (oldest first) on one pooled producer.
+    Published rows are deleted; at the first broker error the rest back off. Commits.
+
+    :return: dict with the number of messages published and left for a later attempt.
+    """
+    rows = (PendingTaskPublish.query
+            .filter(PendingTaskPublish.next_attempt_at <= _now())
+            .order_by(PendingTaskPublish.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all())
+    if not rows:
+        db.session.commit()
+        return {'published': 0, 'pending': 0}
+
+    published, error = [], None
+    try:
+        with celery.producer_or_acquire() as producer:
+            for row in rows:
+                _send(producer, {'name': row.task_name, 'args': row.args, 'kwargs': row.kwargs,
+                                 'options': row.options})
+                published.append(row)
+    except Exception as publish_err:
+        error = publish_err
+
+    now = _now()
+    for row in published:
+        db.session.delete(row)
+    remaining = rows[len(published):]
+    for row in remaining:
+        row.attempts = (row.attempts or 0) + 1
+        row.next_attempt_at = now + timedelta(seconds=_relay_delay_seconds(row.attempts))
+        row.last_error = repr(error)
+    db.session.commit()
+    if remaining:
+        logger.error(f"Task publish relay: broker error after {len(published)} message(s), {len(remaining)} "
+                     f"left for a later attempt: {error}")
+    return {'published': len(published), 'pending': len(remaining)}
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_pending_after_commit(session):
+    messages = session.info.pop(PENDING_PUBLISHES_KEY, None)
+    if not messages:
+        return
+    published = 0
+    try:
+        with celery.producer_or_acquire() as producer:
+            for message in messages:
+                _send(producer, message)
+                published += 1
+        logger.info(f"Published {len(messages)} task(s) after commit: {', '.join(m['name'] for m in messages)}.")
+    except Exception as publish_err:
+        # The data is committed either way; the caller already answered based on it. Never raise from here.
+        unpublished = messages[published:]
+        if _store_failed_publishes(unpublished, publish_err):
+            logger.error(f"Publishing {len(unpublished)} task(s) after commit failed: {publish_err}. "
+                         f"Kept for the relay: {[m['name'] for m in unpublished]}")
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_after_rollback(session, previous_transaction):
+    if previous_transaction.parent is not None:
+        return  # A SAVEPOINT rolled back; the outer transaction (and its queued messages) may still commit
+    messages = session.info.pop(PENDING_PUBLISHES_KEY, None)
+    if messages:
+        logger.info(f"Transaction rolled back: {len(messages)} pending task publish(es) discarded.")
@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 
 # Import the S3 service
 from . import s3_service # Ensure s3_service.py is in the same directory
+from .http_client_service import get_http_session
 
 # Basic logger
 logger = logging.getLogger(__name__)
@@ -48,6 +49,19 @@ def parse_cv_via_textkernel(s3_key: str) -> dict | None:
         logger.error(f"Failed to download file {s3_key} from S3. Cannot parse.")
         return None
 
+    return parse_cv_document(file_bytes, s3_key)
+
+
+def parse_cv_document(file_bytes: bytes, s3_key: str) -> dict | None:
+    """
+    Sends already downloaded CV content (Base64) to the Textkernel parser, returns parsed data.
+    The S3 key is only used for logging.
+    """
+    tk_config = _get_tk_config()
+    if not tk_config or file_bytes is None:
+        logger.error(f"Cannot parse CV {s3_key}: Missing Textkernel config or file content.")
+        return None
+
     # 2. Encode file content as Base64 string
     try:
         base64_encoded_cv = base64.b64encode(file_bytes).decode('utf-8')
@@ -79,8 +93,8 @@ def parse_cv_via_textkernel(s3_key: str) -> dict | None:
     try:
         logger.info(f"Sending request to Textkernel ({tk_config['full_parser_endpoint']}) for S3 key: {s3_key}")
 
-        # Use data=json.dumps(payload) as shown in the example
-        response = requests.post(
+        # Use data=json.dumps(payload) as shown in the example. Pooled session: keeps the TLS connection alive between parses.
+        response = get_http_session().post(
             tk_config["full_parser_endpoint"],
             headers=headers,
             data=json.dumps(request_payload), # Serialize payload manually
@@ -115,6 +129,10 @@ def parse_cv_via_textkernel(s3_key: str) -> dict | None:
         except json.JSONDecodeError: error_content = http_err.response.text
         logger.error(f"HTTPError from Textkernel for {s3_key}: {http_err.response.status_code} {http_err.response.reason}. Response: {error_content}")
         return None
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as net_err:
+        # Transient network problems are raised so the calling task can retry the parse.
+        logger.warning(f"Network error calling Textkernel for {s3_key}: {net_err}")
+        raise
     # ... (keep other existing exception handling) ...
     except Exception as e:
         logger.error(f"Unexpected error in Textkernel service for {s3_key}: {e}", exc_info=True)
@@ -0,0 +1,156 @@
+# backend/app/services/upload_admission_service.py
+
+import logging
+import math
+import threading
+import time
+
+import redis
+from flask import current_app
+
+from app.models import CompanySettings
+from . import parse_dispatch_service, redis_service
+
+logger = logging.getLogger(__name__)
+
+# Backpressure for CV uploads. Before a file is stored, the web tier looks at the parse backlog
+# (fair-share sub-queues + broker backlog of the pipeline) and the measured dispatch rate, and estimates
+# how long the new CV would wait. Then:
+#   - the company already has PARSE_ADMISSION_MAX_COMPANY_BACKLOG CVs waiting -> 429 (that tenant slows down)
+#   - estimated drain >= PARSE_ADMISSION_REJECT_DRAIN_SECONDS                -> 503 for everyone
+#   - estimated drain >= PARSE_ADMISSION_DEFER_DRAIN_SECONDS                 -> accepted as deferred (202 + ETA,
+#     low-priority lane), or 503 when PARSE_ADMISSION_MODE is 'reject'
+#   - otherwise                                                              -> admitted normally
+# Both 429 and 503 carry Retry-After. The backlog numbers are cached per process for
+# PARSE_ADMISSION_CACHE_SECONDS, so a burst of uploads costs a handful of Redis/broker calls, not one per file.
+
+ADMIT = 'admit'
+DEFER = 'defer'
+REJECT = 'reject'
+
+MIN_RETRY_AFTER_SECONDS = 30
+MAX_RETRY_AFTER_SECONDS = 3600
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _cached(key, loader):
+    ttl = current_app.config.get('PARSE_ADMISSION_CACHE_SECONDS', 5)
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] > now:
+            return hit[1]
+    value = loader()
+    with _cache_lock:
+        _cache[key] = (now + ttl, value)
+    return value
+
+
+def _load_backlog_snapshot() -> dict:
+    redis_client = redis_service.get_redis_client()
+    if redis_client is None:
+        return None
+    measured_rate = parse_dispatch_service.get_dispatch_rate_per_minute(redis_client)
+    return {
+        'pending': parse_dispatch_service.get_pending_counts(redis_client),
+        'pipeline_backlog': parse_dispatch_service.get_pipeline_backlog(),
+        'measured_rate_per_minute': measured_rate,
+        'rate_per_minute': max(measured_rate, current_app.config.get('PARSE_ADMISSION_MIN_RATE_PER_MINUTE', 10)),
+    }
+
+
+def _load_company_state(company_id: int) -> dict:
+    settings = CompanySettings.query.filter_by(company_id=company_id).first()
+    max_backlog = (settings.parse_admission_max_backlog if settings else None) or \
+        current_app.config.get('PARSE_ADMISSION_MAX_COMPANY_BACKLOG', 1000)
+    pending = parse_dispatch_service.get_pending_counts(company_id=company_id)
+    return {'pending': sum(pending.values()), 'max_backlog': max_backlog}
+
+
+def estimate_drain_seconds(snapshot: dict, priority: str, extra: int = 1) -> float:
+    """Seconds until `extra` CVs submitted now in the given lane would be dispatched, at the current rate."""
+    rate_per_second = snapshot['rate_per_minute'] / 60.0
+    low_share = current_app.config.get('PARSE_LOW_PRIORITY_MIN_SHARE', 0.2)
+    pending_high = snapshot['pending'].get(parse_dispatch_service.PRIORITY_HIGH, 0)
+    pending_low = snapshot['pending'].get(parse_dispatch_service.PRIORITY_LOW, 0)
+    backlog = snapshot['pipeline_backlog']
+
+    if priority == parse_dispatch_service.PRIORITY_HIGH:
+        # The high lane gets everything except the low lane's guaranteed share (while it has work).
+        high_rate = rate_per_second * (1 - low_share) if pending_low else rate_per_second
+        return (backlog + pending_high + extra) / high_rate
+    # The low lane drains at its guaranteed share, and never faster than the whole backlog allows.
+    return max((backlog + pending_low + extra) / (rate_per_second * low_share),
+               (backlog + pending_high + pending_low + extra) / rate_per_second)
+
+
+def _retry_after(seconds: float) -> int:
+    return int(min(max(math.ceil(seconds), MIN_RETRY_AFTER_SECONDS), MAX_RETRY_AFTER_SECONDS))
+
+
+def check_upload_admission(company_id: int, file_count: int = 1,
+                           priority: str = parse_dispatch_service.PRIORITY_HIGH) -> dict:
+    """
+    Decides whether file_count new CVs of the company may enter the parse queue right now.
+
+    :return: dict with action (admit/defer/reject), status_code (429/503 on reject), retry_after_seconds,
+             eta_seconds (estimated wait until parsing starts), priority (lane to use) and reason.
+    """
+    decision = {'action': ADMIT, 'status_code': None, 'retry_after_seconds': None, 'eta_seconds': None,
+                'priority': priority, 'reason': None}
+    if not current_app.config.get('PARSE_ADMISSION_ENABLED', True) or not parse_dispatch_service.is_enabled():
+        return decision
+
+    try:
+        snapshot = _cached('backlog', _load_backlog_snapshot)
+        company_state = _cached(('company', company_id), lambda: _load_company_state(company_id))
+    except redis.RedisError as redis_err:
+        # Fail open: admission control must never be the reason uploads stop working.
+        logger.warning(f"Upload admission check skipped (Redis unavailable): {redis_err}")
+        return decision
+    if snapshot is None:
+        return decision
+
+    rate_per_second = snapshot['rate_per_minute'] / 60.0
+    over_quota = company_state['pending'] + file_count - company_state['max_backlog']
+    if over_quota > 0:
+        decision.update(action=REJECT, status_code=429, reason='company_backlog',
+                        retry_after_seconds=_retry_after(over_quota / rate_per_second))
+        return decision
+
+    eta = estimate_drain_seconds(snapshot, priority, extra=file_count)
+    decision['eta_seconds'] = round(eta)
+    defer_after = current_app.config.get('PARSE_ADMISSION_DEFER_DRAIN_SECONDS', 900)
+    reject_after = current_app.config.get('PARSE_ADMISSION_REJECT_DRAIN_SECONDS', 3600)
+    deferring = current_app.config.get('PARSE_ADMISSION_MODE', 'defer') == 'defer'
+
+    if eta >= reject_after or (eta >= defer_after and not deferring):
+        decision.update(action=REJECT, status_code=503, reason='parse_backlog',
+                        retry_after_seconds=_retry_after(eta - defer_after))
+    elif eta >= defer_after:
+        # Accepted, but honestly: it waits in the low-priority lane and the caller gets the ETA for that lane.
+        low_lane = parse_dispatch_service.PRIORITY_LOW
+        decision.update(action=DEFER, reason='parse_backlog', priority=low_lane,
+                        eta_seconds=round(estimate_drain_seconds(snapshot, low_lane, extra=file_count)))
+    return decision
+
+
+def get_admission_status(company_id: int = None) -> dict:
+    """Current backlog snapshot, drain estimates per lane and thresholds (for the admin queue view)."""
+    snapshot = _load_backlog_snapshot()
+    if snapshot is None:
+        return {'enabled': False}
+    status = {
+        'enabled': bool(current_app.config.get('PARSE_ADMISSION_ENABLED', True)),
+        'mode': current_app.config.get('PARSE_ADMISSION_MODE', 'defer'),
+        'defer_drain_seconds': current_app.config.get('PARSE_ADMISSION_DEFER_DRAIN_SECONDS', 900),
+        'reject_drain_seconds': current_app.config.get('PARSE_ADMISSION_REJECT_DRAIN_SECONDS', 3600),
+        'snapshot': snapshot,
+        'estimated_drain_seconds': {lane: round(estimate_drain_seconds(snapshot, lane))
+                                    for lane in parse_dispatch_service.PRIORITY_LANES},
+    }
+    if company_id is not None:
+        status['company'] = dict(_load_company_state(company_id), company_id=company_id)
+    return status
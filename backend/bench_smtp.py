@@ -0,0 +1,125 @@
+# backend/bench_smtp.py
+# Benchmark: emails/second με mail.send() ανά μήνυμα (connect/LOGIN/QUIT κάθε φορά) έναντι pooled
+# αποστολής batch πάνω σε μία σύνδεση (app/services/mail_service.py).
+#
+# Χωρίς --host ξεκινά ένα τοπικό SMTP sink μέσα στο script (δέχεται και πετά τα μηνύματα).
+# Για πιο ρεαλιστικό RTT/TLS δώστε έναν εξωτερικό sink, π.χ. MailHog/Mailpit:
+#      python bench_smtp.py --messages 500 --host mailpit --port 1025
+# Με --latency προστίθεται καθυστέρηση ανά απάντηση του τοπικού sink (προσομοίωση δικτύου).
+import argparse
+import os
+import socketserver
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from flask_mail import Message  # noqa: E402
+
+from app import create_app, mail  # noqa: E402
+from app.services import mail_service  # noqa: E402
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP server: accepts every command and discards the message data."""
+
+    def _reply(self, line):
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self._reply('220 bench-sink ESMTP')
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode(errors='replace').strip().split(' ', 1)[0].upper()
+            if command == 'EHLO':
+                self.wfile.write(b'250-bench-sink\r\n')
+                self._reply('250 8BITMIME')
+            elif command == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                self.server.received += 1
+                self._reply('250 OK queued')
+            elif command == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:  # HELO, MAIL, RCPT, RSET, NOOP
+                self._reply('250 OK')
+
+
+class _SinkServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency):
+        super().__init__(('127.0.0.1', 0), _SinkHandler)
+        self.latency = latency
+        self.received = 0
+
+
+def _messages(count):
+    return [Message(subject=f"Bench {i}", sender='bench@example.com', recipients=[f'user{i}@example.com'],
+                    body='Benchmark message body.\n' * 20) for i in range(count)]
+
+
+def _rate(count, elapsed):
+    return count / elapsed if elapsed else 0.0
+
+
+def run_benchmark(message_count, host=None, port=None, latency=0.0, batch_size=100):
+    sink = None
+    if host is None:
+        sink = _SinkServer(latency)
+        threading.Thread(target=sink.serve_forever, daemon=True).start()
+        host, port = sink.server_address
+
+    app = create_app()
+    app.config.update(MAIL_SERVER=host, MAIL_PORT=port, MAIL_USE_TLS=False, MAIL_USE_SSL=False,
+                      MAIL_USERNAME=None, MAIL_PASSWORD=None, MAIL_DEBUG=False, MAIL_SUPPRESS_SEND=False)
+    app.extensions['mail'] = mail.init_mail(app.config)  # Re-read the mail settings overridden above
+
+    with app.app_context():
+        started = time.monotonic()
+        for message in _messages(message_count):
+            mail.send(message)  # New SMTP session per message (the old behaviour)
+        per_message_elapsed = time.monotonic() - started
+
+        mail_service.reset_mail_pool()
+        pending = _messages(message_count)
+        started = time.monotonic()
+        results = []
+        for offset in range(0, message_count, batch_size):
+            results.extend(mail_service.send_messages(pending[offset:offset + batch_size]))
+        pooled_elapsed = time.monotonic() - started
+        mail_service.reset_mail_pool()
+
+    sent = sum(1 for result in results if result['status'] == mail_service.RESULT_SENT)
+    print(f"SMTP sink: {host}:{port}" + (f" (built-in, {latency * 1000:.0f}ms per reply)" if sink else ""))
+    print(f"mail.send per message : {message_count} in {per_message_elapsed:.2f}s -> "
+          f"{_rate(message_count, per_message_elapsed):.1f} msgs/sec")
+    print(f"pooled batches of {batch_size:<4}: {sent} in {pooled_elapsed:.2f}s -> "
+          f"{_rate(sent, pooled_elapsed):.1f} msgs/sec")
+    if per_message_elapsed and pooled_elapsed:
+        print(f"Speed-up: x{per_message_elapsed / pooled_elapsed:.1f}")
+    if sink:
+        print(f"Messages received by the sink: {sink.received}")
+        sink.shutdown()
+    return {'per_message_elapsed': per_message_elapsed, 'pooled_elapsed': pooled_elapsed, 'pooled_sent': sent}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="SMTP throughput: per-message mail.send vs pooled batch sending.")
+    parser.add_argument('--messages', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--host', default=None, help="External SMTP sink (default: built-in local sink)")
+    parser.add_argument('--port', type=int, default=1025)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Seconds of delay per reply of the built-in sink (simulated network RTT)")
+    args = parser.parse_args()
+    run_benchmark(args.messages, host=args.host, port=args.port if args.host else None,
+                  latency=args.latency, batch_size=args.batch_size)
@@ -0,0 +1,61 @@
+# backend/bench_worker_pools.py
+# Benchmark: I/O-bound tasks/second ανά worker pool (prefork vs threads vs gevent) σε ίση μνήμη.
+#
+# 1. Ξεκινήστε έναν worker στην ουρά του benchmark με το pool που θέλετε να μετρήσετε, π.χ.:
+#      celery -A celery_worker.celery worker -P prefork -c 4   -Q bench -n bench@%h
+#      celery -A celery_worker.celery worker -P threads -c 50  -Q bench -n bench@%h
+#      celery -A celery_worker.celery worker -P gevent  -c 200 -Q bench -n bench@%h
+# 2. Τρέξτε:  python bench_worker_pools.py --tasks 2000 [--url http://sink:8080/] [--sleep 0.2]
+#
+# Τυπώνει tasks/sec, τη συνολική RSS των processes που εκτέλεσαν tasks και tasks/sec ανά 100MB,
+# ώστε τα pools να συγκρίνονται στην ίδια μνήμη.
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from app import create_app, celery  # noqa: E402
+
+IO_PROBE_TASK = 'tasks.diagnostics.io_probe'
+
+
+def run_benchmark(task_count, queue_name, url=None, sleep_seconds=0.2, timeout=600):
+    app = create_app()
+    with app.app_context():
+        # Warm-up: make sure a worker is consuming the queue before starting the clock.
+        celery.send_task(IO_PROBE_TASK, kwargs={'url': url, 'sleep_seconds': 0}, queue=queue_name).get(timeout=60)
+
+        started = time.monotonic()
+        async_results = [
+            celery.send_task(IO_PROBE_TASK, kwargs={'url': url, 'sleep_seconds': sleep_seconds}, queue=queue_name)
+            for _ in range(task_count)
+        ]
+        results = [r.get(timeout=timeout) for r in async_results]
+        elapsed = time.monotonic() - started
+
+    # RSS per worker process (last sample wins); the sum is the memory the pool needed for this run.
+    rss_by_process = {}
+    for result in results:
+        if result.get('rss_kb'):
+            rss_by_process[(result['hostname'], result['pid'])] = result['rss_kb']
+    total_rss_mb = sum(rss_by_process.values()) / 1024.0
+    throughput = task_count / elapsed if elapsed else 0.0
+
+    print(f"Tasks: {task_count} on queue '{queue_name}' ({'GET ' + url if url else f'sleep {sleep_seconds}s'})")
+    print(f"Elapsed: {elapsed:.2f}s -> {throughput:.1f} tasks/sec")
+    print(f"Worker processes used: {len(rss_by_process)}, total RSS: {total_rss_mb:.1f} MB")
+    if total_rss_mb:
+        print(f"Throughput per 100 MB RSS: {throughput / total_rss_mb * 100:.1f} tasks/sec")
+    return {'elapsed': elapsed, 'throughput': throughput, 'total_rss_mb': total_rss_mb}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="I/O task throughput benchmark for Celery worker pools.")
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--queue', default='bench')
+    parser.add_argument('--url', default=None, help="URL to GET per task (default: just sleep)")
+    parser.add_argument('--sleep', type=float, default=0.2, help="Simulated I/O wait per task when no --url is given")
+    args = parser.parse_args()
+    run_benchmark(args.tasks, args.queue, url=args.url, sleep_seconds=args.sleep)
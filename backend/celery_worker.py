@@ -9,6 +9,27 @@ logger = logging.getLogger(__name__)
 
 logger.info("--- Celery Worker Script Starting ---")
 
+
+def _patch_psycopg_for_green_threads():
+    """
+    With -P gevent, Celery monkey-patches the stdlib before importing this module, but psycopg2 is a
+    C extension that would still block the whole hub while waiting on PostgreSQL. psycogreen installs
+    a wait callback so DB waits yield to other greenlets like socket I/O does.
+    """
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    if not monkey.is_module_patched('socket'):
+        return False  # prefork/threads pool: nothing to do
+    from psycogreen.gevent import patch_psycopg
+    patch_psycopg()
+    logger.info("gevent pool detected: psycopg2 patched for green threads.")
+    return True
+
+
+_patch_psycopg_for_green_threads()
+
 try:
     app = create_app()
     logger.info("Flask app created successfully for Celery worker.")
@@ -27,8 +48,10 @@ try:
          logger.info("--- End Worker Initial Config Check ---")
     except Exception as config_log_err: logger.error(f"Error logging worker config: {config_log_err}", exc_info=True)
 
-    app.app_context().push()
-    logger.info("App context pushed for Celery worker main process.")
+    # No app context is pushed here on purpose: every task runs inside its own app context
+    # (ContextTask in app/__init__.py) and therefore its own scoped DB session, which is what
+    # keeps tasks isolated under the threads/gevent pools. This is the only app of the process;
+    # prefork children reset the connections they inherit from it (app/celery_signals.py).
 
 except Exception as create_err:
     logger.critical(f"FATAL: Failed to create Flask app for Celery worker: {create_err}", exc_info=True)
@@ -1,37 +1,37 @@
 # backend/app/tasks/communication.py
 
-from flask import current_app, render_template_string
-from app import celery, mail, db, create_app # Import create_app
-from app.models import Candidate, User # Import User model
-from flask_mail import Message
+from contextlib import nullcontext
+from flask import current_app, has_app_context
+from app import celery, db
+from app.services import email_outbox_service, mail_service, notification_service
+from app.models import Candidate, Notification, User # Import User model
 import logging
 import os # To construct URLs
+import time
 from datetime import datetime, timezone
 import uuid # Import uuid
 
 logger = logging.getLogger(__name__)
 
-# --- Helper function to create app context for tasks ---
-# Ensure this function is suitable for your setup or use the one from celery_worker.py
+# --- Helper for the app context of a task ---
 def get_app_context():
-    """Creates a Flask app context for the Celery task."""
-    # Consider using the already configured app instance if possible,
-    # otherwise create a new one based on environment config.
-    app = current_app._get_current_object() if current_app else None
-    if app is None:
-        logger.warning("No current Flask app found, creating new one for task context.")
-        app = create_app(os.getenv('FLASK_CONFIG') or 'default')
-    return app.app_context()
+    """
+    App context for the task body. Tasks already run inside the worker's app context (ContextTask),
+    so this normally adds nothing; it never creates a new app (one app per worker process).
+    """
+    if has_app_context():
+        return nullcontext()
+    return celery.flask_app.app_context()
 
 # --- Rejection Email Task ---
-@celery.task(bind=True, name='tasks.communication.send_rejection_email_task', max_retries=5)
+# Rejections and invitations are sent through the email outbox (dispatch_email_outbox below); these per-candidate
+# tasks stay for messages already queued under their names.
+@celery.task(bind=True, name='tasks.communication.send_rejection_email_task', ignore_result=True, max_retries=5)
 def send_rejection_email_task(self, candidate_id):
     """Sends the standard rejection email."""
     # Get config values within the task context
     with get_app_context():
         is_debug = current_app.config.get('MAIL_DEBUG', False)
-        sender_config = current_app.config.get('MAIL_SENDER', '"CV Manager App" <noreply@example.com>')
-        app_name = current_app.config.get('APP_NAME', 'NEXONA')
 
         logger.info(f"[EMAIL TASK START] Attempting rejection email for Candidate ID: {candidate_id}. Debug mode: {is_debug}")
         try:
@@ -40,45 +40,15 @@ def send_rejection_email_task(self, candidate_id):
                 logger.error(f"[EMAIL TASK FAIL] Candidate {candidate_id} not found or missing email.")
                 return f"Candidate {candidate_id} invalid/missing email."
 
-            subject = f"Ενημέρωση σχετικά με την αίτησή σας - {app_name}"; recipients = [candidate.email]
-            try: sender_display_name = sender_config.split('<')[0].strip().replace('"', '') or "Η Ομάδα Προσλήψεων"
-            except: sender_display_name = "Η Ομάδα Προσλήψεων"
-
-            # Using f-string with triple quotes for multi-line body
-            body_text = f"""Αγαπητέ/ή {candidate.first_name or 'Υποψήφιε/α'},
-
-Εξετάσαμε το βιογραφικό σας σημείωμα για τη θέση εργασίας στην εταιρεία μας.
-
-Θα θέλαμε να σας ευχαριστήσουμε θερμά για το ενδιαφέρον που δείξατε. Ωστόσο, λυπούμαστε που σας ενημερώνουμε ότι προς το παρόν δεν θα προχωρήσουμε σε περαιτέρω συνεργασία μαζί σας για την συγκεκριμένη θέση.
-
-Το βιογραφικό σας θα παραμείνει στη βάση δεδομένων μας και θα το λάβουμε υπόψη για πιθανές μελλοντικές θέσεις εργασίας που μπορεί να ταιριάζουν με τα προσόντα σας.
-
-Σας ευχόμαστε καλή επιτυχία στην αναζήτηση εργασίας σας.
-
-Με εκτίμηση,
-{sender_display_name}
-""".strip()
-
-            html_body = render_template_string("""
-            <p>Αγαπητέ/ή {{ candidate_name }},</p>
-            <p>Εξετάσαμε το βιογραφικό σας σημείωμα για τη θέση εργασίας στην εταιρεία μας.</p>
-            <p>Θα θέλαμε να σας ευχαριστήσουμε θερμά για το ενδιαφέρον που δείξατε. Ωστόσο, λυπούμαστε που σας ενημερώνουμε ότι προς το παρόν δεν θα προχωρήσουμε σε περαιτέρω συνεργασία μαζί σας για την συγκεκριμένη θέση.</p>
-            <p>Το βιογραφικό σας θα παραμείνει στη βάση δεδομένων μας και θα το λάβουμε υπόψη για πιθανές μελλοντικές θέσεις εργασίας που μπορεί να ταιριάζουν με τα προσόντα σας.</p>
-            <p>Σας ευχόμαστε καλή επιτυχία στην αναζήτηση εργασίας σας.</p>
-            <br>
-            <p>Με εκτίμηση,</p>
-            <p>{{ sender_display_name }}</p>
-            """, candidate_name=candidate.first_name or 'Υποψήφιε/α', sender_display_name=sender_display_name)
-
+            msg = email_outbox_service.build_rejection_message(candidate)
 
             if is_debug:
-                logger.info("--- MAIL DEBUG: Rejection Email Content Start ---"); logger.info(f"Subject: {subject}"); logger.info(f"From: {sender_config}"); logger.info(f"To: {recipients}"); logger.info("--- Body ---"); logger.info(body_text); logger.info("--- MAIL DEBUG: Email Content End ---")
+                logger.info("--- MAIL DEBUG: Rejection Email Content Start ---"); logger.info(f"Subject: {msg.subject}"); logger.info(f"From: {msg.sender}"); logger.info(f"To: {msg.recipients}"); logger.info("--- Body ---"); logger.info(msg.body or msg.html); logger.info("--- MAIL DEBUG: Email Content End ---")
                 logger.info(f"[EMAIL TASK SUCCESS - DEBUG] Rejection email logged for Candidate ID: {candidate_id} to {candidate.email}")
                 return f"Email logged (debug mode) for {candidate_id}."
             else:
-                logger.info("[EMAIL TASK] is_debug is False, attempting rejection mail.send()")
-                msg = Message(subject=subject, sender=sender_config, recipients=recipients, body=body_text, html=html_body)
-                mail.send(msg)
+                logger.info("[EMAIL TASK] is_debug is False, sending rejection email over the pooled SMTP connection")
+                mail_service.send_message(msg)  # Pooled SMTP connection of this worker
                 logger.info(f"[EMAIL TASK SUCCESS] Rejection email successfully sent for Candidate ID: {candidate_id} to {candidate.email}")
                 return f"Email sent for {candidate_id}."
         except Exception as e:
@@ -89,13 +59,13 @@ def send_rejection_email_task(self, candidate_id):
             return f"Failed to send rejection email for {candidate_id}."
 
 # --- Interview Reminder Email Task (to Recruiter/User) ---
-@celery.task(bind=True, name='tasks.communication.send_interview_reminder_email_task', max_retries=3)
+# Reminders and digests are sent through the email outbox (reminder_schedule_service enqueues them with their
+# sent_reminders ledger row); these tasks stay for messages already queued under their names.
+@celery.task(bind=True, name='tasks.communication.send_interview_reminder_email_task', ignore_result=True, max_retries=3)
 def send_interview_reminder_email_task(self, user_email, candidate_name, interview_datetime_iso, interview_location):
     """Sends an interview reminder email to a user (HR personnel)."""
     with get_app_context():
         is_debug = current_app.config.get('MAIL_DEBUG', False)
-        sender_config = current_app.config.get('MAIL_SENDER', '"CV Manager App" <noreply@example.com>')
-        app_name = current_app.config.get('APP_NAME', 'NEXONA')
 
         logger.info(f"[REMINDER EMAIL TASK START] Attempting reminder to User: {user_email} for Candidate: {candidate_name}")
         try:
@@ -103,47 +73,17 @@ def send_interview_reminder_email_task(self, user_email, candidate_name, intervi
                 logger.error("[REMINDER EMAIL TASK FAIL] No user email provided.")
                 return "User email missing."
 
-            try:
-                interview_dt = datetime.fromisoformat(interview_datetime_iso).astimezone(timezone.utc) # Ensure UTC for consistency if needed
-                formatted_time = interview_dt.strftime("%d/%m/%Y %H:%M UTC") # Example format
-            except Exception as format_err:
-                logger.warning(f"Could not format interview datetime {interview_datetime_iso}: {format_err}")
-                formatted_time = interview_datetime_iso # Fallback
-
-            subject = f"Υπενθύμιση Συνέντευξης: {candidate_name or 'Υποψήφιος'}"
-            recipients = [user_email]
-            body_text = f"""
-Γεια σας,
-
-Αυτό είναι μια υπενθύμιση για την επερχόμενη συνέντευξή σας:
-
-Υποψήφιος: {candidate_name or 'N/A'}
-Ημερομηνία & Ώρα: {formatted_time}
-Τοποθεσία: {interview_location or 'N/A'}
-
-- Σύστημα {app_name}
-""".strip()
-
-            html_body = render_template_string("""
-            <p>Γεια σας,</p>
-            <p>Αυτό είναι μια υπενθύμιση για την επερχόμενη συνέντευξή σας:</p>
-            <ul>
-                <li><strong>Υποψήφιος:</strong> {{ candidate_name }}</li>
-                <li><strong>Ημερομηνία & Ώρα:</strong> {{ formatted_time }}</li>
-                <li><strong>Τοποθεσία:</strong> {{ interview_location }}</li>
-            </ul>
-            <p>- Σύστημα {{ app_name }}</p>
-            """, candidate_name=candidate_name or 'N/A', formatted_time=formatted_time, interview_location=interview_location or 'N/A', app_name=app_name)
+            msg = email_outbox_service.build_interview_reminder_message(
+                user_email, candidate_name, interview_datetime_iso, interview_location)
 
             if is_debug:
                 logger.info("--- MAIL DEBUG: Interview Reminder Email Content Start ---")
-                logger.info(f"Subject: {subject}"); logger.info(f"From: {sender_config}"); logger.info(f"To: {recipients}"); logger.info("--- Body ---"); logger.info(body_text); logger.info("--- MAIL DEBUG: Email Content End ---")
+                logger.info(f"Subject: {msg.subject}"); logger.info(f"From: {msg.sender}"); logger.info(f"To: {msg.recipients}"); logger.info("--- Body ---"); logger.info(msg.body); logger.info("--- MAIL DEBUG: Email Content End ---")
                 logger.info(f"[REMINDER EMAIL SUCCESS - DEBUG] Logged for User: {user_email}, Candidate: {candidate_name}")
                 return "Reminder email logged (debug)."
             else:
-                logger.info("[REMINDER EMAIL TASK] is_debug is False, attempting reminder mail.send()")
-                msg = Message(subject=subject, sender=sender_config, recipients=recipients, body=body_text, html=html_body)
-                mail.send(msg)
+                logger.info("[REMINDER EMAIL TASK] is_debug is False, sending reminder email over the pooled SMTP connection")
+                mail_service.send_message(msg)  # Pooled SMTP connection of this worker
                 logger.info(f"[REMINDER EMAIL SUCCESS] Sent to User: {user_email}, Candidate: {candidate_name}")
                 return "Reminder email sent."
 
@@ -159,16 +99,51 @@ def send_interview_reminder_email_task(self, user_email, candidate_name, intervi
             return f"Failed to send reminder email to {user_email}."
 
 
+# --- Interview Reminder Digest Email Task (many interviews, one email) ---
+@celery.task(bind=True, name='tasks.communication.send_interview_reminder_digest_email_task', ignore_result=True, max_retries=3)
+def send_interview_reminder_digest_email_task(self, user_email, interviews):
+    """
+    Sends one email listing several upcoming interviews to a user in reminder digest mode.
+    `interviews`: list of dicts {candidate_name, interview_datetime_iso, interview_location, positions}.
+    """
+    with get_app_context():
+        is_debug = current_app.config.get('MAIL_DEBUG', False)
+
+        logger.info(f"[REMINDER DIGEST TASK START] {len(interviews or [])} interview(s) for User: {user_email}")
+        try:
+            if not user_email or not interviews:
+                logger.error("[REMINDER DIGEST TASK FAIL] No user email or no interviews provided.")
+                return "User email or interviews missing."
+
+            msg = email_outbox_service.build_interview_reminder_digest_message(user_email, interviews)
+
+            if is_debug:
+                logger.info("--- MAIL DEBUG: Interview Reminder Digest Content Start ---")
+                logger.info(f"Subject: {msg.subject}"); logger.info(f"From: {msg.sender}"); logger.info(f"To: {msg.recipients}"); logger.info("--- Body ---"); logger.info(msg.body); logger.info("--- MAIL DEBUG: Email Content End ---")
+                return "Reminder digest logged (debug)."
+
+            mail_service.send_message(msg)
+            logger.info(f"[REMINDER DIGEST SUCCESS] {len(interviews)} interview(s) sent to User: {user_email}")
+            return "Reminder digest sent."
+
+        except Exception as e:
+            logger.error(f"[REMINDER DIGEST FAIL] Error sending digest to {user_email}: {e}", exc_info=True)
+            if not is_debug:
+                try:
+                    countdown = 30 * (2 ** self.request.retries)
+                    logger.info(f"Retrying reminder digest for {user_email} in {countdown}s...")
+                    self.retry(exc=e, countdown=countdown)
+                except self.MaxRetriesExceededError:
+                    logger.critical(f"[REMINDER DIGEST FAIL] Max retries exceeded for reminder digest to {user_email}.")
+            return f"Failed to send reminder digest to {user_email}."
+
+
 # --- ΝΕΟ TASK: Αποστολή Πρόσκλησης Συνέντευξης στον Υποψήφιο ---
-@celery.task(bind=True, name='tasks.communication.send_interview_invitation_email_task', max_retries=3, default_retry_delay=120)
+@celery.task(bind=True, name='tasks.communication.send_interview_invitation_email_task', ignore_result=True, max_retries=3, default_retry_delay=120)
 def send_interview_invitation_email(self, candidate_id):
     """Sends an interview invitation email to the candidate with confirmation links."""
     with get_app_context():
         is_debug = current_app.config.get('MAIL_DEBUG', False)
-        sender_config = current_app.config.get('MAIL_SENDER', '"CV Manager App" <noreply@example.com>')
-        app_name = current_app.config.get('APP_NAME', 'NEXONA')
-        # IMPORTANT: Set APP_BASE_URL in .env or config (e.g., http://yourdomain.com or http://localhost:5000)
-        base_url = current_app.config.get('APP_BASE_URL', 'http://localhost:5000') # Default for safety
 
         logger.info(f"[INVITATION EMAIL TASK START] Attempting invitation email for Candidate ID: {candidate_id}. Debug: {is_debug}")
         try:
@@ -186,61 +161,10 @@ def send_interview_invitation_email(self, candidate_id):
                  logger.error(f"[INVITATION EMAIL TASK FAIL] Candidate {candidate_id} is missing confirmation_uuid.")
                  return f"Candidate {candidate_id} missing UUID."
 
-            # Construct Confirmation URLs
-            confirm_url = f"{base_url}/api/v1/interviews/confirm/{candidate.confirmation_uuid}"
-            decline_url = f"{base_url}/api/v1/interviews/decline/{candidate.confirmation_uuid}"
-
-            # Compose Email
-            subject = f"Πρόσκληση Συνέντευξης - {app_name}"
-            recipients = [candidate.email]
-            interview_dt_formatted = candidate.interview_datetime.strftime('%d/%m/%Y στις %H:%M')
-
-            # Basic HTML Email Template
-            html_body = render_template_string("""
-            <p>Αγαπητέ/ή {{ candidate_name }},</p>
-            <p>Θα θέλαμε να σας προσκαλέσουμε σε συνέντευξη για τη θέση που αιτηθήκατε στην εταιρεία μας.</p>
-            <p><strong>Στοιχεία Συνέντευξης:</strong></p>
-            <ul>
-                <li><strong>Ημερομηνία & Ώρα:</strong> {{ interview_datetime }}</li>
-                {% if interview_location %}
-                <li><strong>Τοποθεσία:</strong> {{ interview_location }}</li>
-                {% endif %}
-                {# Add description if you add it to the model/form #}
-                {# {% if interview_description %}
-                <li><strong>Περιγραφή/Σημειώσεις:</strong> {{ interview_description }}</li>
-                {% endif %} #}
-            </ul>
-            <p>Παρακαλούμε επιβεβαιώστε την παρουσία σας κάνοντας κλικ στον παρακάτω σύνδεσμο:</p>
-            <p style="margin: 20px 0;">
-                <a href="{{ confirm_url }}" style="display: inline-block; padding: 12px 20px; background-color: #28a745; color: white; text-decoration: none; border-radius: 5px; font-weight: bold;">
-                    Επιβεβαίωση Παρουσίας
-                </a>
-            </p>
-            <p>Αν δεν μπορείτε να παρευρεθείτε την προγραμματισμένη ώρα ή χρειάζεστε αλλαγή, παρακαλούμε ενημερώστε μας κάνοντας κλικ εδώ:</p>
-            <p style="margin: 20px 0;">
-                <a href="{{ decline_url }}" style="display: inline-block; padding: 12px 20px; background-color: #dc3545; color: white; text-decoration: none; border-radius: 5px; font-weight: bold;">
-                    Αδυναμία Παρουσίας / Αίτημα Αλλαγής
-                </a>
-            </p>
-            <br>
-            <p>Με εκτίμηση,</p>
-            <p>Η Ομάδα Προσλήψεων</p>
-            <p>{{ app_name }}</p>
-            """,
-            candidate_name=candidate.get_full_name(),
-            interview_datetime=interview_dt_formatted,
-            interview_location=candidate.interview_location,
-            # interview_description=getattr(candidate, 'description', None), # Uncomment if description added
-            confirm_url=confirm_url,
-            decline_url=decline_url,
-            app_name=app_name
-            )
-
-            # Create message with HTML body
-            msg = Message(subject, sender=sender_config, recipients=recipients)
-            msg.html = html_body
-            # Optional: Add a plain text version too
-            # msg.body = f"..."
+            # Company template if it has one, else the default (compiled once per worker, see email_template_service)
+            msg = email_outbox_service.build_interview_invitation_message(candidate)
+            subject, recipients, html_body = msg.subject, msg.recipients, msg.html
+            sender_config = msg.sender
 
             # Send Email or Log
             if is_debug:
@@ -249,8 +173,8 @@ def send_interview_invitation_email(self, candidate_id):
                 logger.info(f"[INVITATION EMAIL SUCCESS - DEBUG] Logged for Candidate ID: {candidate_id} to {candidate.email}")
                 return f"Invitation email logged (debug) for {candidate_id}."
             else:
-                logger.info("[INVITATION EMAIL TASK] is_debug is False, attempting invitation mail.send()")
-                mail.send(msg)
+                logger.info("[INVITATION EMAIL TASK] is_debug is False, sending invitation email over the pooled SMTP connection")
+                mail_service.send_message(msg)  # Pooled SMTP connection of this worker
                 logger.info(f"[INVITATION EMAIL SUCCESS] Invitation sent successfully to {candidate.email} for candidate {candidate_id}.")
                 return f"Invitation email sent for {candidate_id}."
 
@@ -266,25 +190,89 @@ def send_interview_invitation_email(self, candidate_id):
             return f"Failed to send invitation email for {candidate_id}."
 
 
-# --- Placeholders for Recruiter Notification Tasks ---
-
-@celery.task(bind=True, name='tasks.communication.notify_recruiter_interview_confirmed', max_retries=3)
-def notify_recruiter_interview_confirmed(self, candidate_id):
-     with get_app_context():
-         # TODO: Implement logic to find the relevant recruiter(s)
-         # e.g., User who created the interview, or users associated with the position
-         candidate = Candidate.query.get(candidate_id)
-         recruiter_email = "recruiter@example.com" # Placeholder
-         logger.info(f"[RECRUITER NOTIFY TASK] Candidate {candidate_id} ({candidate.get_full_name() if candidate else 'N/A'}) confirmed interview. Notifying {recruiter_email}.")
-         # Send email or create in-app notification
-         # ... implementation needed ...
-
-@celery.task(bind=True, name='tasks.communication.notify_recruiter_interview_declined', max_retries=3)
-def notify_recruiter_interview_declined(self, candidate_id):
-     with get_app_context():
-         # TODO: Implement logic to find the relevant recruiter(s)
-         candidate = Candidate.query.get(candidate_id)
-         recruiter_email = "recruiter@example.com" # Placeholder
-         logger.info(f"[RECRUITER NOTIFY TASK] Candidate {candidate_id} ({candidate.get_full_name() if candidate else 'N/A'}) declined/requested reschedule. Notifying {recruiter_email}.")
-         # Send email or create in-app notification (higher priority)
-         # ... implementation needed ...
\ No newline at end of file
+# --- Email outbox dispatcher ---
+OUTBOX_DISPATCH_TIME_BUDGET_SECONDS = 20  # Checked before every send chunk; well under the email queue's 30s soft limit
+
+
+@celery.task(name='tasks.communication.dispatch_email_outbox', ignore_result=True)
+def dispatch_email_outbox():
+    """
+    Sends the due emails of the outbox in batches (claimed with FOR UPDATE SKIP LOCKED, so overlapping runs take
+    disjoint batches). Kicked after every commit that enqueues an email and run periodically as a safety net.
+    Sending stops at the time budget (the unsent rows are released) and the next run is kicked right away.
+    """
+    started = time.monotonic()
+    deadline = started + OUTBOX_DISPATCH_TIME_BUDGET_SECONDS
+    totals = {'claimed': 0, 'sent': 0, 'failed': 0, 'retry': 0, 'skipped': 0, 'released': 0}
+    try:
+        while True:
+            batch = email_outbox_service.dispatch_batch(deadline=deadline)
+            for key, value in batch.items():
+                totals[key] += value
+            if batch['claimed'] < email_outbox_service.batch_size() and not batch['released']:
+                break
+            if time.monotonic() >= deadline:
+                email_outbox_service.kick_dispatcher()
+                break
+    except Exception as e:
+        db.session.rollback()
+        # Only the outcomes of the chunk in flight are lost: its rows stay 'sending' until their lease expires
+        # and are then sent again; every earlier chunk is already committed.
+        logger.error(f"[OUTBOX DISPATCH FAIL] {e}", exc_info=True)
+        return "Outbox dispatch failed."
+
+    if totals['claimed']:
+        elapsed = time.monotonic() - started
+        logger.info(f"[OUTBOX DISPATCH] {totals['claimed']} email(s) in {elapsed:.2f}s: sent {totals['sent']}, "
+                    f"retry {totals['retry']}, failed {totals['failed']}, skipped {totals['skipped']}, "
+                    f"released {totals['released']}.")
+    return f"Outbox dispatched: {totals}."
+
+
+@celery.task(name='tasks.communication.prune_email_outbox', ignore_result=True, non_overlapping=True)
+def prune_email_outbox():
+    """Deletes outbox rows that were sent, failed or skipped more than OUTBOX_RETENTION_DAYS ago."""
+    try:
+        deleted = email_outbox_service.prune()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[OUTBOX PRUNE FAIL] {e}", exc_info=True)
+        return "Outbox prune failed."
+    if deleted:
+        logger.info(f"[OUTBOX PRUNE] Deleted {deleted} old outbox row(s).")
+    return f"Outbox rows deleted: {deleted}."
+
+
+# --- Recruiter Notification Tasks (in-app notifications) ---
+def _notify_interview_response(task, candidate_id, kind):
+    with get_app_context():
+        try:
+            candidate = Candidate.query.get(candidate_id)
+            if not candidate:
+                logger.warning(f"[RECRUITER NOTIFY TASK] Candidate {candidate_id} not found; nothing to notify.")
+                return f"Candidate {candidate_id} not found."
+            notified = notification_service.notify_interview_response(candidate, kind)
+            db.session.commit()
+            logger.info(f"[RECRUITER NOTIFY TASK] Candidate {candidate_id} ({candidate.get_full_name()}) {kind}: "
+                        f"{notified} user(s) notified.")
+            return f"Notified {notified} user(s)."
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"[RECRUITER NOTIFY TASK FAIL] {kind} for candidate {candidate_id}: {e}", exc_info=True)
+            try:
+                task.retry(exc=e, countdown=30 * (2 ** task.request.retries))
+            except task.MaxRetriesExceededError:
+                logger.critical(f"[RECRUITER NOTIFY TASK FAIL] Max retries exceeded for {kind}, candidate {candidate_id}.")
+            return f"Failed to notify recruiters for {candidate_id}."
+
+
+@celery.task(bind=True, name='tasks.communication.notify_recruiter_interview_confirmed_task', ignore_result=True, max_retries=3)
+def notify_recruiter_interview_confirmed(self, candidate_id, company_id=None):
+    """Notifies the candidate's interviewers, scheduler and company admins that the interview was confirmed."""
+    return _notify_interview_response(self, candidate_id, Notification.KIND_INTERVIEW_CONFIRMED)
+
+
+@celery.task(bind=True, name='tasks.communication.notify_recruiter_interview_declined_task', ignore_result=True, max_retries=3)
+def notify_recruiter_interview_declined(self, candidate_id, company_id=None):
+    """Notifies the candidate's interviewers, scheduler and company admins that the candidate declined/asked to reschedule."""
+    return _notify_interview_response(self, candidate_id, Notification.KIND_INTERVIEW_DECLINED)
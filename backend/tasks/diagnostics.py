@@ -0,0 +1,32 @@
+# backend/tasks/diagnostics.py
+from app import celery
+from app.services.http_client_service import get_http_session
+from app.services.task_metrics_service import current_rss_kb
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(bind=True, name='tasks.diagnostics.io_probe', ignore_result=False)  # The benchmark reads the results
+def io_probe(self, url=None, sleep_seconds=0.2):
+    """
+    Synthetic I/O-bound task used by bench_worker_pools.py to compare worker pools.
+    Does one HTTP GET through the pooled session (or just waits, if no URL is given)
+    and reports which process ran it and that process's RSS.
+    """
+    started = time.monotonic()
+    if url:
+        response = get_http_session().get(url, timeout=30)
+        status_code = response.status_code
+    else:
+        time.sleep(sleep_seconds)  # Cooperative under gevent (monkey-patched)
+        status_code = None
+    return {
+        'pid': os.getpid(),
+        'hostname': self.request.hostname,
+        'rss_kb': current_rss_kb(),
+        'status_code': status_code,
+        'duration': round(time.monotonic() - started, 4),
+    }
@@ -2,13 +2,17 @@
 
 from flask import current_app
 from app import celery, db
-from app.models import Candidate, Position  # Βεβαιώσου ότι το Position είναι εδώ αν το χρησιμοποιείς
-from app.services import textkernel_service, s3_service
+from app.models import Candidate, Position, CvParseJob  # Βεβαιώσου ότι το Position είναι εδώ αν το χρησιμοποιείς
+from app.services import textkernel_service, s3_service, locking_service, redis_service, parse_dispatch_service, \
+    dead_letter_service, reminder_schedule_service
 import logging
+import redis
+import uuid
 import json  # Αν και δεν χρησιμοποιείται άμεσα εδώ, μπορεί να είναι χρήσιμο για debugging
 from datetime import datetime, timezone as dt_timezone
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 logger = logging.getLogger(__name__)
 
@@ -250,58 +254,290 @@ def _update_candidate_fields_from_parsed_data(candidate_to_update: Candidate, pa
     logger.debug(f"Candidate {candidate_to_update.candidate_id} fields prepared for database commit.")
 
 
-@celery.task(bind=True, name='tasks.parsing.parse_cv_task', acks_late=True, max_retries=3, default_retry_delay=60)
-def parse_cv_task(self, placeholder_candidate_id: str, s3_file_key: str, company_id: int):
+# --- Staged CV pipeline: fetch (S3) -> parse (Textkernel) -> persist (DB) ---
+# Each stage is its own task on its own queue (see cv_pipeline_service). A retry only repeats the
+# stage that failed, so a DB error in persist never triggers a second (paid) Textkernel parse.
+# Progress is recorded in CvParseJob (started -> parsed -> persisted), so a message redelivered
+# under acks_late resumes from the last completed step or exits immediately.
+
+def _cv_blob_cache_key(placeholder_candidate_id: str) -> str:
+    return f"nexona:cv_pipeline:blob:{placeholder_candidate_id}"
+
+
+def _halted_descriptor(descriptor: dict, stage: str, reason: str, failed: bool = True) -> dict:
+    """Descriptor passed down the chain when a stage stopped the pipeline. Later stages skip their work."""
+    halted = dict(descriptor)
+    halted.update({'halted': True, 'failed': failed, 'halted_stage': stage, 'reason': reason})
+    return halted
+
+
+def _get_or_create_parse_job(placeholder_candidate_id: str, s3_file_key: str, company_id: int) -> CvParseJob:
+    """Returns the idempotency record for (placeholder, S3 key), creating it race-free if needed."""
+    db.session.execute(
+        pg_insert(CvParseJob.__table__).values(
+            placeholder_candidate_id=uuid.UUID(str(placeholder_candidate_id)),
+            s3_key=s3_file_key,
+            company_id=company_id,
+            state=CvParseJob.STATE_STARTED,
+            attempts=0,
+            created_at=datetime.now(dt_timezone.utc),
+            updated_at=datetime.now(dt_timezone.utc),
+        ).on_conflict_do_nothing(constraint='uq_cv_parse_jobs_placeholder_s3_key')
+    )
+    job = CvParseJob.query.filter_by(placeholder_candidate_id=uuid.UUID(str(placeholder_candidate_id)),
+                                     s3_key=s3_file_key).one()
+    return job
+
+
+def _mark_placeholder_parsing_failed(placeholder_candidate_id: str, note: str, job_id: int = None,
+                                     stage: str = None, error_class: str = None):
+    """
+    Sets the placeholder (and its parse job) to failed and appends the error to its notes.
+    With an error_class, the failure is also written to parse_dead_letters for a later bulk replay. Never raises.
+    """
+    try:
+        job = None
+        if job_id:
+            job = CvParseJob.query.get(job_id)
+            if job and job.state != CvParseJob.STATE_PERSISTED:
+                job.state = CvParseJob.STATE_FAILED
+                job.last_error = note[:1000]
+        placeholder_candidate = Candidate.query.get(placeholder_candidate_id)
+        if not placeholder_candidate:
+            logger.error(
+                f"CRITICAL: Placeholder {placeholder_candidate_id} not found to mark as ParsingFailed ({note}).")
+        else:
+            placeholder_candidate.current_status = 'ParsingFailed'
+            placeholder_candidate.notes = (placeholder_candidate.notes or "") + \
+                                          f"\n{note} ({datetime.now(dt_timezone.utc).isoformat()})"
+            flag_modified(placeholder_candidate, "notes")
+            if job and job.state == CvParseJob.STATE_FAILED and error_class:
+                dead_letter_service.record_parse_failure(job, stage, error_class, note)
+        db.session.commit()
+    except Exception as e_commit_fail_status:
+        db.session.rollback()
+        logger.error(
+            f"CRITICAL: Could not commit ParsingFailed status for placeholder {placeholder_candidate_id}: {e_commit_fail_status}")
+
+
+@celery.task(bind=True, name='tasks.parsing.fetch_cv_stage', ignore_result=True, acks_late=True, max_retries=3, default_retry_delay=30)
+def fetch_cv_stage(self, placeholder_candidate_id: str, s3_file_key: str, company_id: int):
+    """Stage 1: downloads the CV from S3 into short-lived Redis scratch space."""
+    descriptor = {
+        'placeholder_candidate_id': placeholder_candidate_id,
+        's3_file_key': s3_file_key,
+        'company_id': company_id,
+    }
     logger.info(
-        f"[TASK START] parse_cv_task for placeholder_id: {placeholder_candidate_id}, S3: {s3_file_key}, Company: {company_id}. Attempt: {self.request.retries + 1}")
+        f"[FETCH STAGE] placeholder_id: {placeholder_candidate_id}, S3: {s3_file_key}, Company: {company_id}. Attempt: {self.request.retries + 1}")
+    if self.request.retries == 0:
+        # A pipeline slot just opened: let the fair-share dispatcher refill it.
+        parse_dispatch_service.kick_dispatcher()
+
+    job = _get_or_create_parse_job(placeholder_candidate_id, s3_file_key, company_id)
+    descriptor['job_id'] = job.id
+    if job.state in (CvParseJob.STATE_PERSISTED, CvParseJob.STATE_FAILED):
+        # Redelivered after the pipeline already finished: nothing to do.
+        logger.info(f"[FETCH STAGE] Parse job {job.id} is already '{job.state}'. Exiting.")
+        db.session.commit()
+        return _halted_descriptor(descriptor, 'fetch', f'job_already_{job.state}', failed=False)
+    if job.state == CvParseJob.STATE_PARSED:
+        # Parsed data is already stored: skip straight to persist without downloading or parsing again.
+        logger.info(f"[FETCH STAGE] Parse job {job.id} already parsed. Resuming at persist.")
+        db.session.commit()
+        return descriptor
+
+    job.attempts = (job.attempts or 0) + 1
+    db.session.commit()
 
     placeholder_candidate = Candidate.query.get(placeholder_candidate_id)
     if not placeholder_candidate:
-        logger.error(f"[TASK FAIL] Placeholder candidate {placeholder_candidate_id} not found. Aborting.")
-        # Attempt to delete S3 file only if the placeholder is truly gone and not merged.
-        # This logic might be complex if another process could have already handled it.
-        # For now, let's assume if placeholder is gone, the S3 file might be orphaned.
+        logger.error(f"[FETCH STAGE FAIL] Placeholder candidate {placeholder_candidate_id} not found. Aborting.")
+        # If the placeholder is gone before anything was parsed, the S3 file is orphaned.
         try:
             s3_service.delete_file(s3_file_key)
-            logger.info(
-                f"Deleted S3 file {s3_file_key} as placeholder {placeholder_candidate_id} was not found (final attempt).")
+            logger.info(f"Deleted S3 file {s3_file_key} as placeholder {placeholder_candidate_id} was not found.")
         except Exception as s3_del_err:
             logger.error(
                 f"Failed to delete S3 file {s3_file_key} for non-existent placeholder {placeholder_candidate_id}: {s3_del_err}")
-        return f"Placeholder candidate {placeholder_candidate_id} not found."
+        _mark_placeholder_parsing_failed(placeholder_candidate_id, "Placeholder candidate not found.", job_id=job.id)
+        return _halted_descriptor(descriptor, 'fetch', 'placeholder_not_found')
+
+    descriptor['cv_original_filename'] = placeholder_candidate.cv_original_filename
+    # Give the DB connection back to the pool before the network-bound part of the stage.
+    db.session.close()
+
+    file_bytes = s3_service.get_file_bytes(s3_file_key)
+    if file_bytes is None:
+        if self.request.retries < self.max_retries:
+            logger.warning(f"[FETCH STAGE RETRY] Could not download {s3_file_key} from S3. Retrying.")
+            raise self.retry(countdown=30 * (2 ** self.request.retries))
+        logger.error(f"[FETCH STAGE FAIL] Max retries exceeded downloading {s3_file_key} from S3.")
+        _mark_placeholder_parsing_failed(placeholder_candidate_id,
+                                         "S3 Error: CV file could not be downloaded (Max Retries).", job_id=job.id,
+                                         stage='fetch', error_class='S3DownloadError')
+        return _halted_descriptor(descriptor, 'fetch', 's3_download_failed')
+
+    # Only a Redis key travels through the broker, not the document itself.
+    descriptor['blob_key'] = None
+    redis_client = redis_service.get_redis_client()
+    if redis_client:
+        blob_key = _cv_blob_cache_key(placeholder_candidate_id)
+        try:
+            redis_client.set(blob_key, file_bytes, ex=current_app.config.get('CV_PIPELINE_BLOB_TTL_SECONDS', 3600))
+            descriptor['blob_key'] = blob_key
+        except redis.RedisError as redis_err:
+            logger.warning(
+                f"[FETCH STAGE] Could not cache CV {s3_file_key} in Redis ({redis_err}). Parse stage will download it from S3.")
 
-    # Original filename from the placeholder, as it was at the time of upload
-    new_cv_original_filename = placeholder_candidate.cv_original_filename
+    logger.info(f"[FETCH STAGE DONE] {s3_file_key} ({len(file_bytes)} bytes) ready for parsing.")
+    return descriptor
+
+
+@celery.task(bind=True, name='tasks.parsing.parse_cv_stage', ignore_result=True, acks_late=True, max_retries=3, default_retry_delay=60)
+def parse_cv_stage(self, descriptor: dict):
+    """Stage 2: sends the fetched CV to Textkernel and stores the parsed ResumeData on the parse job."""
+    if descriptor.get('halted'):
+        return descriptor
+
+    placeholder_candidate_id = descriptor['placeholder_candidate_id']
+    s3_file_key = descriptor['s3_file_key']
+    job_id = descriptor['job_id']
+
+    job = CvParseJob.query.get(job_id)
+    if not job:
+        logger.error(f"[PARSE STAGE FAIL] Parse job {job_id} not found for placeholder {placeholder_candidate_id}.")
+        return _halted_descriptor(descriptor, 'parse', 'job_not_found')
+    if job.state != CvParseJob.STATE_STARTED:
+        # Already parsed (redelivery) or finished: never pay for a second parse.
+        logger.info(f"[PARSE STAGE] Parse job {job_id} is already '{job.state}'. Skipping Textkernel call.")
+        db.session.close()
+        return descriptor
+    db.session.close()
+
+    logger.info(
+        f"[PARSE STAGE] Calling Textkernel for placeholder_id: {placeholder_candidate_id}, S3: {s3_file_key}. Attempt: {self.request.retries + 1}")
+
+    blob_key = descriptor.get('blob_key')
+    redis_client = redis_service.get_redis_client() if blob_key else None
+    file_bytes = None
+    if redis_client:
+        try:
+            file_bytes = redis_client.get(blob_key)
+        except redis.RedisError as redis_err:
+            logger.warning(f"[PARSE STAGE] Could not read cached CV {blob_key}: {redis_err}")
+    if file_bytes is None:
+        # Scratch copy expired or was never written: fall back to S3.
+        file_bytes = s3_service.get_file_bytes(s3_file_key)
+    if file_bytes is None:
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=30 * (2 ** self.request.retries))
+        _mark_placeholder_parsing_failed(placeholder_candidate_id,
+                                         "S3 Error: CV file could not be downloaded (Max Retries).", job_id=job_id,
+                                         stage='parse', error_class='S3DownloadError')
+        return _halted_descriptor(descriptor, 'parse', 's3_download_failed')
 
-    logger.info(f"[TASK] Calling Textkernel for placeholder_id: {placeholder_candidate_id}, S3: {s3_file_key}")
     try:
-        parsed_cv_data = textkernel_service.parse_cv_via_textkernel(s3_file_key)
+        parsed_cv_data = textkernel_service.parse_cv_document(file_bytes, s3_file_key)
     except Exception as tk_api_exc:
-        logger.error(f"[TASK RETRY/FAIL] Textkernel API call failed critically for {s3_file_key}: {tk_api_exc}",
+        logger.error(f"[PARSE STAGE RETRY/FAIL] Textkernel API call failed critically for {s3_file_key}: {tk_api_exc}",
                      exc_info=True)
-        try:
-            # Retry the task if it's a network issue, etc.
+        if self.request.retries < self.max_retries:
+            # Retry the stage if it's a network issue, etc.
             raise self.retry(exc=tk_api_exc)
-        except self.MaxRetriesExceededError:
-            logger.error(f"[TASK FAIL] Max retries exceeded for Textkernel API call for {s3_file_key}.")
-            placeholder_candidate.current_status = 'ParsingFailed'
-            placeholder_candidate.notes = (
-                                                      placeholder_candidate.notes or "") + f"\nTextkernel API Error (Max Retries): {str(tk_api_exc)[:200]} ({datetime.now(dt_timezone.utc).isoformat()})"
-            flag_modified(placeholder_candidate, "notes")
-            db.session.commit()
-            return f"Textkernel API call failed critically after retries for {s3_file_key}."
+        logger.error(f"[PARSE STAGE FAIL] Max retries exceeded for Textkernel API call for {s3_file_key}.")
+        _mark_placeholder_parsing_failed(placeholder_candidate_id,
+                                         f"Textkernel API Error (Max Retries): {str(tk_api_exc)[:200]}", job_id=job_id,
+                                         stage='parse', error_class=type(tk_api_exc).__name__)
+        return _halted_descriptor(descriptor, 'parse', 'textkernel_unavailable')
 
     if parsed_cv_data is None or (isinstance(parsed_cv_data, dict) and 'error' in parsed_cv_data):
         error_msg = parsed_cv_data.get('error', "Unknown Textkernel API error") if isinstance(parsed_cv_data,
                                                                                               dict) else "Textkernel API call returned no data"
         logger.error(
-            f"[TASK FAIL] Textkernel service issue for {placeholder_candidate_id} (S3: {s3_file_key}): {error_msg}. Setting status to ParsingFailed.")
-        placeholder_candidate.current_status = 'ParsingFailed'
-        placeholder_candidate.notes = (
-                                                  placeholder_candidate.notes or "") + f"\nTextkernel Error: {str(error_msg)[:200]} ({datetime.now(dt_timezone.utc).isoformat()})"
-        flag_modified(placeholder_candidate, "notes")
+            f"[PARSE STAGE FAIL] Textkernel service issue for {placeholder_candidate_id} (S3: {s3_file_key}): {error_msg}. Setting status to ParsingFailed.")
+        _mark_placeholder_parsing_failed(placeholder_candidate_id, f"Textkernel Error: {str(error_msg)[:200]}",
+                                         job_id=job_id, stage='parse', error_class='TextkernelError')
+        return _halted_descriptor(descriptor, 'parse', 'textkernel_error')
+
+    # Persist the (paid) parse result before acknowledging, so no redelivery ever parses again.
+    job = CvParseJob.query.get(job_id)
+    job.parsed_data = parsed_cv_data
+    job.state = CvParseJob.STATE_PARSED
+    db.session.commit()
+
+    if redis_client:
+        try:
+            redis_client.delete(blob_key)
+        except redis.RedisError:
+            pass  # The TTL cleans it up anyway.
+
+    parsed_descriptor = dict(descriptor)
+    parsed_descriptor.pop('blob_key', None)
+    return parsed_descriptor
+
+
+@celery.task(bind=True, name='tasks.parsing.persist_cv_stage', ignore_result=True, acks_late=True, max_retries=5, default_retry_delay=30)
+def persist_cv_stage(self, descriptor: dict):
+    """Stage 3: merges the parsed data into the placeholder or an existing candidate. Retries never re-parse."""
+    placeholder_candidate_id = descriptor['placeholder_candidate_id']
+    s3_file_key = descriptor['s3_file_key']
+    if descriptor.get('halted'):
+        logger.info(
+            f"[PERSIST STAGE] Skipping placeholder {placeholder_candidate_id}: pipeline stopped at '{descriptor.get('halted_stage')}' ({descriptor.get('reason')}).")
+        return f"CV pipeline stopped at {descriptor.get('halted_stage')} for {s3_file_key}: {descriptor.get('reason')}."
+
+    job_id = descriptor['job_id']
+    try:
+        # Row lock: a redelivered copy of this stage waits here and then sees 'persisted'.
+        job = CvParseJob.query.filter_by(id=job_id).with_for_update().first()
+        if not job:
+            logger.error(f"[PERSIST STAGE FAIL] Parse job {job_id} not found for placeholder {placeholder_candidate_id}.")
+            return f"Parse job {job_id} not found."
+        if job.state != CvParseJob.STATE_PARSED:
+            db.session.commit()
+            logger.info(f"[PERSIST STAGE] Parse job {job_id} is '{job.state}', not 'parsed'. Nothing to persist.")
+            return f"Parse job {job_id} already {job.state}."
+        return _persist_parsed_cv(job, descriptor.get('cv_original_filename'))
+    except Exception as e_final_update:
+        db.session.rollback()
+        logger.error(
+            f"[PERSIST STAGE FAIL] Error during final DB update/merge for S3 key {s3_file_key} (placeholder ID: {placeholder_candidate_id}): {e_final_update}",
+            exc_info=True
+        )
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e_final_update, countdown=30 * (2 ** self.request.retries))
+        # If we were attempting to merge into an existing candidate and that failed,
+        # the existing candidate is NOT set to ParsingFailed, only the placeholder.
+        _mark_placeholder_parsing_failed(placeholder_candidate_id,
+                                         f"DB Update/Merge Error: {str(e_final_update)[:200]}", job_id=job_id,
+                                         stage='persist', error_class=type(e_final_update).__name__)
+        return f"Failed final update for CV {s3_file_key}."
+
+
+def _persist_parsed_cv(job: CvParseJob, new_cv_original_filename: str = None):
+    """
+    Writes the parsed CV data stored on the (locked) parse job to the DB: either populates the
+    placeholder or merges it into the existing candidate with the same email. The candidate update,
+    the placeholder deletion and the job's 'persisted' state are committed in one transaction.
+    Raises on DB errors; the caller rolls back and retries.
+    """
+    placeholder_candidate_id = str(job.placeholder_candidate_id)
+    s3_file_key = job.s3_key
+    company_id = job.company_id
+    parsed_cv_data = job.parsed_data
+
+    placeholder_candidate = Candidate.query.get(job.placeholder_candidate_id)
+    if not placeholder_candidate:
+        logger.warning(
+            f"[PERSIST STAGE] Placeholder {placeholder_candidate_id} no longer exists (deleted while parsing?). Nothing to persist.")
+        job.state = CvParseJob.STATE_FAILED
+        job.last_error = "Placeholder candidate deleted before persist."
         db.session.commit()
-        return f"Textkernel service issue for {placeholder_candidate_id}."
+        return f"Placeholder candidate {placeholder_candidate_id} not found."
+
+    # Original filename from the placeholder, as it was at the time of upload
+    new_cv_original_filename = new_cv_original_filename or placeholder_candidate.cv_original_filename
 
     # --- Email Extraction and Candidate Identification ---
     extracted_email_from_cv = None
@@ -313,40 +549,34 @@ def parse_cv_task(self, placeholder_candidate_id: str, s3_file_key: str, company
     if not extracted_email_from_cv:
         logger.warning(
             f"[TASK WARN] No email found in parsed CV for placeholder {placeholder_candidate_id}. Updating placeholder directly.")
-        try:
-            _update_candidate_fields_from_parsed_data(placeholder_candidate, parsed_cv_data, s3_file_key,
-                                                      new_cv_original_filename, is_update_for_existing=False)
-            placeholder_candidate.current_status = 'NeedsReview'  # Or 'New' if you prefer initial state
-            placeholder_candidate.add_history_event(
-                event_type="cv_parsed_no_email",
-                description=f"CV parsed, no email found. Candidate data populated.",
-                actor_id=None,
-                details={"cv_path": s3_file_key}
-            )
-            db.session.commit()
-            logger.info(
-                f"[TASK SUCCESS] Placeholder {placeholder_candidate_id} updated (no email in CV). Status: {placeholder_candidate.current_status}")
-            return f"Updated placeholder {placeholder_candidate_id} (no email in CV)."
-        except Exception as e_update_placeholder:
-            db.session.rollback()
-            logger.error(
-                f"[TASK FAIL] Error updating placeholder {placeholder_candidate_id} (no email): {e_update_placeholder}",
-                exc_info=True)
-            placeholder_candidate.current_status = 'ParsingFailed'
-            placeholder_candidate.notes = (
-                                                      placeholder_candidate.notes or "") + f"\nDB Error (no email update): {str(e_update_placeholder)[:200]}"
-            flag_modified(placeholder_candidate, "notes")
-            db.session.commit()
-            return f"Failed to update placeholder {placeholder_candidate_id} (no email)."
+        _update_candidate_fields_from_parsed_data(placeholder_candidate, parsed_cv_data, s3_file_key,
+                                                  new_cv_original_filename, is_update_for_existing=False)
+        placeholder_candidate.current_status = 'NeedsReview'  # Or 'New' if you prefer initial state
+        placeholder_candidate.add_history_event(
+            event_type="cv_parsed_no_email",
+            description=f"CV parsed, no email found. Candidate data populated.",
+            actor_id=None,
+            details={"cv_path": s3_file_key}
+        )
+        job.state = CvParseJob.STATE_PERSISTED
+        job.result_candidate_id = placeholder_candidate.candidate_id
+        db.session.commit()
+        logger.info(
+            f"[TASK SUCCESS] Placeholder {placeholder_candidate_id} updated (no email in CV). Status: {placeholder_candidate.current_status}")
+        return f"Updated placeholder {placeholder_candidate_id} (no email in CV)."
 
     # At this point, we have an extracted_email_from_cv.
+    # Serialize all parses for the same (company, email) so that concurrent workers see each other's
+    # merge instead of racing into uq_candidates_email_company_id. The lock is held until the commit below.
+    locking_service.lock_candidate_email(company_id, extracted_email_from_cv)
+
     # Find if an existing candidate (excluding the placeholder itself, if it somehow got an email already)
-    # for this company already has this email.
+    # for this company already has this email. The row is locked so a concurrent edit can't interleave with the merge.
     existing_candidate_with_cv_email = Candidate.query.filter(
         Candidate.email == extracted_email_from_cv,  # Already lowercased and stripped
         Candidate.company_id == company_id,
         Candidate.candidate_id != placeholder_candidate.candidate_id  # Important: don't find the placeholder itself
-    ).first()
+    ).with_for_update().first()
 
     target_candidate_for_processing = None
     delete_placeholder_after_success = False
@@ -395,97 +625,86 @@ def parse_cv_task(self, placeholder_candidate_id: str, s3_file_key: str, company
             target_candidate_for_processing.email = extracted_email_from_cv  # Ensure placeholder gets the email
 
     # --- Final Update and Commit ---
-    try:
-        _update_candidate_fields_from_parsed_data(
-            target_candidate_for_processing,
-            parsed_cv_data,
-            s3_file_key,  # This is the S3 key of the CV we just parsed
-            new_cv_original_filename,  # This is the original filename from the placeholder
-            is_update_for_existing=bool(existing_candidate_with_cv_email)
-            # True if we are merging into a pre-existing record
-        )
-
-        original_status_before_update = target_candidate_for_processing.current_status
-        new_status_for_candidate = 'NeedsReview'  # Default to NeedsReview after successful parsing/merge
-
-        # If we merged into an existing candidate, their status might need resetting.
-        if existing_candidate_with_cv_email:  # i.e., delete_placeholder_after_success is True
-            if original_status_before_update in ['Hired', 'Rejected', 'Declined', 'ParsingFailed']:
-                target_candidate_for_processing.add_history_event(
-                    event_type="cv_re_submission_merge",
-                    description=f"New CV uploaded and merged. Previous status was '{original_status_before_update}'. Status reset to '{new_status_for_candidate}'.",
-                    actor_id=None,
-                    details={"new_cv_path": s3_file_key, "previous_status": original_status_before_update,
-                             "merged_from_placeholder_id": str(placeholder_candidate_id)}
-                )
-            elif original_status_before_update not in ['Processing', 'New']:  # If it was NeedsReview, Interview, etc.
-                target_candidate_for_processing.add_history_event(
-                    event_type="cv_refresh_merge",
-                    description=f"CV data refreshed by new upload and merge. Previous status was '{original_status_before_update}'. Status set to '{new_status_for_candidate}'.",
-                    actor_id=None,
-                    details={"new_cv_path": s3_file_key, "previous_status": original_status_before_update,
-                             "merged_from_placeholder_id": str(placeholder_candidate_id)}
-                )
-        else:  # This was the placeholder candidate being fully populated
+    _update_candidate_fields_from_parsed_data(
+        target_candidate_for_processing,
+        parsed_cv_data,
+        s3_file_key,  # This is the S3 key of the CV we just parsed
+        new_cv_original_filename,  # This is the original filename from the placeholder
+        is_update_for_existing=bool(existing_candidate_with_cv_email)
+        # True if we are merging into a pre-existing record
+    )
+
+    original_status_before_update = target_candidate_for_processing.current_status
+    new_status_for_candidate = 'NeedsReview'  # Default to NeedsReview after successful parsing/merge
+
+    # If we merged into an existing candidate, their status might need resetting.
+    if existing_candidate_with_cv_email:  # i.e., delete_placeholder_after_success is True
+        if original_status_before_update in ['Hired', 'Rejected', 'Declined', 'ParsingFailed']:
             target_candidate_for_processing.add_history_event(
-                event_type="cv_parsed_and_populated",
-                description=f"CV parsed. Candidate data populated. Status set to '{new_status_for_candidate}'.",
+                event_type="cv_re_submission_merge",
+                description=f"New CV uploaded and merged. Previous status was '{original_status_before_update}'. Status reset to '{new_status_for_candidate}'.",
                 actor_id=None,
-                details={"cv_path": s3_file_key}
+                details={"new_cv_path": s3_file_key, "previous_status": original_status_before_update,
+                         "merged_from_placeholder_id": str(placeholder_candidate_id)}
             )
+        elif original_status_before_update not in ['Processing', 'New']:  # If it was NeedsReview, Interview, etc.
+            target_candidate_for_processing.add_history_event(
+                event_type="cv_refresh_merge",
+                description=f"CV data refreshed by new upload and merge. Previous status was '{original_status_before_update}'. Status set to '{new_status_for_candidate}'.",
+                actor_id=None,
+                details={"new_cv_path": s3_file_key, "previous_status": original_status_before_update,
+                         "merged_from_placeholder_id": str(placeholder_candidate_id)}
+            )
+    else:  # This was the placeholder candidate being fully populated
+        target_candidate_for_processing.add_history_event(
+            event_type="cv_parsed_and_populated",
+            description=f"CV parsed. Candidate data populated. Status set to '{new_status_for_candidate}'.",
+            actor_id=None,
+            details={"cv_path": s3_file_key}
+        )
 
-        target_candidate_for_processing.current_status = new_status_for_candidate
+    target_candidate_for_processing.current_status = new_status_for_candidate
 
-        db.session.commit()
+    if delete_placeholder_after_success:
+        # The placeholder goes away in the same transaction as the merge, so a crash in between
+        # can never leave a merged CV behind that a redelivered task would merge a second time.
         logger.info(
-            f"[TASK SUCCESS] Candidate {target_candidate_for_processing.candidate_id} (Company: {target_candidate_for_processing.company_id}) "
-            f"updated/populated. Final Status: {target_candidate_for_processing.current_status}"
-        )
+            f"Deleting placeholder candidate {placeholder_candidate_id} as data was merged to {target_candidate_for_processing.candidate_id}.")
+        db.session.delete(placeholder_candidate)
+        # A merge resets the existing candidate's status, which may cancel the reminders of its interview.
+        reminder_schedule_service.sync_changes(candidates=[target_candidate_for_processing])
+
+    job.state = CvParseJob.STATE_PERSISTED
+    job.result_candidate_id = target_candidate_for_processing.candidate_id
+    db.session.commit()
+    logger.info(
+        f"[TASK SUCCESS] Candidate {target_candidate_for_processing.candidate_id} (Company: {target_candidate_for_processing.company_id}) "
+        f"updated/populated. Final Status: {target_candidate_for_processing.current_status}"
+    )
 
-        if delete_placeholder_after_success:
-            # Now that the main candidate is updated, delete the placeholder
-            # We need to fetch it again in case session state is tricky
-            placeholder_to_delete = Candidate.query.get(placeholder_candidate_id)
-            if placeholder_to_delete:
-                logger.info(
-                    f"Deleting placeholder candidate {placeholder_candidate_id} as data was merged to {target_candidate_for_processing.candidate_id}.")
-                db.session.delete(placeholder_to_delete)
-                db.session.commit()
-                logger.info(f"Placeholder {placeholder_candidate_id} deleted from DB.")
-            else:
-                logger.warning(
-                    f"Could not find placeholder {placeholder_candidate_id} for deletion after merge. It might have been deleted by another process or error.")
+    return f"Processed CV. Final Candidate ID: {target_candidate_for_processing.candidate_id}, Status: {target_candidate_for_processing.current_status}"
 
-        return f"Processed CV. Final Candidate ID: {target_candidate_for_processing.candidate_id}, Status: {target_candidate_for_processing.current_status}"
 
-    except Exception as e_final_update:
-        db.session.rollback()
-        final_candidate_id_for_log = target_candidate_for_processing.candidate_id if target_candidate_for_processing else placeholder_candidate_id
-        logger.error(
-            f"[TASK FAIL] Error during final DB update/merge for candidate processing related to S3 key {s3_file_key} (target/placeholder ID: {final_candidate_id_for_log}): {e_final_update}",
-            exc_info=True
-        )
+@celery.task(bind=True, name='tasks.parsing.parse_cv_task', ignore_result=True, acks_late=True)
+def parse_cv_task(self, placeholder_candidate_id: str, s3_file_key: str, company_id: int):
+    """
+    Legacy single-task entry point. Messages published before the staged pipeline existed
+    (or by older web containers) are handed over to the fetch -> parse -> persist chain.
+    """
+    logger.info(f"[TASK] parse_cv_task for placeholder_id: {placeholder_candidate_id} handed over to the staged CV pipeline.")
+    parse_dispatch_service.submit_cv_parse(placeholder_candidate_id, s3_file_key, company_id)
+    return f"CV pipeline queued for {placeholder_candidate_id}."
 
-        # Re-fetch the placeholder to mark it as failed, as its state might be stale
-        placeholder_to_mark_failed = Candidate.query.get(placeholder_candidate_id)
-        if placeholder_to_mark_failed:
-            placeholder_to_mark_failed.current_status = 'ParsingFailed'
-            placeholder_to_mark_failed.notes = (
-                                                           placeholder_to_mark_failed.notes or "") + f"\nDB Update/Merge Error: {str(e_final_update)[:200]} ({datetime.now(dt_timezone.utc).isoformat()})"
-            flag_modified(placeholder_to_mark_failed, "notes")
-            try:
-                db.session.commit()
-            except Exception as e_commit_fail_status:  # Nested try-except for commit
-                db.session.rollback()
-                logger.error(
-                    f"CRITICAL: Could not even commit ParsingFailed status for placeholder {placeholder_candidate_id} after previous error: {e_commit_fail_status}")
-        else:
-            logger.error(
-                f"CRITICAL: Placeholder {placeholder_candidate_id} not found to mark as ParsingFailed after DB Update/Merge Error.")
 
-        # If we were attempting to merge into an existing candidate and that failed,
-        # the existing candidate is NOT set to ParsingFailed, only the placeholder.
-        # The S3 key (new_cv_s3_key) remains associated with the placeholder if it's not merged.
-        # If merge happened but failed at commit, s3_key is now on target_candidate_for_processing.
+@celery.task(name='tasks.parsing.replay_dead_letters_batch', ignore_result=True)
+def replay_dead_letters_batch(dead_letter_ids):
+    """Re-enqueues one batch of dead-lettered parses. Batches are spaced out by dead_letter_service.schedule_replay."""
+    summary = dead_letter_service.replay_dead_letters(dead_letter_ids)
+    return f"Dead-letter replay batch: {summary}"
+
 
-        return f"Failed final update for CV {s3_file_key}."
\ No newline at end of file
+@celery.task(name='tasks.parsing.dispatch_parse_queue', ignore_result=True)
+def dispatch_parse_queue():
+    """Feeds the CV pipeline from the per-company fair-share sub-queues (see parse_dispatch_service)."""
+    dispatched = parse_dispatch_service.dispatch_pending()
+    return f"Dispatched {dispatched} CV(s)."
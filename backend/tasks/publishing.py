@@ -0,0 +1,27 @@
+# backend/tasks/publishing.py
+from app import celery, db
+from app.services import task_publish_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@celery.task(name='tasks.publishing.relay_pending_publishes', ignore_result=True, non_overlapping=True)
+def relay_pending_publishes():
+    """Republishes the task messages whose publish after a commit failed (see task_publish_service)."""
+    totals = {'published': 0, 'pending': 0}
+    try:
+        while True:
+            batch = task_publish_service.relay_pending_publishes()
+            for key, value in batch.items():
+                totals[key] += value
+            if batch['pending'] or not batch['published']:
+                break
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"[PUBLISH RELAY FAIL] {e}", exc_info=True)
+        return "Task publish relay failed."
+    if totals['published'] or totals['pending']:
+        logger.info(f"[PUBLISH RELAY] Republished {totals['published']} task message(s), "
+                    f"{totals['pending']} still waiting for the broker.")
+    return f"Relayed task messages: {totals}."
@@ -3,6 +3,8 @@ import requests
 import json
 import os
 import uuid  # Για μοναδικά emails/usernames
+import time
+import threading
 
 BASE_API_URL = "http://localhost:5001/api/v1"
 BASE_APP_URL = "http://localhost:5001"
@@ -236,6 +238,364 @@ def test_company_admin_ping(use_session=None):  # use_session για να μπο
 
 # --- ΤΕΛΟΣ ΝΕΑΣ ΣΥΝΑΡΤΗΣΗΣ ---
 
+
+def stress_duplicate_upload_test(cv_path, copies=8, position_name="Stress Test (Duplicate CV)", wait_seconds=180):
+    """
+    Fires `copies` simultaneous uploads of the same CV (same email inside) with the logged-in session's cookies.
+    Once the workers are done, exactly one candidate should survive (all others merged into it) and
+    none of the placeholders should end up as ParsingFailed because of a uniqueness conflict.
+    """
+    print(f"\n--- STRESS: {copies} simultaneous uploads of {cv_path} ---")
+    if not os.path.exists(cv_path):
+        print(f"CV file not found at: {cv_path}. Skipping stress test.")
+        return False
+    with open(cv_path, 'rb') as f:
+        cv_bytes = f.read()
+
+    start_barrier = threading.Barrier(copies)
+    uploaded_ids = []
+    upload_errors = []
+    results_lock = threading.Lock()
+
+    def _upload_one(index):
+        worker_session = requests.Session()
+        worker_session.cookies.update(session.cookies)
+        files = {'cv_file': (os.path.basename(cv_path), cv_bytes, 'application/pdf')}
+        start_barrier.wait()
+        try:
+            response = worker_session.post(f"{BASE_API_URL}/upload", files=files, data={'position': position_name},
+                                           timeout=60)
+            with results_lock:
+                if response.status_code == 201:
+                    uploaded_ids.append(response.json().get('candidate_id'))
+                else:
+                    upload_errors.append(f"#{index}: HTTP {response.status_code} {response.text[:200]}")
+        except requests.exceptions.RequestException as e:
+            with results_lock:
+                upload_errors.append(f"#{index}: {e}")
+
+    threads = [threading.Thread(target=_upload_one, args=(i,)) for i in range(copies)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    print(f"Uploads accepted: {len(uploaded_ids)}/{copies}. Errors: {upload_errors or 'none'}")
+    if not uploaded_ids:
+        return False
+
+    # Poll until no placeholder is left in 'Processing'. Merged placeholders are deleted (404).
+    deadline = time.time() + wait_seconds
+    final_states = {}
+    while time.time() < deadline:
+        final_states = {}
+        for cand_id in uploaded_ids:
+            response = session.get(f"{BASE_API_URL}/candidate/{cand_id}", timeout=10)
+            final_states[cand_id] = response.json().get('current_status') if response.status_code == 200 else 'merged'
+        if 'Processing' not in final_states.values():
+            break
+        time.sleep(3)
+
+    survivors = [cid for cid, status in final_states.items() if status not in ('merged',)]
+    failed = [cid for cid, status in final_states.items() if status == 'ParsingFailed']
+    still_processing = [cid for cid, status in final_states.items() if status == 'Processing']
+    print("Final states:", json.dumps(final_states, indent=2))
+    if still_processing:
+        print(f"STRESS RESULT: INCONCLUSIVE - {len(still_processing)} placeholder(s) still Processing after {wait_seconds}s.")
+        return False
+    if failed or len(survivors) != 1:
+        print(f"STRESS RESULT: FAIL - survivors: {len(survivors)} (expected 1), ParsingFailed: {len(failed)}.")
+        return False
+    print(f"STRESS RESULT: OK - all {len(uploaded_ids)} uploads merged into candidate {survivors[0]}.")
+    return True
+
+def _print_check(label, ok, detail=""):
+    print(f"{label}: {'OK' if ok else 'FAIL'}{' - ' + detail if detail else ''}")
+    return ok
+
+
+def bulk_upload_test(cv_path, copies=3, position_name="Bulk Import Test", user_type="User",
+                     target_company_id_for_superadmin=None):
+    """
+    /upload/bulk: a request without files is refused (400), a file with a wrong extension is reported in
+    'rejected' without failing the rest, and the valid files are accepted (202) into the low-priority lane.
+    Returns the accepted placeholder candidate ids.
+    """
+    print(f"\n--- BULK UPLOAD: {copies} copies of {cv_path} + 1 invalid file as {user_type} ---")
+    if not os.path.exists(cv_path):
+        print(f"CV file not found at: {cv_path}. Skipping bulk upload test.")
+        return []
+    with open(cv_path, 'rb') as f:
+        cv_bytes = f.read()
+    data = {'position': position_name}
+    if user_type == "Superadmin" and target_company_id_for_superadmin:
+        data['company_id_for_upload'] = target_company_id_for_superadmin
+    try:
+        response = session.post(f"{BASE_API_URL}/upload/bulk", data=data, timeout=30)
+        _print_check("Bulk upload without files -> 400", response.status_code == 400, f"HTTP {response.status_code}")
+
+        files = [('cv_files', (f"bulk_{i}_{os.path.basename(cv_path)}", cv_bytes, 'application/pdf'))
+                 for i in range(copies)]
+        files.append(('cv_files', ('not_a_cv.exe', b'MZ', 'application/octet-stream')))
+        response = session.post(f"{BASE_API_URL}/upload/bulk", files=files, data=data, timeout=120)
+        print(f"Bulk Upload Status Code: {response.status_code}")
+        response_data = response.json()
+        print("Bulk Upload Response JSON:", json.dumps(response_data, indent=2))
+        if response.status_code in (429, 503):
+            # Admission control refused the whole batch; the refusal must tell the client when to come back.
+            _print_check(f"Bulk upload refused ({response.status_code}) with Retry-After",
+                         bool(response.headers.get('Retry-After')), f"Retry-After: {response.headers.get('Retry-After')}")
+            return []
+        accepted = response_data.get('accepted', [])
+        rejected = response_data.get('rejected', [])
+        _print_check("Bulk upload -> 202", response.status_code == 202, f"HTTP {response.status_code}")
+        _print_check("Valid files accepted", len(accepted) == copies, f"{len(accepted)}/{copies}")
+        _print_check("Invalid file rejected on its own", [r.get('filename') for r in rejected] == ['not_a_cv.exe'],
+                     f"rejected: {rejected}")
+        return [item['candidate_id'] for item in accepted]
+    except requests.exceptions.RequestException as e:
+        print(f"Bulk upload request failed: {e}"); return []
+    except json.JSONDecodeError:
+        print(f"Bulk upload response was not valid JSON. Status: {response.status_code}, Text: {response.text[:200]}")
+        return []
+
+
+def parse_jobs_test(candidate_ids=(), wait_seconds=60):
+    """
+    /parse_jobs: an unknown state filter is refused (400); the pipeline records of the given placeholders
+    show up once the workers have fetched them (polled up to wait_seconds).
+    """
+    print(f"\n--- PARSE JOBS: state filter validation and {len(candidate_ids)} uploaded CV(s) ---")
+    try:
+        response = session.get(f"{BASE_API_URL}/parse_jobs", params={'state': 'no_such_state'}, timeout=10)
+        _print_check("Unknown state filter -> 400", response.status_code == 400, f"HTTP {response.status_code}")
+        wanted = set(candidate_ids)
+        found = set()
+        deadline = time.time() + wait_seconds
+        while True:
+            response = session.get(f"{BASE_API_URL}/parse_jobs", params={'limit': 500}, timeout=10)
+            if response.status_code != 200:
+                print(f"Failed to list parse jobs. HTTP {response.status_code}: {response.text[:200]}")
+                return False
+            jobs = response.json().get('parse_jobs', [])
+            found = wanted & {job.get('placeholder_candidate_id') for job in jobs}
+            if found == wanted or time.time() >= deadline:
+                break
+            time.sleep(3)
+        print(f"Parse jobs listed: {len(jobs)}. States: {sorted({job.get('state') for job in jobs})}")
+        if wanted:
+            return _print_check("Uploaded CVs have a parse job", found == wanted,
+                                f"{len(found)}/{len(wanted)} after up to {wait_seconds}s")
+        return True
+    except requests.exceptions.RequestException as e:
+        print(f"Parse jobs request failed: {e}"); return False
+    except json.JSONDecodeError:
+        print(f"Parse jobs response was not valid JSON. Status: {response.status_code}, Text: {response.text[:200]}")
+        return False
+
+
+def fair_share_test(cv_path, bulk_copies=30, wait_seconds=300):
+    """
+    Fair share between the lanes: a big bulk import goes first, then one interactive upload. The interactive CV
+    must leave the queue (parse job started) while bulk CVs are still waiting, not after the whole import.
+    """
+    print(f"\n--- FAIR SHARE: {bulk_copies} bulk CVs, then 1 interactive upload ---")
+    if not os.path.exists(cv_path):
+        print(f"CV file not found at: {cv_path}. Skipping fair-share test.")
+        return False
+    with open(cv_path, 'rb') as f:
+        cv_bytes = f.read()
+    try:
+        files = [('cv_files', (f"fair_{i}_{os.path.basename(cv_path)}", cv_bytes, 'application/pdf'))
+                 for i in range(bulk_copies)]
+        response = session.post(f"{BASE_API_URL}/upload/bulk", files=files, data={'position': "Fair Share (bulk)"},
+                                timeout=300)
+        if response.status_code != 202:
+            print(f"FAIR SHARE RESULT: INCONCLUSIVE - bulk upload HTTP {response.status_code}: {response.text[:200]}")
+            return False
+        bulk_ids = [item['candidate_id'] for item in response.json().get('accepted', [])]
+        files = {'cv_file': (os.path.basename(cv_path), cv_bytes, 'application/pdf')}
+        response = session.post(f"{BASE_API_URL}/upload", files=files, data={'position': "Fair Share (interactive)"},
+                                timeout=30)
+        if response.status_code not in (201, 202):
+            print(f"FAIR SHARE RESULT: INCONCLUSIVE - interactive upload HTTP {response.status_code}: {response.text[:200]}")
+            return False
+        interactive_id = response.json().get('candidate_id')
+
+        def _queued(cand_id):
+            status_response = session.get(f"{BASE_API_URL}/candidate/{cand_id}/parse_status", timeout=10)
+            return status_response.status_code == 200 and status_response.json().get('state') == 'queued'
+
+        deadline = time.time() + wait_seconds
+        while time.time() < deadline and _queued(interactive_id):
+            time.sleep(1)
+        if _queued(interactive_id):
+            print(f"FAIR SHARE RESULT: INCONCLUSIVE - interactive CV still queued after {wait_seconds}s.")
+            return False
+        bulk_still_queued = sum(1 for cand_id in bulk_ids if _queued(cand_id))
+        print(f"Interactive CV {interactive_id} started; bulk CVs still queued: {bulk_still_queued}/{len(bulk_ids)}")
+        return _print_check("FAIR SHARE RESULT", bulk_still_queued > 0,
+                            "interactive CV overtook the bulk import" if bulk_still_queued else
+                            "bulk import drained first (use more copies if the workers are fast)")
+    except requests.exceptions.RequestException as e:
+        print(f"Fair-share request failed: {e}"); return False
+
+
+def admission_backpressure_test(cv_path, company_id, wait_for_cache_seconds=6):
+    """
+    Admission control, as superadmin: with the company's parse_admission_max_backlog lowered to 1, a bulk upload
+    of 3 CVs is refused with 429 + Retry-After (reason company_backlog). The limit is reset to the global default
+    afterwards. /admin/parse_queue must expose the admission view.
+    """
+    print(f"\n--- ADMISSION: company {company_id} backlog limit 1, bulk upload of 3 CVs ---")
+    if not os.path.exists(cv_path):
+        print(f"CV file not found at: {cv_path}. Skipping admission test.")
+        return False
+    company_url = f"{BASE_APP_URL}/admin/companies/{company_id}"
+    try:
+        response = session.get(f"{BASE_APP_URL}/admin/parse_queue", params={'company_id': company_id}, timeout=10)
+        admission_view = response.json().get('admission', {}) if response.status_code == 200 else {}
+        print("Admission view:", json.dumps(admission_view, indent=2))
+        if not admission_view.get('enabled'):
+            print("ADMISSION RESULT: INCONCLUSIVE - admission control is disabled (or Redis is unavailable).")
+            return False
+
+        response = session.put(company_url, json={'parse_admission_max_backlog': 0}, timeout=10)
+        _print_check("Backlog limit 0 -> 400", response.status_code == 400, f"HTTP {response.status_code}")
+        response = session.put(company_url, json={'parse_admission_max_backlog': 1}, timeout=10)
+        if response.status_code != 200:
+            print(f"ADMISSION RESULT: INCONCLUSIVE - could not set the limit. HTTP {response.status_code}: {response.text[:200]}")
+            return False
+        time.sleep(wait_for_cache_seconds)  # Admission numbers are cached per process (PARSE_ADMISSION_CACHE_SECONDS)
+        try:
+            with open(cv_path, 'rb') as f:
+                cv_bytes = f.read()
+            files = [('cv_files', (f"admission_{i}_{os.path.basename(cv_path)}", cv_bytes, 'application/pdf'))
+                     for i in range(3)]
+            response = session.post(f"{BASE_API_URL}/upload/bulk", files=files,
+                                    data={'position': "Admission Test", 'company_id_for_upload': company_id}, timeout=60)
+            print(f"Bulk Upload Status Code: {response.status_code}, Retry-After: {response.headers.get('Retry-After')}")
+            response_data = response.json()
+            print("Bulk Upload Response JSON:", json.dumps(response_data, indent=2))
+            return _print_check("ADMISSION RESULT", response.status_code == 429
+                                and response_data.get('reason') == 'company_backlog'
+                                and response.headers.get('Retry-After') == str(response_data.get('retry_after_seconds')),
+                                f"HTTP {response.status_code}, reason {response_data.get('reason')}")
+        finally:
+            session.put(company_url, json={'parse_admission_max_backlog': None}, timeout=10)
+    except requests.exceptions.RequestException as e:
+        print(f"Admission request failed: {e}"); return False
+    except json.JSONDecodeError:
+        print(f"Admission response was not valid JSON. Status: {response.status_code}, Text: {response.text[:200]}")
+        return False
+
+
+def bulk_schedule_validation_test(valid_candidate_id=None):
+    """
+    /interviews/bulk_schedule refuses bad input without scheduling anything: an empty list, a malformed
+    candidate id or datetime (errors per index), and - all or nothing - a valid slot sent together with an
+    unknown candidate and a past time. Nothing is changed, so this is safe to run against any candidate.
+    """
+    print("\n--- BULK SCHEDULE VALIDATION ---")
+    url = f"{BASE_API_URL}/interviews/bulk_schedule"
+    in_two_days = time.strftime('%Y-%m-%dT10:00:00Z', time.gmtime(time.time() + 2 * 86400))
+    ok = True
+    try:
+        response = session.post(url, json={"interviews": []}, timeout=10)
+        ok &= _print_check("Empty list -> 400", response.status_code == 400, f"HTTP {response.status_code}")
+
+        response = session.post(url, json={"interviews": [
+            {"candidate_id": "not-a-uuid", "interview_datetime": in_two_days},
+            {"candidate_id": str(uuid.uuid4()), "interview_datetime": "tomorrow"}]}, timeout=10)
+        errors = response.json().get('errors', [])
+        ok &= _print_check("Malformed id/datetime -> 400 with one error per slot",
+                           response.status_code == 400 and [e.get('index') for e in errors] == [0, 1],
+                           f"HTTP {response.status_code}, errors: {errors}")
+
+        if valid_candidate_id:
+            before = session.get(f"{BASE_API_URL}/candidate/{valid_candidate_id}", timeout=10).json()
+            response = session.post(url, json={"interviews": [
+                {"candidate_id": valid_candidate_id, "interview_datetime": in_two_days},
+                {"candidate_id": str(uuid.uuid4()), "interview_datetime": in_two_days},
+                {"candidate_id": valid_candidate_id, "interview_datetime": "2000-01-01T10:00:00Z"}]}, timeout=10)
+            errors = response.json().get('errors', [])
+            after = session.get(f"{BASE_API_URL}/candidate/{valid_candidate_id}", timeout=10).json()
+            ok &= _print_check("Unknown/duplicate/past slots -> 400, nothing scheduled",
+                               response.status_code == 400 and len(errors) >= 3
+                               and before.get('interview_datetime') == after.get('interview_datetime')
+                               and before.get('current_status') == after.get('current_status'),
+                               f"HTTP {response.status_code}, errors: {errors}")
+        return ok
+    except requests.exceptions.RequestException as e:
+        print(f"Bulk schedule request failed: {e}"); return False
+    except json.JSONDecodeError:
+        print(f"Bulk schedule response was not valid JSON. Status: {response.status_code}, Text: {response.text[:200]}")
+        return False
+
+
+def interview_notifications_test(candidate_id, wait_seconds=60):
+    """
+    End to end, for a candidate that can be scheduled (NOT Processing/ParsingFailed/Hired; the candidate gets a
+    real invitation email unless MAIL_DEBUG is on): assign the logged-in user as interviewer, bulk schedule the
+    interview, see it in /interviews/upcoming, confirm it through the candidate's link and wait for the
+    recruiter notification. Then mark everything read: the unread count must drop to 0 right away (the cached
+    counter is invalidated on commit), and malformed ids are refused.
+    """
+    print(f"\n--- INTERVIEW + NOTIFICATIONS for candidate {candidate_id} ---")
+    ok = True
+    try:
+        user_id = session.get(f"{BASE_API_URL}/session", timeout=10).json().get('user', {}).get('id')
+        response = session.put(f"{BASE_API_URL}/candidate/{candidate_id}", json={"interviewers": [user_id]}, timeout=10)
+        if response.status_code != 200:
+            print(f"INTERVIEW RESULT: INCONCLUSIVE - could not assign the interviewer. HTTP {response.status_code}: {response.text[:200]}")
+            return False
+        unread_before = session.get(f"{BASE_API_URL}/notifications/unread_count", timeout=10).json().get('unread_count')
+
+        in_two_days = time.strftime('%Y-%m-%dT10:00:00Z', time.gmtime(time.time() + 2 * 86400))
+        response = session.post(f"{BASE_API_URL}/interviews/bulk_schedule", json={
+            "interviews": [{"candidate_id": candidate_id, "interview_datetime": in_two_days}],
+            "interview_location": "Test Room", "interview_type": "In-person"}, timeout=30)
+        print("Bulk Schedule Response JSON:", json.dumps(response.json(), indent=2))
+        scheduled = response.json().get('scheduled', [])
+        if response.status_code != 200 or len(scheduled) != 1:
+            print(f"INTERVIEW RESULT: FAIL - bulk schedule HTTP {response.status_code}.")
+            return False
+
+        response = session.get(f"{BASE_API_URL}/interviews/upcoming", params={'days': 3}, timeout=10)
+        upcoming_ids = [item.get('candidate_id') for item in response.json().get('interviews', [])]
+        ok &= _print_check("Scheduled interview in /interviews/upcoming", candidate_id in upcoming_ids,
+                           f"{len(upcoming_ids)} upcoming")
+
+        response = requests.get(f"{BASE_API_URL}/interviews/confirm/{scheduled[0]['confirmation_uuid']}", timeout=10)
+        ok &= _print_check("Candidate confirmation link -> 200", response.status_code == 200,
+                           f"HTTP {response.status_code}")
+
+        deadline = time.time() + wait_seconds
+        unread_after = unread_before
+        while time.time() < deadline and unread_after <= unread_before:
+            time.sleep(2)
+            unread_after = session.get(f"{BASE_API_URL}/notifications/unread_count", timeout=10).json().get('unread_count')
+        ok &= _print_check("Recruiter notified (unread count grew)", unread_after > unread_before,
+                           f"{unread_before} -> {unread_after}")
+        notifications = session.get(f"{BASE_API_URL}/notifications", params={'unread_only': 'true', 'limit': 5},
+                                    timeout=10).json().get('notifications', [])
+        ok &= _print_check("Confirmation notification listed",
+                           any(n.get('candidate_id') == candidate_id for n in notifications),
+                           f"kinds: {[n.get('kind') for n in notifications]}")
+
+        response = session.post(f"{BASE_API_URL}/notifications/mark_read", json={"ids": "all"}, timeout=10)
+        ok &= _print_check("Malformed ids -> 400", response.status_code == 400, f"HTTP {response.status_code}")
+        response = session.post(f"{BASE_API_URL}/notifications/mark_read", json={}, timeout=10)
+        ok &= _print_check("Mark all read", response.status_code == 200 and response.json().get('unread_count') == 0,
+                           json.dumps(response.json()))
+        unread_now = session.get(f"{BASE_API_URL}/notifications/unread_count", timeout=10).json().get('unread_count')
+        ok &= _print_check("Unread count is 0 right after mark_read (no stale cache)", unread_now == 0,
+                           f"unread_count: {unread_now}")
+        return ok
+    except requests.exceptions.RequestException as e:
+        print(f"Interview/notifications request failed: {e}"); return False
+    except json.JSONDecodeError:
+        print(f"Interview/notifications response was not valid JSON. Status: {response.status_code}, Text: {response.text[:200]}")
+        return False
+
+
 if __name__ == "__main__":
     dummy_cv_path = "dummy_cv.pdf"
     uploaded_candidate_id_company_admin = None
@@ -269,6 +629,22 @@ if __name__ == "__main__":
         if uploaded_candidate_id_company_admin:
             get_single_candidate_test(uploaded_candidate_id_company_admin, "Company Admin")
 
+        # Needs a real, parseable CV with an email address (e.g. STRESS_CV_PATH=test.pdf) and running workers.
+        if os.environ.get('RUN_STRESS_TESTS'):
+            stress_duplicate_upload_test(os.environ.get('STRESS_CV_PATH', 'test.pdf'),
+                                         copies=int(os.environ.get('STRESS_COPIES', 8)))
+
+        print("\n\n--- Testing Bulk Upload, Parse Jobs and Interview Scheduling ---")
+        bulk_candidate_ids = bulk_upload_test(dummy_cv_path, user_type="Company Admin")
+        parse_jobs_test(bulk_candidate_ids, wait_seconds=int(os.environ.get('PARSE_JOBS_WAIT_SECONDS', 30)))
+        bulk_schedule_validation_test(uploaded_candidate_id_company_admin)
+        if os.environ.get('RUN_STRESS_TESTS'):
+            fair_share_test(os.environ.get('STRESS_CV_PATH', 'test.pdf'),
+                            bulk_copies=int(os.environ.get('FAIR_SHARE_BULK_COPIES', 30)))
+        # Schedules a real interview for this candidate and sends the invitation (run with MAIL_DEBUG).
+        if os.environ.get('INTERVIEW_TEST_CANDIDATE_ID'):
+            interview_notifications_test(os.environ['INTERVIEW_TEST_CANDIDATE_ID'])
+
         print("\n\n--- Testing Company Admin User Management ---")
         get_company_users_test("Company Admin")
 
@@ -304,6 +680,9 @@ if __name__ == "__main__":
         get_candidates_test(status="Processing", user_type="Superadmin", params={"company_id": 1})
         if uploaded_candidate_id_superadmin:
             get_single_candidate_test(uploaded_candidate_id_superadmin, "Superadmin")
+        # Temporarily lowers company 1's parse backlog limit.
+        if os.environ.get('RUN_STRESS_TESTS'):
+            admission_backpressure_test(dummy_cv_path, 1)
         logout_current_user("Superadmin")
     session = requests.Session()
     print("=============================================")